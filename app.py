@@ -6,12 +6,31 @@ from dotenv import load_dotenv
 import tempfile
 import uuid
 import json
-import codecs
 import markdown
+import click
+from flask.cli import AppGroup
+from typing import Optional
 from flask_session import Session  # Import for server-side sessions
 from utils.openai_helper import OpenAIHelper
 from utils.summary_generator import SummaryGenerator
 from utils.docx_exporter import DocxExporter
+from utils.deadline import Deadline
+from utils.pipeline_state import PipelineStateStore, state_source_transcript, state_model_transcript
+from utils.openai_helper import SECTION_TITLES
+from utils.transcript_index import TranscriptIndex
+from utils.redaction import load_redactor
+from utils.rate_limiter import SharedRateLimiter, PRIORITY_INTERACTIVE, PRIORITY_API, PRIORITY_BATCH
+from utils.scheduler import PriorityScheduler, request_priority
+from utils.backend_pool import BackendPool
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.autotuner import ChunkTuner
+from utils.transcript_loader import load_transcript
+from utils.live_session import LiveMeetingSession
+from utils.summary_store import SummaryStore
+from utils.series_rollup import ROLLUP_FIELDS, render_rollup, rollup_items
+from utils.search_documents import SEARCH_SECTIONS, TRANSCRIPT_SECTION, snippet_html
+from utils.batch_runner import BatchRunner, REPORT_FILE, collect_jobs
+from utils.offline_batch import OfflineBatch, STAGE_REDUCE, STAGE_DONE, run_batch_locally, save_summaries
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -41,11 +60,173 @@ app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # 32MB max upload (increase
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Time budget for a single summary request; keep it below the gunicorn worker timeout
+SUMMARY_DEADLINE_SECONDS = float(os.getenv("SUMMARY_DEADLINE_SECONDS", "270"))
+
+# OpenAI rate limits shared by every worker and batch job on this host (0 disables a limit);
+# batch jobs leave OPENAI_BATCH_RESERVE of each limit free for interactive requests
+rate_limiter = SharedRateLimiter(
+    os.getenv("RATE_LIMIT_DB_PATH", os.path.join(tempfile.gettempdir(), 'openai_rate_limit.db')),
+    requests_per_minute=int(os.getenv("OPENAI_RATE_LIMIT_RPM", "0")),
+    tokens_per_minute=int(os.getenv("OPENAI_RATE_LIMIT_TPM", "0")),
+    batch_reserve=float(os.getenv("OPENAI_BATCH_RESERVE", "0.25"))
+)
+
+# OpenAI calls in flight at once in this process, shared between the interactive, api and batch
+# classes by weighted fair queuing (0 disables the scheduler). OPENAI_CLASS_WEIGHTS overrides the
+# shares, e.g. {"interactive": 6, "api": 3, "batch": 1}; OPENAI_RESERVED_CALLS keeps slots free
+# for a class even when it is idle, e.g. {"interactive": 2}. Each process (web worker or batch job)
+# has its own slots, so only the shared rate limits above separate batch jobs from web traffic
+OPENAI_MAX_CONCURRENT_CALLS = int(os.getenv("OPENAI_MAX_CONCURRENT_CALLS", "0"))
+call_scheduler = None
+if OPENAI_MAX_CONCURRENT_CALLS:
+    call_scheduler = PriorityScheduler(
+        OPENAI_MAX_CONCURRENT_CALLS,
+        weights=json.loads(os.getenv("OPENAI_CLASS_WEIGHTS", "{}")),
+        reserved=json.loads(os.getenv("OPENAI_RESERVED_CALLS", "{}"))
+    )
+
+# Optional pool of OpenAI-compatible backends (several keys/orgs, or local servers) that calls
+# are spread over by load, with ejection of failing backends. JSON list of objects with name,
+# base_url, api_key_env (or api_key), model, rpm and tpm; unset uses OPENAI_API_KEY alone. With a
+# pool, each backend's rpm/tpm apply in place of OPENAI_RATE_LIMIT_RPM/TPM
+backend_pool = None
+if os.getenv("OPENAI_BACKENDS"):
+    backend_pool = BackendPool.from_config(
+        json.loads(os.getenv("OPENAI_BACKENDS")),
+        limiter_path=rate_limiter.path,
+        batch_reserve=rate_limiter.batch_reserve,
+        failure_threshold=int(os.getenv("OPENAI_BACKEND_FAILURE_THRESHOLD", "3")),
+        ejection_seconds=float(os.getenv("OPENAI_BACKEND_EJECTION_SECONDS", "30"))
+    )
+
+# Circuit breaker around the upstream LLM, shared by all workers. It opens when CIRCUIT_FAILURE_RATE of
+# the calls in the last CIRCUIT_WINDOW_SECONDS failed (or CIRCUIT_SLOW_CALL_RATE took longer than
+# CIRCUIT_SLOW_CALL_SECONDS); requests then fail fast with a 503 for CIRCUIT_OPEN_SECONDS before a probe
+circuit_breaker = None
+if os.getenv("CIRCUIT_BREAKER", "true").lower() == "true":
+    circuit_breaker = CircuitBreaker(
+        os.getenv("CIRCUIT_BREAKER_DB_PATH", os.path.join(tempfile.gettempdir(), 'openai_circuit.db')),
+        window_seconds=float(os.getenv("CIRCUIT_WINDOW_SECONDS", "60")),
+        min_calls=int(os.getenv("CIRCUIT_MIN_CALLS", "10")),
+        failure_rate=float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5")),
+        slow_call_seconds=float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "120")),
+        slow_call_rate=float(os.getenv("CIRCUIT_SLOW_CALL_RATE", "0.8")),
+        open_seconds=float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+    )
+
+# Chunk size and direct vs map-reduce cut-over tuned from the latency of past calls, shared by all
+# helpers in the process. CHUNK_SIZE and DIRECT_MAX_CHARS (characters) fix either value instead;
+# CHUNK_AUTOTUNE=false keeps the defaults (7500 and 100000)
+chunk_tuner = ChunkTuner(
+    chunk_size=int(os.getenv("CHUNK_SIZE", "0")) or None,
+    direct_max_chars=int(os.getenv("DIRECT_MAX_CHARS", "0")) or None,
+    enabled=os.getenv("CHUNK_AUTOTUNE", "true").lower() == "true"
+)
+
+
+def create_openai_helper(priority: str = PRIORITY_INTERACTIVE,
+                         scheduler: Optional[PriorityScheduler] = None) -> OpenAIHelper:
+    """
+    Build an OpenAIHelper from the environment
+
+    Args:
+        priority: Default priority class of the helper's calls
+        scheduler: Call scheduler to use instead of the process-wide one
+
+    Returns:
+        Configured OpenAIHelper
+    """
+    return OpenAIHelper(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        fallback_model=os.getenv("OPENAI_FALLBACK_MODEL", "gpt-4.1-mini"),
+        # Per-stage overrides; unset variables keep the helper's defaults
+        stage_config={
+            "map": {
+                "model": os.getenv("OPENAI_MAP_MODEL"),
+                "max_tokens": int(os.getenv("OPENAI_MAP_MAX_TOKENS", "0")) or None,
+                "concurrency": int(os.getenv("OPENAI_MAP_CONCURRENCY", "0")) or None,
+            },
+            "reduce": {
+                "model": os.getenv("OPENAI_REDUCE_MODEL"),
+                "max_tokens": int(os.getenv("OPENAI_REDUCE_MAX_TOKENS", "0")) or None,
+            },
+            "direct": {
+                "model": os.getenv("OPENAI_DIRECT_MODEL"),
+                "max_tokens": int(os.getenv("OPENAI_DIRECT_MAX_TOKENS", "0")) or None,
+            },
+            "section": {
+                "model": os.getenv("OPENAI_SECTION_MODEL"),
+                "max_tokens": int(os.getenv("OPENAI_SECTION_MAX_TOKENS", "0")) or None,
+            },
+        },
+        # Generate medium transcripts as concurrent section groups
+        section_parallel=os.getenv("SECTION_PARALLEL", "false").lower() == "true",
+        # Per-group passage budget (tokens) for retrieval in section-wise mode; 0 sends the whole transcript
+        retrieval_token_budget=int(os.getenv("RETRIEVAL_TOKEN_BUDGET", "0")) or None,
+        rate_limiter=rate_limiter if rate_limiter else None,
+        priority=priority,
+        scheduler=scheduler or call_scheduler,
+        backend_pool=backend_pool,
+        circuit_breaker=circuit_breaker,
+        # Duplicate map calls per transcript, as a share of its chunks, for chunk calls slower than
+        # the usual p90 of their size; the first answer wins (0 disables hedging)
+        hedge_budget=float(os.getenv("MAP_HEDGE_BUDGET", "0")),
+        autotuner=chunk_tuner
+    )
+
+
 # Initialize components
-openai_helper = OpenAIHelper(api_key=os.getenv("OPENAI_API_KEY"))
-summary_generator = SummaryGenerator(openai_helper)
+openai_helper = create_openai_helper()
+summary_generator = SummaryGenerator(
+    openai_helper,
+    # Token budget for local extractive pre-summarization of very long transcripts (0 disables it)
+    extractive_target_tokens=int(os.getenv("EXTRACTIVE_TARGET_TOKENS", "0")) or None
+)
 docx_exporter = DocxExporter()
 
+# Optional PII redaction before anything is sent upstream: built-in SSN/phone/email patterns,
+# plus dictionary terms (e.g. claimant names) and extra patterns from the environment
+redactor = None
+if os.getenv("REDACT_PII", "false").lower() == "true":
+    redactor = load_redactor(
+        terms_text=os.getenv("REDACTION_TERMS", ""),
+        terms_file=os.getenv("REDACTION_TERMS_FILE"),
+        patterns=json.loads(os.getenv("REDACTION_PATTERNS", "{}"))
+    )
+
+# Pipeline state (redacted transcript, chunk analyses) kept outside the session for section regeneration
+pipeline_store = PipelineStateStore(
+    os.path.join(tempfile.gettempdir(), 'pipeline_state'),
+    # Stored states (and live transcripts) are deleted this long after their last update (0 keeps them);
+    # keep it longer than offline batches take to come back
+    max_age_seconds=float(os.getenv("PIPELINE_STATE_MAX_AGE_HOURS", "72")) * 3600
+)
+
+# Generated summaries are kept in SQLite so meetings can be grouped into series and rolled up
+summary_store = SummaryStore(os.getenv("SUMMARY_DB_PATH", os.path.join(tempfile.gettempdir(), 'summaries.db')))
+# Also make the compacted (and, with REDACT_PII, redacted) transcript searchable, not just the summary
+SEARCH_INDEX_TRANSCRIPTS = os.getenv("SEARCH_INDEX_TRANSCRIPTS", "false").lower() == "true"
+
+# Live meetings: re-consolidate the summary after this many new chunks or seconds (0 disables either trigger)
+LIVE_REFRESH_CHUNKS = int(os.getenv("LIVE_REFRESH_CHUNKS", "4"))
+LIVE_REFRESH_SECONDS = float(os.getenv("LIVE_REFRESH_SECONDS", "300"))
+
+
+@app.before_request
+def set_request_priority():
+    """Queue upstream calls for JSON API clients (live meetings, actions, search) behind page requests"""
+    api_request = request.path.startswith(('/api/', '/live/'))
+    request_priority.set(PRIORITY_API if api_request else PRIORITY_INTERACTIVE)
+
+
+def _circuit_open_response(error: CircuitOpenError):
+    """503 with Retry-After for a request refused while the upstream circuit is open"""
+    response = jsonify({'error': str(error), 'retry_after': round(error.retry_after)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(max(1, int(error.retry_after)))
+    return response
+
 
 @app.route('/')
 def index():
@@ -59,6 +240,9 @@ def generate_summary():
     if 'transcript' not in request.form and 'transcript_file' not in request.files:
         return jsonify({'error': 'No transcript provided'}), 400
 
+    # Start the time budget when the request arrives so file parsing counts against it
+    deadline = Deadline(SUMMARY_DEADLINE_SECONDS)
+
     try:
         # Get transcript text either from form field or uploaded file
         if 'transcript_file' in request.files and request.files['transcript_file'].filename:
@@ -71,41 +255,8 @@ def generate_summary():
             print(f"File saved to {transcript_path}")
             print(f"File extension: {file_extension}")
 
-            # Process based on file type
-            transcript_text = None
-
-            if file_extension == '.docx':
-                # Handle Word documents
-                try:
-                    import docx
-                    doc = docx.Document(transcript_path)
-                    transcript_text = '\n\n'.join([para.text for para in doc.paragraphs if para.text.strip()])
-                    print(f"Successfully extracted text from DOCX file, {len(transcript_text)} characters")
-                except Exception as e:
-                    print(f"Error reading DOCX file: {str(e)}")
-                    raise Exception(f"Could not extract text from Word document: {str(e)}")
-
-            elif file_extension == '.txt' or file_extension == '.md' or file_extension == '.csv' or file_extension == '':
-                # Handle text files with multiple encodings
-                encodings_to_try = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'ascii']
-
-                for encoding in encodings_to_try:
-                    try:
-                        with codecs.open(transcript_path, 'r', encoding=encoding) as f:
-                            transcript_text = f.read()
-                        print(f"Successfully read file with {encoding} encoding, {len(transcript_text)} characters")
-                        break
-                    except UnicodeDecodeError:
-                        print(f"Failed to read with {encoding} encoding, trying next...")
-                        continue
-
-            else:
-                # Unsupported file type
-                raise Exception(f"Unsupported file type: {file_extension}. Please upload a .txt or .docx file.")
-
-            # If all methods failed, raise an error
-            if transcript_text is None:
-                raise Exception("Could not extract text from the uploaded file. Please try pasting the text directly.")
+            # Read the text based on file type
+            transcript_text = load_transcript(transcript_path)
 
             # Clean up the file after reading
             try:
@@ -128,21 +279,31 @@ def generate_summary():
         meeting_duration = request.form.get('meeting_duration', '')
         persona_prompt = request.form.get('persona_prompt', '')  # New field
         context_prompt = request.form.get('context_prompt', '')  # New field
+        meeting_series = request.form.get('meeting_series', '').strip()
 
         print(f"Generating summary for: {meeting_title}")
-        print(f"Transcript length: {len(transcript_text)} characters")
-        print(f"First 100 characters of transcript: {transcript_text[:100]}...")
+        # Parse speaker turns once at ingestion; every later stage reuses this index
+        transcript_index = TranscriptIndex(transcript_text)
+        print(f"Transcript length: {len(transcript_text)} characters, {transcript_index.describe()}")
         print(f"Persona prompt: {persona_prompt}")
         print(f"Context prompt: {context_prompt}")
 
+        # Redact PII in one pass over the text; placeholders are restored in the final summary
+        redaction = redactor.redact(transcript_text) if redactor else None
+
         # Generate summary
+        pipeline_state = {}
         summary = summary_generator.generate(
             transcript=transcript_text,
             title=meeting_title,
             date=meeting_date,
             duration=meeting_duration,
             persona_prompt=persona_prompt,  # New field
-            context_prompt=context_prompt   # New field
+            context_prompt=context_prompt,  # New field
+            deadline=deadline,
+            pipeline_state=pipeline_state,
+            transcript_index=transcript_index,
+            redaction=redaction
         )
 
         # Validate summary has actual content by checking the markdown
@@ -159,12 +320,20 @@ def generate_summary():
         session['meeting_duration'] = meeting_duration
         session['persona_prompt'] = persona_prompt  # New field
         session['context_prompt'] = context_prompt  # New field
+        session['pipeline_state_id'] = pipeline_store.save(pipeline_state)
+        session['meeting_id'] = summary_store.add_meeting(
+            summary, meeting_title, meeting_date, meeting_duration, series=meeting_series or None,
+            transcript=state_model_transcript(pipeline_state) if SEARCH_INDEX_TRANSCRIPTS else None
+        )
+        session['meeting_series'] = meeting_series
 
         return redirect(url_for('view_summary'))
 
     except UnicodeDecodeError as e:
         print(f"File encoding error: {str(e)}")
         return jsonify({'error': f'File encoding error: {str(e)}. Try saving your file as UTF-8 format.'}), 400
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
     except Exception as e:
         # Print detailed error for debugging
         print(f"Error generating summary: {str(e)}")
@@ -220,9 +389,376 @@ def view_summary():
         meeting_date=meeting_date,
         meeting_duration=meeting_duration,
         persona_prompt=persona_prompt,  # Pass new field to template
-        context_prompt=context_prompt   # Pass new field to template
+        context_prompt=context_prompt,  # Pass new field to template
+        section_titles=SECTION_TITLES,
+        meeting_id=session.get('meeting_id'),
+        meeting_series=session.get('meeting_series', '')
+    )
+
+
+@app.route('/regenerate-section', methods=['POST'])
+def regenerate_section():
+    """Regenerate a single summary section from the stored pipeline state"""
+    summary = session.get('summary')
+    if not summary:
+        return redirect(url_for('index'))
+
+    section_number = request.form.get('section', type=int)
+    if section_number not in SECTION_TITLES:
+        return jsonify({'error': 'Please choose a valid section to regenerate.'}), 400
+
+    pipeline_state = pipeline_store.load(session.get('pipeline_state_id', ''))
+    if not pipeline_state:
+        return jsonify({'error': 'The stored transcript for this summary is no longer available. '
+                                 'Please generate the summary again.'}), 400
+
+    try:
+        session['summary'] = summary_generator.regenerate_section(
+            summary=summary,
+            section_number=section_number,
+            pipeline_state=pipeline_state,
+            deadline=Deadline(SUMMARY_DEADLINE_SECONDS)
+        )
+        # Keep the stored copy, its search and item index and its series rollup in step
+        if session.get('meeting_id'):
+            summary_store.update_meeting(session['meeting_id'], session['summary'])
+        return redirect(url_for('view_summary'))
+
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    except Exception as e:
+        print(f"Error regenerating section: {str(e)}")
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        traceback.print_exception(exc_type, exc_value, exc_traceback)
+        return jsonify({'error': f"Error regenerating section: {str(e)}"}), 500
+
+@app.route('/transcript')
+def view_transcript():
+    """Display the original transcript turn by turn so summary scenes can link into it"""
+    if not session.get('summary'):
+        return redirect(url_for('index'))
+
+    pipeline_state = pipeline_store.load(session.get('pipeline_state_id', ''))
+    transcript = state_source_transcript(pipeline_state) if pipeline_state else ''
+    if not transcript:
+        return jsonify({'error': 'The stored transcript for this summary is no longer available. '
+                                 'Please generate the summary again.'}), 404
+
+    transcript_index = TranscriptIndex(transcript)
+    turns = [
+        dict(transcript_index.turn_info(turn), text=transcript_index.turn_text(turn))
+        for turn in range(len(transcript_index))
+    ]
+
+    return render_template(
+        'transcript.html',
+        turns=turns,
+        meeting_title=session.get('meeting_title', 'Meeting Summary')
+    )
+
+
+@app.route('/live/start', methods=['POST'])
+def start_live_session():
+    """Start summarizing a meeting that is still running"""
+    data = request.get_json(silent=True) or request.form
+    live_session = LiveMeetingSession.start(
+        openai_helper,
+        pipeline_store,
+        title=data.get('meeting_title', 'Meeting Summary'),
+        date=data.get('meeting_date', ''),
+        duration=data.get('meeting_duration', ''),
+        persona_prompt=data.get('persona_prompt', ''),
+        context_prompt=data.get('context_prompt', ''),
+        redactor=redactor
+    )
+    print(f"Started live session {live_session.session_id}")
+    return jsonify(live_session.progress())
+
+
+@app.route('/live/<session_id>/append', methods=['POST'])
+def append_live_transcript(session_id):
+    """Append a transcript delta; new complete chunks are analyzed and the summary refreshed when due"""
+    data = request.get_json(silent=True) or request.form
+    delta = data.get('text', '')
+    refresh = str(data.get('refresh', 'false')).lower() == 'true'
+
+    try:
+        with pipeline_store.lock(session_id):
+            live_session = LiveMeetingSession.load(openai_helper, pipeline_store, session_id, redactor)
+            if live_session is None:
+                return jsonify({'error': 'Unknown live session.'}), 404
+
+            deadline = Deadline(SUMMARY_DEADLINE_SECONDS)
+            progress = live_session.append(delta, deadline)
+
+            summary = None
+            if refresh:
+                # Include the unfinished last line, held back until now for redaction
+                live_session.flush()
+            if refresh or live_session.refresh_due(LIVE_REFRESH_CHUNKS, LIVE_REFRESH_SECONDS):
+                summary = summary_generator.summarize_live(live_session, deadline)
+                progress = live_session.progress()
+
+        progress['refreshed'] = summary is not None
+        if summary is not None:
+            progress['markdown'] = summary['markdown']
+        return jsonify(progress)
+
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    except Exception as e:
+        print(f"Error updating live session: {str(e)}")
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        traceback.print_exception(exc_type, exc_value, exc_traceback)
+        return jsonify({'error': f"Error updating live session: {str(e)}"}), 500
+
+
+@app.route('/live/<session_id>/summary', methods=['GET', 'POST'])
+def live_summary(session_id):
+    """Return the latest live summary; POST (or ?refresh=true) re-consolidates it first"""
+    refresh = request.method == 'POST' or request.args.get('refresh', 'false').lower() == 'true'
+
+    try:
+        with pipeline_store.lock(session_id):
+            live_session = LiveMeetingSession.load(openai_helper, pipeline_store, session_id, redactor)
+            if live_session is None:
+                return jsonify({'error': 'Unknown live session.'}), 404
+
+            summary = live_session.state.get('summary')
+            if refresh:
+                live_session.flush()
+            if refresh or summary is None:
+                summary = summary_generator.summarize_live(live_session, Deadline(SUMMARY_DEADLINE_SECONDS))
+
+            if request.args.get('format') == 'json':
+                return jsonify(dict(live_session.progress(), summary=summary))
+
+            # Snapshot the state so the summary page can regenerate sections and show the transcript
+            state = live_session.state
+            model_transcript = live_session.model_transcript()
+            pipeline_state = {
+                "transcript_facts": state.get("transcript_facts"),
+                "redacted_transcript": model_transcript,
+                "model_chars": len(model_transcript),
+                "chunk_analyses": live_session.consolidation_records(),
+                "redactions": state.get("redactions", {}),
+                "title": state["title"],
+                "date": state["date"],
+                "duration": state["duration"],
+                "persona_prompt": state["persona_prompt"],
+                "context_prompt": state["context_prompt"],
+            }
+
+        session['summary'] = summary
+        session['meeting_title'] = state["title"]
+        session['meeting_date'] = state["date"]
+        session['meeting_duration'] = state["duration"]
+        session['persona_prompt'] = state["persona_prompt"]
+        session['context_prompt'] = state["context_prompt"]
+        session['pipeline_state_id'] = pipeline_store.save(pipeline_state)
+        # The live summary is not stored, so it belongs to no stored meeting or series yet
+        session.pop('meeting_id', None)
+        session.pop('meeting_series', None)
+        return redirect(url_for('view_summary'))
+
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    except Exception as e:
+        print(f"Error refreshing live summary: {str(e)}")
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        traceback.print_exception(exc_type, exc_value, exc_traceback)
+        return jsonify({'error': f"Error refreshing live summary: {str(e)}"}), 500
+
+
+@app.route('/series')
+def list_series():
+    """List meeting series"""
+    return jsonify(summary_store.list_series())
+
+
+@app.route('/series/add', methods=['POST'])
+def add_to_series():
+    """Add the current (or a given stored) meeting to a series and update its rollup"""
+    series = request.form.get('series', '').strip()
+    meeting_id = request.form.get('meeting_id', type=int) or session.get('meeting_id')
+    if not series or not meeting_id:
+        return jsonify({'error': 'Please provide a series name and a stored meeting.'}), 400
+
+    try:
+        summary_store.add_to_series(meeting_id, series)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if meeting_id == session.get('meeting_id'):
+        session['meeting_series'] = series
+    return redirect(url_for('view_series', name=series))
+
+
+@app.route('/series/<name>')
+def view_series(name):
+    """Display a series rollup and its latest report"""
+    series = summary_store.get_series(name)
+    if not series:
+        return jsonify({'error': f"Unknown series: {name}"}), 404
+
+    report_html = markdown.markdown(series['report'], extensions=['tables']) if series['report'] else None
+    return render_template(
+        'series.html',
+        series=series,
+        meetings=sorted(series['rollup']['meetings'], key=lambda meeting: meeting['date'] or ''),
+        items={field: rollup_items(series['rollup'], field) for field in ROLLUP_FIELDS},
+        report_html=report_html
     )
 
+
+@app.route('/series/<name>/report', methods=['POST'])
+def generate_series_report(name):
+    """Write a series report from the stored rollup in a single model call"""
+    series = summary_store.get_series(name)
+    if not series:
+        return jsonify({'error': f"Unknown series: {name}"}), 404
+
+    try:
+        report = openai_helper.generate_series_report(
+            name, render_rollup(series['rollup']),
+            persona_prompt=request.form.get('persona_prompt', ''),
+            deadline=Deadline(SUMMARY_DEADLINE_SECONDS)
+        )
+        summary_store.save_series_report(name, report, len(series['rollup']['meetings']))
+        return redirect(url_for('view_series', name=name))
+
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    except Exception as e:
+        print(f"Error generating series report: {str(e)}")
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        traceback.print_exception(exc_type, exc_value, exc_traceback)
+        return jsonify({'error': f"Error generating series report: {str(e)}"}), 500
+
+
+@app.route('/api/actions')
+def query_actions():
+    """Query actions (or decisions) across stored meetings, e.g. ?owner=Jane&status=open"""
+    kind = request.args.get('kind', 'action')
+    status = request.args.get('status', 'open')
+    try:
+        items = summary_store.query_items(
+            kind=None if kind == 'all' else kind,
+            owner=request.args.get('owner', ''),
+            status=None if status == 'all' else status,
+            due_before=request.args.get('due_before', ''),
+            due_after=request.args.get('due_after', ''),
+            meeting_id=request.args.get('meeting_id', type=int),
+            series=request.args.get('series', ''),
+            limit=min(request.args.get('limit', 100, type=int), 1000)
+        )
+    except Exception as e:
+        print(f"Error querying actions: {str(e)}")
+        return jsonify({'error': f"Error querying actions: {str(e)}"}), 500
+    return jsonify({'items': items, 'count': len(items)})
+
+
+@app.route('/api/actions/<int:item_id>', methods=['POST'])
+def update_action(item_id):
+    """Set the status of an action or decision (open, done or cancelled)"""
+    data = request.get_json(silent=True) or request.form
+    try:
+        found = summary_store.set_item_status(item_id, data.get('status', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not found:
+        return jsonify({'error': f"Unknown item: {item_id}"}), 404
+    return jsonify({'id': item_id, 'status': data.get('status')})
+
+
+def _search_results():
+    """Run a search from the request arguments"""
+    results = summary_store.search(
+        request.args.get('q', ''),
+        section=request.args.get('section', ''),
+        date_from=request.args.get('date_from', ''),
+        date_to=request.args.get('date_to', ''),
+        series=request.args.get('series', ''),
+        limit=min(request.args.get('limit', 20, type=int), 200)
+    )
+    for result in results:
+        result['snippet_html'] = snippet_html(result['snippet'])
+    return results
+
+
+@app.route('/api/scheduler')
+def scheduler_metrics():
+    """Queue depth and wait times per priority class of the OpenAI call scheduler"""
+    if call_scheduler is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, 'slots': call_scheduler.slots, 'classes': call_scheduler.metrics()})
+
+
+@app.route('/api/backends')
+def backend_metrics():
+    """Load and health of each configured OpenAI backend"""
+    if backend_pool is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, 'backends': backend_pool.metrics()})
+
+
+@app.route('/api/circuit')
+def circuit_status():
+    """State of the upstream circuit breaker and the calls in its window"""
+    if circuit_breaker is None:
+        return jsonify({'enabled': False})
+    return jsonify(dict(circuit_breaker.status(), enabled=True))
+
+
+@app.route('/api/autotuner')
+def autotuner_metrics():
+    """Fitted call latencies and recent chunking decisions of the chunk-size autotuner"""
+    return jsonify(chunk_tuner.metrics())
+
+
+@app.route('/api/search')
+def api_search():
+    """Ranked full-text search over stored summaries, e.g. ?q=budget&section=decisions_made"""
+    try:
+        results = _search_results()
+    except Exception as e:
+        print(f"Error searching summaries: {str(e)}")
+        return jsonify({'error': f"Error searching summaries: {str(e)}"}), 500
+    return jsonify({'results': results, 'count': len(results)})
+
+
+@app.route('/search')
+def search():
+    """Search page over past meetings"""
+    results = _search_results() if request.args.get('q') else []
+    return render_template(
+        'search.html',
+        results=results,
+        query=request.args,
+        sections=list(SEARCH_SECTIONS) + ([TRANSCRIPT_SECTION] if SEARCH_INDEX_TRANSCRIPTS else [])
+    )
+
+
+@app.route('/meetings/<int:meeting_id>')
+def view_meeting(meeting_id):
+    """Open a stored meeting summary"""
+    meeting = summary_store.get_meeting(meeting_id)
+    if not meeting:
+        return jsonify({'error': f"Unknown meeting: {meeting_id}"}), 404
+
+    session['summary'] = meeting['summary']
+    session['meeting_title'] = meeting['title']
+    session['meeting_date'] = meeting['date']
+    session['meeting_duration'] = meeting['duration']
+    session['persona_prompt'] = ''
+    session['context_prompt'] = ''
+    session['meeting_id'] = meeting_id
+    session['meeting_series'] = meeting['series'] or ''
+    # The transcript of a stored meeting is not kept, so sections cannot be regenerated
+    session.pop('pipeline_state_id', None)
+    return redirect(url_for('view_summary'))
+
+
 @app.route('/export-docx')
 def export_docx():
     """Export the summary as a Word document"""
@@ -280,6 +816,119 @@ def debug_summary():
     return jsonify(session.get('summary'))
 
 
+@app.cli.command('batch-summarize')
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--output', '-o', required=True, type=click.Path(file_okay=False),
+              help='Directory for summaries, Word documents, progress and the report')
+@click.option('--concurrency', default=2, show_default=True, help='Transcripts summarized at once')
+@click.option('--max-api-calls', default=4, show_default=True, help='OpenAI calls in flight at once')
+@click.option('--docx-workers', default=None, type=int, help='Processes for Word export (default: CPU count)')
+@click.option('--store/--no-store', default=True, show_default=True,
+              help='Also save the summaries to the summary database')
+@click.option('--allow-unlimited', is_flag=True,
+              help='Run even though no shared rate limit holds back batch calls')
+def batch_summarize(source, output, concurrency, max_api_calls, docx_workers, store, allow_unlimited):
+    """Summarize a directory or manifest (.csv/.jsonl) of transcripts.
+
+    Runs at batch priority under the shared rate limits, so interactive users keep
+    their reserved share. Rerunning with the same output directory resumes.
+    """
+    # The call scheduler is per process, so the shared limits' batch reserve is the only thing
+    # keeping this job from slowing down interactive requests on the web workers
+    if backend_pool is not None:
+        limited = all(backend.limiter for backend in backend_pool.backends)
+    else:
+        limited = bool(rate_limiter)
+    if not limited and not allow_unlimited:
+        raise click.UsageError(
+            "No shared rate limit is configured (OPENAI_RATE_LIMIT_RPM/TPM, or rpm/tpm of every "
+            "backend in OPENAI_BACKENDS), so this job would compete with interactive requests "
+            "unchecked. Configure one, or pass --allow-unlimited."
+        )
+
+    jobs = collect_jobs(source)
+    runner = BatchRunner(
+        SummaryGenerator(
+            create_openai_helper(priority=PRIORITY_BATCH, scheduler=PriorityScheduler(max_api_calls)),
+            extractive_target_tokens=int(os.getenv("EXTRACTIVE_TARGET_TOKENS", "0")) or None
+        ),
+        output,
+        concurrency=concurrency,
+        docx_workers=docx_workers,
+        redactor=redactor,
+        summary_store=summary_store if store else None
+    )
+    results = runner.run(jobs)
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    click.echo(", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    click.echo(f"Report: {os.path.join(output, REPORT_FILE)}")
+    if counts.get('error'):
+        sys.exit(1)
+
+
+# Offline batch submission: export chunk requests, then ingest each stage's results
+offline_batch_cli = AppGroup('offline-batch', help='Summarize transcripts through batch request files.')
+app.cli.add_command(offline_batch_cli)
+
+
+def _offline_batch() -> OfflineBatch:
+    return OfflineBatch(
+        SummaryGenerator(
+            create_openai_helper(priority=PRIORITY_BATCH),
+            extractive_target_tokens=int(os.getenv("EXTRACTIVE_TARGET_TOKENS", "0")) or None
+        ),
+        pipeline_store
+    )
+
+
+@offline_batch_cli.command('export')
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--requests', '-r', 'requests_path', required=True, type=click.Path(dir_okay=False),
+              help='Batch input file to write the chunk requests to')
+def offline_batch_export(source, requests_path):
+    """Write the chunk requests for a directory or manifest of transcripts."""
+    batch_id = _offline_batch().export(collect_jobs(source), requests_path, redactor)
+    click.echo(f"Batch id: {batch_id}")
+
+
+@offline_batch_cli.command('ingest')
+@click.argument('batch_id')
+@click.argument('results', type=click.Path(exists=True, dir_okay=False))
+@click.option('--requests', '-r', 'requests_path', type=click.Path(dir_okay=False),
+              help='Batch input file for the consolidation requests (after the chunk stage)')
+@click.option('--output', '-o', type=click.Path(file_okay=False),
+              help='Directory for summaries, Word documents and the report (after the consolidation stage)')
+@click.option('--store/--no-store', default=True, show_default=True,
+              help='Also save the summaries to the summary database')
+def offline_batch_ingest(batch_id, results, requests_path, output, store):
+    """Read a stage's batch results and move the batch to its next stage."""
+    offline_batch = _offline_batch()
+    try:
+        if offline_batch.load(batch_id)['stage'] == STAGE_REDUCE and not output:
+            raise ValueError("The consolidation stage needs --output")
+        summaries = offline_batch.ingest(batch_id, results, requests_path)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    batch = offline_batch.load(batch_id)
+    if batch['stage'] == STAGE_DONE:
+        report = save_summaries(batch, summaries, output, summary_store if store else None)
+        click.echo(f"Report: {report}")
+
+
+@offline_batch_cli.command('run-local')
+@click.argument('requests_path', type=click.Path(exists=True, dir_okay=False))
+@click.argument('results', type=click.Path(dir_okay=False))
+@click.option('--concurrency', default=2, show_default=True, help='Requests sent at once')
+def offline_batch_run_local(requests_path, results, concurrency):
+    """Process a batch input file with live calls, in place of the batch service."""
+    failed = run_batch_locally(create_openai_helper(priority=PRIORITY_BATCH), requests_path, results, concurrency)
+    click.echo(f"Wrote {results} ({failed} failed requests)")
+
+
 if __name__ == '__main__':
     debug_mode = os.getenv("FLASK_ENV", "development") == "development"
     app.run(debug=debug_mode, host='0.0.0.0')
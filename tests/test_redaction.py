@@ -0,0 +1,39 @@
+import pytest
+
+from utils import redaction
+from utils.redaction import Redactor
+
+
+@pytest.fixture(params=["automaton", "regex"])
+def matcher(request, monkeypatch):
+    """Run each case with the pyahocorasick automaton and with the regex fallback"""
+    if request.param == "automaton":
+        if redaction.ahocorasick is None:
+            pytest.skip("pyahocorasick is not installed")
+    else:
+        monkeypatch.setattr(redaction, "ahocorasick", None)
+    return request.param
+
+
+def test_prefix_term_inside_longer_word(matcher):
+    result = Redactor(["john", "john smith"], patterns={}).redact("Then john smithson said hi")
+    assert result.text == "Then [NAME_1] smithson said hi"
+    assert result.placeholders == {"[NAME_1]": "john"}
+
+
+def test_longest_overlapping_term_wins(matcher):
+    result = Redactor(["john", "john smith", "smith"], patterns={}).redact("John Smith met Smith and john")
+    assert result.text == "[NAME_1] met [NAME_2] and [NAME_3]"
+    assert result.placeholders == {"[NAME_1]": "John Smith", "[NAME_2]": "Smith", "[NAME_3]": "john"}
+
+
+def test_term_inside_word_is_not_redacted(matcher):
+    result = Redactor(["ann"], patterns={}).redact("Joanna and Ann planned it")
+    assert result.text == "Joanna and [NAME_1] planned it"
+
+
+def test_restore_round_trip(matcher):
+    text = "Then john smithson said hi, call 555-123-4567"
+    result = Redactor(["john", "john smith"]).redact(text)
+    assert "john" not in result.text and "555" not in result.text
+    assert result.restore(result.text) == text
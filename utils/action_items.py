@@ -0,0 +1,184 @@
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+# Item kinds kept in the action/decision index, with the summary list and fields each comes from
+ITEM_SOURCES = {
+    "action": {"list": "actions_planned", "text": "action", "owner": "responsible", "details": "timeline"},
+    "decision": {"list": "decisions_made", "text": "decision", "owner": "owner", "details": "details"},
+}
+
+ITEM_STATUSES = ("open", "done", "cancelled")
+
+OWNER_SEPARATOR = re.compile(r"\s*(?:,|;|/|&|\band\b)\s*", re.IGNORECASE)
+# Parenthesized notes ("Jane (SSA)") and titles are not part of the name
+OWNER_NOISE = re.compile(r"\([^)]*\)|\b(?:mr|mrs|ms|dr)\.?\s+", re.IGNORECASE)
+PLACEHOLDER_OWNERS = {"", "tbd", "n a", "na", "none", "unknown", "unassigned", "all", "everyone", "team"}
+
+MONTHS = {name: number for number, names in enumerate([
+    ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"), ("may",), ("june", "jun"),
+    ("july", "jul"), ("august", "aug"), ("september", "sep", "sept"), ("october", "oct"),
+    ("november", "nov"), ("december", "dec"),
+], start=1) for name in names}
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+ISO_DATE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+US_DATE = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})\b")
+MONTH_FIRST = re.compile(r"\b([a-z]{3,9})\.?\s+(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?\b", re.IGNORECASE)
+DAY_FIRST = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+([a-z]{3,9})\.?(?:,?\s+(\d{4}))?\b", re.IGNORECASE)
+WEEKDAY = re.compile(r"\b(next\s+)?(" + "|".join(WEEKDAYS) + r")\b", re.IGNORECASE)
+NEXT_WEEK = re.compile(r"\bnext\s+week\b", re.IGNORECASE)
+END_OF_MONTH = re.compile(r"\bend\s+of\s+(?:the\s+)?month\b", re.IGNORECASE)
+
+
+def normalize_owner(name: str) -> str:
+    """Lower-case an owner name and strip punctuation, notes and titles"""
+    name = OWNER_NOISE.sub(" ", name)
+    return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+
+
+def split_owners(text: str) -> List[str]:
+    """
+    Split an owner cell ("Jane Doe, Bob & Ann (SSA)") into normalized names
+
+    Args:
+        text: Owner or Responsible cell from the summary
+
+    Returns:
+        Normalized owner names, placeholders like "TBD" removed
+    """
+    names = []
+    for part in OWNER_SEPARATOR.split(text or ""):
+        name = normalize_owner(part)
+        if name not in PLACEHOLDER_OWNERS and name not in names:
+            names.append(name)
+    return names
+
+
+def owner_keys(names: List[str]) -> List[str]:
+    """
+    Index keys for a list of owners: each full name plus each word of it
+
+    Indexing the words lets a query for "Jane" find items owned by "Jane Doe".
+
+    Args:
+        names: Normalized owner names
+
+    Returns:
+        Distinct keys
+    """
+    keys = []
+    for name in names:
+        for key in [name] + name.split():
+            if len(key) > 1 and key not in keys:
+                keys.append(key)
+    return keys
+
+
+def _parse_iso(text: str) -> Optional[date]:
+    try:
+        return datetime.strptime(text[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def parse_due_date(text: str, meeting_date: str = "") -> Optional[str]:
+    """
+    Find a due date in a Timeline cell
+
+    Calendar dates in common formats are read directly. Relative phrases ("Friday",
+    "next week", "end of month") are resolved against the meeting date when it is known.
+    A date without a year takes the meeting's year.
+
+    Args:
+        text: Timeline text, e.g. "2026-03-15", "by March 15" or "next Friday"
+        meeting_date: Meeting date in ISO format, if known
+
+    Returns:
+        ISO due date, or None if no date could be read
+    """
+    if not text:
+        return None
+    reference = _parse_iso(meeting_date)
+    default_year = reference.year if reference else None
+
+    match = ISO_DATE.search(text)
+    if match:
+        found = _safe_date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        return found.isoformat() if found else None
+
+    match = US_DATE.search(text)
+    if match:
+        year = int(match.group(3))
+        year += 2000 if year < 100 else 0
+        found = _safe_date(year, int(match.group(1)), int(match.group(2)))
+        return found.isoformat() if found else None
+
+    for pattern, month_group, day_group in ((MONTH_FIRST, 1, 2), (DAY_FIRST, 2, 1)):
+        for match in pattern.finditer(text):
+            month = MONTHS.get(match.group(month_group).lower())
+            year = int(match.group(3)) if match.group(3) else default_year
+            if month and year:
+                found = _safe_date(year, month, int(match.group(day_group)))
+                if found:
+                    return found.isoformat()
+
+    if reference is None:
+        return None
+
+    match = WEEKDAY.search(text)
+    if match:
+        days_ahead = (WEEKDAYS.index(match.group(2).lower()) - reference.weekday()) % 7 or 7
+        if match.group(1) and days_ahead < 7:
+            days_ahead += 7
+        return (reference + timedelta(days=days_ahead)).isoformat()
+
+    if NEXT_WEEK.search(text):
+        # End of next week
+        return (reference + timedelta(days=11 - reference.weekday())).isoformat()
+
+    if END_OF_MONTH.search(text):
+        next_month = reference.replace(day=28) + timedelta(days=4)
+        return (next_month - timedelta(days=next_month.day)).isoformat()
+
+    return None
+
+
+def extract_items(summary: Dict[str, Any], meeting_date: str = "") -> List[Dict[str, Any]]:
+    """
+    Pull the actions and decisions out of a structured summary for indexing
+
+    Args:
+        summary: Structured summary returned by SummaryGenerator.generate()
+        meeting_date: Meeting date in ISO format, used for relative due dates
+
+    Returns:
+        List of item dictionaries with kind, text, details, owner, owner_keys and due_date
+    """
+    items = []
+    for kind, source in ITEM_SOURCES.items():
+        for entry in summary.get(source["list"]) or []:
+            if not isinstance(entry, dict):
+                continue
+            text = (entry.get(source["text"]) or "").strip()
+            # Skip empty rows and table separator rows
+            if not re.sub(r"[\s:|-]+", "", text):
+                continue
+            details = (entry.get(source["details"]) or "").strip()
+            owner = (entry.get(source["owner"]) or "").strip()
+            items.append({
+                "kind": kind,
+                "text": text,
+                "details": details,
+                "owner": owner,
+                "owner_keys": owner_keys(split_owners(owner)),
+                "due_date": parse_due_date(details, meeting_date) if kind == "action" else None,
+            })
+    return items
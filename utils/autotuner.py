@@ -0,0 +1,227 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from scipy.optimize import nnls
+
+# Defaults used until enough calls have been observed (and by offline batch files)
+DEFAULT_CHUNK_SIZE = 7500
+DEFAULT_DIRECT_MAX_CHARS = 100000
+
+# Quality bounds: smaller chunks split discussions across chunk records, larger ones lose
+# detail in the per-chunk extraction; a single call over very long text misses the middle,
+# and map-reduce over short text only adds a consolidation pass
+MIN_CHUNK_SIZE = 4000
+MAX_CHUNK_SIZE = 15000
+CHUNK_SIZE_STEP = 500
+MIN_MAP_REDUCE_CHARS = 40000
+MAX_DIRECT_CHARS = 200000
+
+# Recent calls kept per model for the latency fit
+TUNER_SAMPLES = 500
+# Calls observed for a model before its fit replaces the defaults
+MIN_TUNER_SAMPLES = 20
+
+# Completion tokens per prompt token of a map call, until map calls have been observed
+DEFAULT_MAP_OUTPUT_RATIO = 0.3
+
+# Recent decisions kept for the metrics
+DECISION_SAMPLES = 50
+
+MODE_DIRECT = "direct"
+MODE_MAP_REDUCE = "map_reduce"
+
+
+class ChunkTuner:
+    """
+    Pick the map-phase chunk size and the direct vs map-reduce cut-over from observed latency
+
+    Every upstream call reports its input tokens, output tokens and latency; per model these
+    are fitted to seconds = base + a * input + b * output with non-negative coefficients. For
+    each transcript the tuner predicts the wall-clock time of a single direct call and of
+    map-reduce at each chunk size within the quality bounds (map calls run in waves of the
+    available concurrency, and no faster than the rate limits allow, followed by one
+    consolidation call) and picks the fastest.
+    """
+
+    def __init__(self, chunk_size: Optional[int] = None, direct_max_chars: Optional[int] = None,
+                 enabled: bool = True):
+        """
+        Initialize the tuner
+
+        Args:
+            chunk_size: Fixed chunk size in characters instead of a tuned one
+            direct_max_chars: Fixed cut-over in characters: longer transcripts use map-reduce
+            enabled: Tune at all; when False the defaults (or the fixed values) are always used
+        """
+        self.chunk_size = chunk_size
+        self.direct_max_chars = direct_max_chars
+        self.enabled = enabled
+        self._calls: Dict[str, deque] = {}
+        self._map_outputs: deque = deque(maxlen=TUNER_SAMPLES)
+        self._decisions: deque = deque(maxlen=DECISION_SAMPLES)
+        self._fits: Dict[str, Optional[np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, input_tokens: int, output_tokens: int, seconds: float) -> None:
+        """Record a successful upstream call"""
+        with self._lock:
+            self._calls.setdefault(model, deque(maxlen=TUNER_SAMPLES)).append(
+                (input_tokens, output_tokens, seconds)
+            )
+            # Refit lazily on the next prediction
+            self._fits.pop(model, None)
+
+    def record_map_output(self, input_tokens: int, output_tokens: int) -> None:
+        """Record the size of a map call's answer relative to its prompt"""
+        if input_tokens > 0:
+            with self._lock:
+                self._map_outputs.append(output_tokens / input_tokens)
+
+    def _fit(self, model: str) -> Optional[np.ndarray]:
+        """Non-negative least-squares fit of the model's recent calls; None if too few"""
+        if model in self._fits:
+            return self._fits[model]
+        calls = self._calls.get(model, ())
+        fit = None
+        if len(calls) >= MIN_TUNER_SAMPLES:
+            data = np.array(calls, dtype=float)
+            features = np.column_stack([np.ones(len(data)), data[:, 0] / 1000, data[:, 1] / 1000])
+            fit, _ = nnls(features, data[:, 2])
+        self._fits[model] = fit
+        return fit
+
+    def predict(self, model: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+        """
+        Expected latency of one call
+
+        Returns:
+            Seconds, or None if too few calls to the model have been observed
+        """
+        with self._lock:
+            fit = self._fit(model)
+        if fit is None:
+            return None
+        return float(fit[0] + fit[1] * input_tokens / 1000 + fit[2] * output_tokens / 1000)
+
+    def map_output_ratio(self) -> float:
+        with self._lock:
+            if len(self._map_outputs) < MIN_TUNER_SAMPLES:
+                return DEFAULT_MAP_OUTPUT_RATIO
+            return float(np.median(self._map_outputs))
+
+    def _map_reduce_seconds(self, transcript_chars: int, chunk_size: int, chars_per_token: int,
+                            map_stage: Dict[str, Any], reduce_stage: Dict[str, Any],
+                            requests_per_minute: float, tokens_per_minute: float) -> Optional[float]:
+        chunks = max(1, math.ceil(transcript_chars / chunk_size))
+        chunk_tokens = map_stage["overhead_tokens"] + min(chunk_size, transcript_chars) // chars_per_token
+        map_output = min(map_stage["max_tokens"], int(chunk_tokens * self.map_output_ratio()))
+        map_call = self.predict(map_stage["model"], chunk_tokens, map_output)
+        reduce_call = self.predict(reduce_stage["model"],
+                                   reduce_stage["overhead_tokens"] + chunks * map_output,
+                                   reduce_stage["output_tokens"])
+        if map_call is None or reduce_call is None:
+            return None
+
+        map_seconds = math.ceil(chunks / max(1, map_stage["concurrency"])) * map_call
+        # The rate limits cap how fast the map calls can be sent, whatever the concurrency
+        if requests_per_minute:
+            map_seconds = max(map_seconds, chunks / requests_per_minute * 60)
+        if tokens_per_minute:
+            map_seconds = max(map_seconds, chunks * (chunk_tokens + map_stage["max_tokens"]) / tokens_per_minute * 60)
+        return map_seconds + reduce_call
+
+    def plan(self, transcript_chars: int, direct_stage: Dict[str, Any], map_stage: Dict[str, Any],
+             reduce_stage: Dict[str, Any], chars_per_token: int = 4,
+             requests_per_minute: float = 0, tokens_per_minute: float = 0) -> Dict[str, Any]:
+        """
+        Decide how to summarize a transcript
+
+        Args:
+            transcript_chars: Length of the transcript in characters
+            direct_stage: model, overhead_tokens (prompt without the transcript) and output_tokens
+                of the single direct call
+            map_stage: model, overhead_tokens, max_tokens and concurrency of the map calls
+            reduce_stage: model, overhead_tokens and output_tokens of the consolidation call
+            chars_per_token: Characters per token for turning lengths into tokens
+            requests_per_minute: Request limit the map calls share (0 for none)
+            tokens_per_minute: Token limit the map calls share (0 for none)
+
+        Returns:
+            Dictionary with mode ("direct" or "map_reduce"), chunk_size, the predicted seconds of
+            each mode (None when unknown) and the reason for the choice
+        """
+        plan = {
+            "transcript_chars": transcript_chars,
+            "mode": MODE_MAP_REDUCE if transcript_chars > (self.direct_max_chars or DEFAULT_DIRECT_MAX_CHARS)
+            else MODE_DIRECT,
+            "chunk_size": self.chunk_size or DEFAULT_CHUNK_SIZE,
+            "direct_seconds": None,
+            "map_reduce_seconds": None,
+            "reason": "defaults",
+        }
+
+        if self.enabled:
+            candidates = [self.chunk_size] if self.chunk_size else \
+                list(range(MIN_CHUNK_SIZE, MAX_CHUNK_SIZE + 1, CHUNK_SIZE_STEP))
+            best = None
+            for chunk_size in candidates:
+                seconds = self._map_reduce_seconds(transcript_chars, chunk_size, chars_per_token,
+                                                   map_stage, reduce_stage,
+                                                   requests_per_minute, tokens_per_minute)
+                if seconds is not None and (best is None or seconds < best[1]):
+                    best = (chunk_size, seconds)
+            direct_seconds = self.predict(
+                direct_stage["model"],
+                direct_stage["overhead_tokens"] + transcript_chars // chars_per_token,
+                direct_stage["output_tokens"]
+            )
+
+            if best is None or direct_seconds is None:
+                plan["reason"] = "defaults (too few observed calls)"
+            else:
+                plan["chunk_size"], plan["map_reduce_seconds"] = best[0], round(best[1], 1)
+                plan["direct_seconds"] = round(direct_seconds, 1)
+                if self.direct_max_chars:
+                    plan["reason"] = "fixed cut-over"
+                elif transcript_chars <= MIN_MAP_REDUCE_CHARS:
+                    plan["mode"], plan["reason"] = MODE_DIRECT, "too short for map-reduce"
+                elif transcript_chars > MAX_DIRECT_CHARS:
+                    plan["mode"], plan["reason"] = MODE_MAP_REDUCE, "too long for one call"
+                else:
+                    plan["mode"] = MODE_DIRECT if direct_seconds <= best[1] else MODE_MAP_REDUCE
+                    plan["reason"] = "fastest predicted"
+
+        with self._lock:
+            self._decisions.append(dict(plan, at=time.time()))
+        return plan
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Fitted latency models and recent decisions
+
+        Returns:
+            Dictionary with the fixed settings, per-model call counts and fitted coefficients
+            (seconds base, per 1k input tokens and per 1k output tokens), the map output ratio
+            and the most recent decisions
+        """
+        with self._lock:
+            models = {}
+            for model, calls in self._calls.items():
+                fit = self._fit(model)
+                models[model] = {
+                    "calls": len(calls),
+                    "coefficients": None if fit is None else [round(float(value), 4) for value in fit],
+                }
+            decisions: List[Dict[str, Any]] = list(self._decisions)
+        return {
+            "enabled": self.enabled,
+            "chunk_size": self.chunk_size,
+            "direct_max_chars": self.direct_max_chars,
+            "models": models,
+            "map_output_ratio": round(self.map_output_ratio(), 3),
+            "decisions": decisions,
+        }
@@ -0,0 +1,279 @@
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional, Set
+
+import openai
+
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.rate_limiter import SharedRateLimiter, PRIORITY_INTERACTIVE, MAX_POLL_SECONDS
+
+# Consecutive failures that take a backend out of rotation
+DEFAULT_FAILURE_THRESHOLD = 3
+# First ejection; each ejection in a row doubles it, up to the maximum
+DEFAULT_EJECTION_SECONDS = 30.0
+MAX_EJECTION_SECONDS = 300.0
+
+# Backends tried for one call before its error is raised
+MAX_BACKEND_ATTEMPTS = 2
+
+# Local OpenAI-compatible servers usually ignore the key, but the client requires one
+PLACEHOLDER_API_KEY = "unused"
+
+
+def is_backend_failure(error: Exception) -> bool:
+    """
+    Whether an error says something about the backend's health rather than the request
+
+    Connection errors, timeouts, rate limiting and server errors count; bad requests
+    (context length, unsupported parameters) would fail on any backend.
+    """
+    if isinstance(error, (openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and status_code >= 500
+
+
+class Backend:
+    """One OpenAI-compatible endpoint and key, with its load and health"""
+
+    def __init__(self, name: str, client: Any, model: Optional[str] = None,
+                 limiter: Optional[SharedRateLimiter] = None):
+        """
+        Initialize the backend
+
+        Args:
+            name: Name shown in logs and metrics
+            client: openai.OpenAI client bound to the endpoint and key
+            model: Model to use on this backend in place of the requested one (e.g. for local servers)
+            limiter: Optional rate limits of this key
+        """
+        self.name = name
+        self.client = client
+        self.model = model
+        self.limiter = limiter if limiter else None
+        self.outstanding = 0
+        self.served = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections_in_row = 0
+        self.ejected_until = 0.0
+        self.average_latency = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+
+class BackendPool:
+    """
+    Route chat completions across several OpenAI-compatible backends
+
+    Each call goes to the healthy backend with the fewest requests in flight whose own
+    rate limits have room. Health is checked passively: a backend that fails several calls
+    in a row is ejected for a cooldown that doubles with each ejection in a row, then put
+    back on probation, where one more failure ejects it again and a success restores it.
+    A call that fails on one backend for a health reason is retried once on another.
+    """
+
+    def __init__(self, backends: List[Backend],
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 ejection_seconds: float = DEFAULT_EJECTION_SECONDS):
+        """
+        Initialize the pool
+
+        Args:
+            backends: Backends to route between
+            failure_threshold: Consecutive failures that eject a backend
+            ejection_seconds: Length of the first ejection
+
+        Raises:
+            ValueError: If there are no backends
+        """
+        if not backends:
+            raise ValueError("A backend pool needs at least one backend")
+        self.backends = backends
+        self.failure_threshold = max(1, failure_threshold)
+        self.ejection_seconds = ejection_seconds
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: List[Dict[str, Any]], limiter_path: str,
+                    batch_reserve: float, **options) -> "BackendPool":
+        """
+        Build a pool from a list of backend settings
+
+        Each entry may set name, base_url (omit for the OpenAI API), api_key or api_key_env
+        (the name of an environment variable holding the key), model, rpm and tpm.
+
+        Args:
+            config: Backend settings, e.g. parsed from the OPENAI_BACKENDS environment variable
+            limiter_path: SQLite file for the per-backend rate limits
+            batch_reserve: Share of each backend's limits batch callers may not use
+            **options: Passed on to the pool
+
+        Returns:
+            Configured pool
+        """
+        backends = []
+        for number, settings in enumerate(config, start=1):
+            name = settings.get("name") or f"backend{number}"
+            api_key = settings.get("api_key") or os.getenv(settings.get("api_key_env", ""), "")
+            client = openai.OpenAI(
+                api_key=api_key or PLACEHOLDER_API_KEY,
+                base_url=settings.get("base_url") or None,
+                # Retries are done here, on another backend
+                max_retries=0
+            )
+            limiter = SharedRateLimiter(
+                limiter_path,
+                requests_per_minute=int(settings.get("rpm", 0)),
+                tokens_per_minute=int(settings.get("tpm", 0)),
+                batch_reserve=batch_reserve,
+                name=name
+            )
+            backends.append(Backend(name, client, settings.get("model"), limiter))
+        return cls(backends, **options)
+
+    def _candidates(self, exclude: Set[str]) -> List[Backend]:
+        """Healthy backends by load; if every backend is ejected, the one that recovers first"""
+        now = time.time()
+        backends = [backend for backend in self.backends if backend.name not in exclude] or self.backends
+        healthy = [backend for backend in backends if backend.healthy(now)]
+        if not healthy:
+            return [min(backends, key=lambda backend: backend.ejected_until)]
+        # Fewest in flight first; spread ties over the backends that have served least
+        return sorted(healthy, key=lambda backend: (backend.outstanding, backend.served))
+
+    def acquire(self, tokens: int, priority: str = PRIORITY_INTERACTIVE,
+                deadline: Optional[Deadline] = None, exclude: Optional[Set[str]] = None) -> Backend:
+        """
+        Pick a backend for one call and take the capacity from its rate limits
+
+        Args:
+            tokens: Tokens the call may use
+            priority: Priority class of the call
+            deadline: Optional request deadline; waiting past it raises DeadlineExceeded
+            exclude: Names of backends already tried for this call
+
+        Returns:
+            The backend, counted as having one more call in flight until release()
+
+        Raises:
+            DeadlineExceeded: If no backend has capacity before the deadline
+        """
+        while True:
+            with self._lock:
+                candidates = self._candidates(exclude or set())
+
+            shortest_wait = None
+            for backend in candidates:
+                wait = backend.limiter.try_acquire(tokens, priority) if backend.limiter else 0.0
+                if wait <= 0:
+                    with self._lock:
+                        backend.outstanding += 1
+                    return backend
+                shortest_wait = wait if shortest_wait is None else min(shortest_wait, wait)
+
+            if deadline is not None and deadline.remaining() < shortest_wait:
+                raise DeadlineExceeded("No OpenAI backend has rate limit capacity before the deadline")
+            time.sleep(min(shortest_wait, MAX_POLL_SECONDS) * random.uniform(0.8, 1.2))
+
+    def release(self, backend: Backend, seconds: float, failed: bool = False) -> None:
+        """
+        Record the outcome of a call made with acquire()
+
+        Args:
+            backend: Backend the call went to
+            seconds: Duration of the call
+            failed: Whether the call failed for a health reason (see is_backend_failure)
+        """
+        with self._lock:
+            backend.outstanding -= 1
+            backend.served += 1
+            if not failed:
+                backend.consecutive_failures = 0
+                backend.ejections_in_row = 0
+                # Smoothed latency, for the metrics
+                backend.average_latency = seconds if not backend.average_latency \
+                    else 0.8 * backend.average_latency + 0.2 * seconds
+                return
+
+            backend.failures += 1
+            backend.consecutive_failures += 1
+            if backend.consecutive_failures >= self.failure_threshold:
+                cooldown = min(MAX_EJECTION_SECONDS, self.ejection_seconds * 2 ** backend.ejections_in_row)
+                backend.ejections_in_row += 1
+                backend.ejected_until = time.time() + cooldown
+                # On probation after the cooldown: the next failure ejects it again
+                backend.consecutive_failures = self.failure_threshold - 1
+                print(f"OpenAI backend {backend.name} ejected for {cooldown:.0f}s after repeated errors")
+
+    def complete(self, request_body: Dict[str, Any], request_options: Dict[str, Any], tokens: int,
+                 priority: str = PRIORITY_INTERACTIVE, deadline: Optional[Deadline] = None) -> Any:
+        """
+        Send a chat completion through the pool
+
+        Args:
+            request_body: Chat request body from OpenAIHelper.chat_request()
+            request_options: Extra client options; the timeout is reset from the deadline
+            tokens: Tokens the call may use
+            priority: Priority class of the call
+            deadline: Optional request deadline; sets the call's timeout
+
+        Returns:
+            The chat completion response
+
+        Raises:
+            Exception: The error of the last backend tried
+        """
+        tried = set()
+        while True:
+            backend = self.acquire(tokens, priority, deadline, tried)
+            tried.add(backend.name)
+            options = dict(request_options)
+            if deadline is not None:
+                options["timeout"] = deadline.timeout()
+            body = dict(request_body, model=backend.model or request_body["model"])
+
+            started = time.monotonic()
+            try:
+                response = backend.client.chat.completions.create(**body, **options)
+            except Exception as e:
+                # A timeout cut short by the request deadline is not the backend's fault
+                failed = is_backend_failure(e) and not (
+                    deadline is not None and isinstance(e, openai.APITimeoutError)
+                )
+                self.release(backend, time.monotonic() - started, failed)
+                if not failed or len(tried) >= min(MAX_BACKEND_ATTEMPTS, len(self.backends)):
+                    raise
+                print(f"OpenAI backend {backend.name} failed ({type(e).__name__}); retrying on another backend")
+                continue
+
+            self.release(backend, time.monotonic() - started)
+            return response
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """
+        Load and health per backend
+
+        Returns:
+            One dictionary per backend with name, model, outstanding and served calls,
+            failures, whether it is healthy, seconds until it returns if ejected,
+            and its average latency
+        """
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "name": backend.name,
+                    "model": backend.model,
+                    "outstanding": backend.outstanding,
+                    "served": backend.served,
+                    "failures": backend.failures,
+                    "healthy": backend.healthy(now),
+                    "ejected_for": round(max(0.0, backend.ejected_until - now), 1),
+                    "average_latency": round(backend.average_latency, 3),
+                }
+                for backend in self.backends
+            ]
@@ -0,0 +1,332 @@
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+
+from utils.deadline import Deadline
+from utils.docx_exporter import DocxExporter
+from utils.redaction import Redactor
+from utils.summary_generator import SummaryGenerator
+from utils.summary_store import SummaryStore
+from utils.transcript_index import TranscriptIndex
+from utils.transcript_loader import TRANSCRIPT_EXTENSIONS, load_transcript
+
+# Manifest columns besides "path"; missing ones default to empty (title defaults to the file name)
+MANIFEST_FIELDS = ("title", "date", "duration", "series", "persona_prompt", "context_prompt")
+
+PROGRESS_FILE = "progress.jsonl"
+REPORT_FILE = "report.csv"
+REPORT_COLUMNS = ("file", "title", "status", "characters", "seconds", "partial",
+                  "summary_json", "docx", "meeting_id", "error")
+
+# Time budget per transcript; batch jobs are not bound by the gunicorn timeout
+DEFAULT_JOB_SECONDS = 1800.0
+
+
+def _job_from_fields(path: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+    job = {"path": os.path.abspath(path)}
+    for name in MANIFEST_FIELDS:
+        job[name] = str(fields.get(name) or "").strip()
+    if not job["title"]:
+        job["title"] = os.path.splitext(os.path.basename(path))[0]
+    return job
+
+
+def collect_jobs(source: str) -> List[Dict[str, Any]]:
+    """
+    List the transcripts to summarize from a directory or a manifest
+
+    A directory yields every transcript file in it (sorted, not recursive). A manifest is a
+    .csv file with a header row or a .jsonl file with one object per line; each entry needs
+    a "path" (relative paths are resolved against the manifest) and may set title, date,
+    duration, series, persona_prompt and context_prompt.
+
+    Args:
+        source: Directory or manifest path
+
+    Returns:
+        List of job dictionaries
+
+    Raises:
+        Exception: If the source is not a directory or a supported manifest
+    """
+    if os.path.isdir(source):
+        return [
+            _job_from_fields(os.path.join(source, name), {})
+            for name in sorted(os.listdir(source))
+            if os.path.isfile(os.path.join(source, name))
+            and not name.startswith(".")
+            and os.path.splitext(name)[1].lower() in TRANSCRIPT_EXTENSIONS
+        ]
+
+    extension = os.path.splitext(source)[1].lower()
+    with open(source, newline="", encoding="utf-8") as f:
+        if extension == ".csv":
+            entries = list(csv.DictReader(f))
+        elif extension == ".jsonl":
+            entries = [json.loads(line) for line in f if line.strip()]
+        else:
+            raise Exception(f"Unsupported manifest type: {extension}. Use a directory, .csv or .jsonl file.")
+
+    base = os.path.dirname(os.path.abspath(source))
+    jobs = []
+    for number, entry in enumerate(entries, start=1):
+        path = (entry.get("path") or "").strip()
+        if not path:
+            raise Exception(f"Manifest entry {number} has no path")
+        jobs.append(_job_from_fields(os.path.join(base, path), entry))
+    return jobs
+
+
+def job_key(job: Dict[str, Any]) -> str:
+    """Identify a job by its file and the file's size and mtime, so edited transcripts are redone"""
+    try:
+        stat = os.stat(job["path"])
+        return f"{job['path']}:{stat.st_size}:{int(stat.st_mtime)}"
+    except OSError:
+        return job["path"]
+
+
+def export_docx_file(summary: Dict[str, Any], output_path: str,
+                     title: str = "", date: str = "", duration: str = "") -> str:
+    """
+    Export one summary to a Word document; module-level so it can run in a worker process
+
+    Args:
+        summary: Structured summary
+        output_path: Path of the Word document
+        title: Meeting title
+        date: Meeting date
+        duration: Meeting duration
+
+    Returns:
+        Path of the Word document
+    """
+    DocxExporter().export(summary, output_path, title=title, date=date, duration=duration)
+    return output_path
+
+
+def write_report(output_dir: str, results: List[Dict[str, Any]]) -> str:
+    """
+    Write per-file batch results as CSV
+
+    Args:
+        output_dir: Directory the report is written to
+        results: One dictionary per file with the REPORT_COLUMNS keys
+
+    Returns:
+        Path of the report
+    """
+    report_path = os.path.join(output_dir, REPORT_FILE)
+    with open(report_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+    return report_path
+
+
+class BatchRunner:
+    """
+    Summarize many transcripts with bounded concurrency and resumable progress
+
+    Summaries are generated on a thread pool (the work is waiting on the API); Word
+    documents are built on a process pool since python-docx is CPU-bound. Every finished
+    file is appended to progress.jsonl in the output directory, so an interrupted run
+    picks up where it stopped. Summaries are saved as JSON next to the documents, which
+    lets a rerun redo a failed docx export without calling the API again.
+    """
+
+    def __init__(self, summary_generator: SummaryGenerator, output_dir: str,
+                 concurrency: int = 2, docx_workers: Optional[int] = None,
+                 redactor: Optional[Redactor] = None, summary_store: Optional[SummaryStore] = None,
+                 job_seconds: float = DEFAULT_JOB_SECONDS):
+        """
+        Initialize the runner
+
+        Args:
+            summary_generator: Generator used for every transcript
+            output_dir: Directory for the summaries, documents, progress file and report
+            concurrency: Transcripts summarized at once
+            docx_workers: Processes for Word export (defaults to the CPU count)
+            redactor: Optional PII redactor applied before anything is sent upstream
+            summary_store: Optional store the summaries are saved to (for series and search)
+            job_seconds: Time budget per transcript
+        """
+        self.summary_generator = summary_generator
+        self.output_dir = output_dir
+        self.concurrency = max(1, concurrency)
+        self.docx_workers = docx_workers
+        self.redactor = redactor
+        self.summary_store = summary_store
+        self.job_seconds = job_seconds
+        self.progress_path = os.path.join(output_dir, PROGRESS_FILE)
+        self._progress_lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def load_progress(self) -> Dict[str, Dict[str, Any]]:
+        """Latest recorded result per job key"""
+        progress = {}
+        if not os.path.exists(self.progress_path):
+            return progress
+        with open(self.progress_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted run
+                    continue
+                progress[record["key"]] = record
+        return progress
+
+    def _record(self, result: Dict[str, Any]) -> None:
+        with self._progress_lock:
+            with open(self.progress_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def _output_base(self, job: Dict[str, Any], index: int) -> str:
+        # The index keeps files with the same name from different directories apart
+        name = os.path.splitext(os.path.basename(job["path"]))[0]
+        return os.path.join(self.output_dir, f"{index:04d}-{name}")
+
+    def _summarize(self, job: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate (or reload) the summary for one job, save it as JSON and store it"""
+        summary_path = result["summary_json"]
+        if os.path.exists(summary_path):
+            print(f"Reusing saved summary for {job['path']}")
+            with open(summary_path, encoding="utf-8") as f:
+                summary = json.load(f)
+        else:
+            summary = self._generate(job, result)
+
+        # Stored only once the JSON exists, and recorded at once, so a rerun never stores it twice
+        if self.summary_store and not result["meeting_id"]:
+            result["meeting_id"] = self.summary_store.add_meeting(
+                summary, job["title"], job["date"], job["duration"], series=job["series"] or None
+            )
+            self._record(dict({key: value for key, value in result.items() if key != "started_at"},
+                              status="summarized"))
+        return summary
+
+    def _generate(self, job: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the summary for one job and save it as JSON"""
+        summary_path = result["summary_json"]
+        transcript_text = load_transcript(job["path"])
+        result["characters"] = len(transcript_text)
+        if len(transcript_text) < 100:
+            raise Exception("Transcript is too short")
+
+        redaction = self.redactor.redact(transcript_text) if self.redactor else None
+        pipeline_state = {}
+        summary = self.summary_generator.generate(
+            transcript=transcript_text,
+            title=job["title"],
+            date=job["date"],
+            duration=job["duration"],
+            persona_prompt=job["persona_prompt"],
+            context_prompt=job["context_prompt"],
+            deadline=Deadline(self.job_seconds),
+            pipeline_state=pipeline_state,
+            transcript_index=TranscriptIndex(transcript_text),
+            redaction=redaction
+        )
+        if not summary.get("markdown"):
+            raise Exception("The summary generation process did not extract meaningful content")
+
+        # Write then rename so an interrupted run never leaves a truncated summary to reuse
+        with open(summary_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False)
+        os.replace(summary_path + ".tmp", summary_path)
+        return summary
+
+    def run(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Summarize and export every job not already finished in an earlier run
+
+        Args:
+            jobs: Jobs from collect_jobs()
+
+        Returns:
+            One result dictionary per job, in job order (also written to report.csv)
+        """
+        progress = self.load_progress()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        pending = []
+        for index, job in enumerate(jobs):
+            key = job_key(job)
+            previous = progress.get(key)
+            if previous and previous.get("status") == "ok":
+                results[index] = dict(previous, status="skipped")
+            else:
+                pending.append((index, job, key, previous or {}))
+
+        print(f"Batch: {len(jobs)} transcripts, {len(jobs) - len(pending)} already done, "
+              f"{len(pending)} to process")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as summary_pool, \
+                ProcessPoolExecutor(max_workers=self.docx_workers) as docx_pool:
+            summary_futures = {}
+            for index, job, key, previous in pending:
+                base = self._output_base(job, index)
+                result = {
+                    "key": key,
+                    "file": job["path"],
+                    "title": job["title"],
+                    "status": "error",
+                    "characters": previous.get("characters", 0),
+                    "seconds": 0.0,
+                    "partial": False,
+                    "summary_json": base + ".summary.json",
+                    "docx": base + ".docx",
+                    # A summary stored by an earlier run is reused, not stored again
+                    "meeting_id": previous.get("meeting_id", ""),
+                    "error": "",
+                    "started_at": time.monotonic(),
+                }
+                results[index] = result
+                if not previous and os.path.exists(result["summary_json"]):
+                    # Left over from a different file or an older version of this one
+                    os.remove(result["summary_json"])
+                summary_futures[summary_pool.submit(self._summarize, job, result)] = (index, job)
+
+            docx_futures = {}
+            for future in as_completed(summary_futures):
+                index, job = summary_futures[future]
+                result = results[index]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    print(f"Error summarizing {job['path']}: {str(e)}")
+                    self._finish(result, error=str(e))
+                    continue
+                result["partial"] = bool(summary.get("partial"))
+                docx_future = docx_pool.submit(
+                    export_docx_file, summary, result["docx"], job["title"], job["date"], job["duration"]
+                )
+                docx_futures[docx_future] = index
+
+            for future in as_completed(docx_futures):
+                result = results[docx_futures[future]]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error exporting {result['file']}: {str(e)}")
+                    self._finish(result, error=f"Word export failed: {str(e)}")
+                    continue
+                self._finish(result)
+
+        self.write_report(results)
+        return results
+
+    def _finish(self, result: Dict[str, Any], error: str = "") -> None:
+        result["status"] = "error" if error else "ok"
+        result["error"] = error
+        result["seconds"] = round(time.monotonic() - result.pop("started_at"), 1)
+        self._record(result)
+        print(f"Batch: {result['status']} {result['file']} ({result['seconds']}s)")
+
+    def write_report(self, results: List[Dict[str, Any]]) -> str:
+        """Write the per-file results to report.csv in the output directory"""
+        return write_report(self.output_dir, results)
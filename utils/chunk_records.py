@@ -0,0 +1,185 @@
+import json
+import re
+from typing import Dict, Any, List
+
+# Fields of a map-phase chunk record and the keys of the items in each list field
+CHUNK_RECORD_FIELDS = {
+    "participants": ["name", "organization", "role", "external"],
+    "topics": ["topic", "notes"],
+    "decisions": ["decision", "details", "owner"],
+    "actions": ["action", "responsible", "timeline"],
+    "questions": ["question", "context", "owner"],
+    "quotes": ["quote", "speaker", "external"],
+    "terms": ["term", "definition"],
+}
+
+# Item key used to detect duplicates when merging records
+DEDUPE_KEYS = {
+    "participants": "name",
+    "decisions": "decision",
+    "actions": "action",
+    "questions": "question",
+    "quotes": "quote",
+    "terms": "term",
+}
+
+CHUNK_RECORD_SCHEMA_PROMPT = """
+{
+  "summary": "1-2 sentence overview of this section",
+  "participants": [{"name": "", "organization": "", "role": "", "external": false}],
+  "topics": [{"topic": "", "notes": "key facts, positions and who raised them, <=40 words"}],
+  "decisions": [{"decision": "", "details": "", "owner": ""}],
+  "actions": [{"action": "", "responsible": "", "timeline": ""}],
+  "questions": [{"question": "", "context": "", "owner": ""}],
+  "quotes": [{"quote": "exact words", "speaker": "", "external": false}],
+  "terms": [{"term": "", "definition": ""}]
+}
+"""
+
+
+def _normalize_key(text: str) -> str:
+    """Lower-case and strip punctuation so near-identical entries compare equal"""
+    return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
+
+
+def _clean_value(value: Any) -> Any:
+    """Coerce a record value to a trimmed string, keeping booleans as-is"""
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def parse_chunk_record(text: str) -> Dict[str, Any]:
+    """
+    Parse and validate a map-phase JSON record
+
+    Args:
+        text: Model output, expected to be a JSON object following the chunk schema
+
+    Returns:
+        Normalized record with every field present
+
+    Raises:
+        ValueError: If the text is not a JSON object
+    """
+    text = text.strip()
+    # Tolerate a fenced code block around the JSON
+    fence = re.match(r'^```(?:json)?\s*(.*?)\s*```$', text, re.DOTALL)
+    if fence:
+        text = fence.group(1)
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Chunk record is not valid JSON: {str(e)}")
+
+    if not isinstance(data, dict):
+        raise ValueError("Chunk record must be a JSON object")
+
+    record = {"summary": _clean_value(data.get("summary", ""))}
+    for field, item_keys in CHUNK_RECORD_FIELDS.items():
+        items = data.get(field) or []
+        if not isinstance(items, list):
+            items = []
+
+        record[field] = []
+        for item in items:
+            # Drop malformed entries instead of failing the whole chunk
+            if not isinstance(item, dict):
+                continue
+            cleaned = {key: _clean_value(item.get(key, False if key == "external" else "")) for key in item_keys}
+            if cleaned[item_keys[0]]:
+                record[field].append(cleaned)
+
+    return record
+
+
+def unstructured_record(text: str) -> Dict[str, Any]:
+    """
+    Wrap free-text chunk output that could not be parsed as a record
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        Record with empty fields and the text kept as notes
+    """
+    record = {"summary": "", "notes": text.strip()}
+    for field in CHUNK_RECORD_FIELDS:
+        record[field] = []
+    return record
+
+
+def merge_chunk_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge chunk records in transcript order and remove duplicate entries
+
+    Args:
+        records: Records returned by parse_chunk_record or unstructured_record
+
+    Returns:
+        Merged record with per-part summaries, deduplicated lists and any unstructured notes
+    """
+    merged = {"part_summaries": [], "unstructured_notes": []}
+    for field in CHUNK_RECORD_FIELDS:
+        merged[field] = []
+
+    seen = {field: {} for field in DEDUPE_KEYS}
+
+    for part, record in enumerate(records, start=1):
+        if record.get("summary"):
+            merged["part_summaries"].append(f"Part {part}: {record['summary']}")
+        if record.get("notes"):
+            merged["unstructured_notes"].append(f"Part {part}: {record['notes']}")
+
+        for field in CHUNK_RECORD_FIELDS:
+            for item in record.get(field, []):
+                if field == "topics":
+                    merged["topics"].append({"part": part, **item})
+                    continue
+
+                key = _normalize_key(item.get(DEDUPE_KEYS[field], ""))
+                if not key:
+                    continue
+
+                existing = seen[field].get(key)
+                if existing is None:
+                    entry = dict(item)
+                    seen[field][key] = entry
+                    merged[field].append(entry)
+                else:
+                    # Fill in details that an earlier chunk did not have
+                    for item_key, value in item.items():
+                        if value and not existing.get(item_key):
+                            existing[item_key] = value
+
+    return merged
+
+
+def render_merged_record(merged: Dict[str, Any]) -> str:
+    """
+    Render a merged record compactly for the consolidation prompt
+
+    Args:
+        merged: Output of merge_chunk_records
+
+    Returns:
+        Compact JSON text with empty fields omitted
+    """
+    compact = {}
+    for key, value in merged.items():
+        if not value:
+            continue
+        if isinstance(value, list):
+            # Drop empty item fields (and false flags) to save tokens
+            value = [{item_key: item_value for item_key, item_value in item.items() if item_value}
+                     if isinstance(item, dict) else item for item in value]
+        compact[key] = value
+    return json.dumps(compact, ensure_ascii=False, separators=(',', ':'))
+
+
+def is_chunk_record(value: Any) -> bool:
+    """True if value looks like a chunk record rather than legacy free-text analysis"""
+    return isinstance(value, dict) and "summary" in value
@@ -0,0 +1,235 @@
+import os
+import sqlite3
+import time
+from typing import Dict, Any, Optional
+
+from utils.deadline import Deadline
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Longest single sleep while a queued caller waits for the circuit to close
+MAX_WAIT_POLL_SECONDS = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS circuits (
+    name TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    opened_at REAL,
+    probe_at REAL
+);
+CREATE TABLE IF NOT EXISTS calls (
+    name TEXT NOT NULL,
+    at REAL NOT NULL,
+    failed INTEGER NOT NULL,
+    slow INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calls_by_time ON calls (name, at);
+"""
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the circuit breaker is open"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around the upstream LLM, shared by every process on the host
+
+    Closed: calls go through and their outcomes are recorded over a sliding window. When
+    enough of the recent calls failed or were slow, the circuit opens and calls fail at
+    once with CircuitOpenError. After a cooldown it goes half-open and lets a single
+    probe call through: success closes it, failure opens it again. The state and the
+    window live in SQLite so all gunicorn workers trip and recover together.
+    """
+
+    def __init__(self, path: str, name: str = "openai",
+                 window_seconds: float = 60.0, min_calls: int = 10,
+                 failure_rate: float = 0.5, slow_call_seconds: float = 120.0,
+                 slow_call_rate: float = 0.8, open_seconds: float = 30.0):
+        """
+        Initialize the breaker
+
+        Args:
+            path: SQLite file holding the shared state
+            name: Name of the protected dependency
+            window_seconds: Length of the sliding window of recorded calls
+            min_calls: Calls in the window before the rates are judged
+            failure_rate: Share of failed calls that opens the circuit
+            slow_call_seconds: Calls slower than this (or timed out) count as slow
+            slow_call_rate: Share of slow calls that opens the circuit
+            open_seconds: How long the circuit stays open before a probe is allowed
+        """
+        self.path = path
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = max(1, min_calls)
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        # A probe that never reports back (e.g. its request gave up first) stops blocking after this
+        self.probe_timeout = max(open_seconds, slow_call_seconds)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode so BEGIN IMMEDIATE is under our control
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _read(self, connection: sqlite3.Connection) -> Dict[str, Any]:
+        row = connection.execute(
+            "SELECT state, opened_at, probe_at FROM circuits WHERE name = ?", (self.name,)
+        ).fetchone()
+        if row is None:
+            return {"state": STATE_CLOSED, "opened_at": None, "probe_at": None}
+        return {"state": row[0], "opened_at": row[1], "probe_at": row[2]}
+
+    def _write(self, connection: sqlite3.Connection, state: str,
+               opened_at: Optional[float] = None, probe_at: Optional[float] = None) -> None:
+        connection.execute(
+            "INSERT OR REPLACE INTO circuits (name, state, opened_at, probe_at) VALUES (?, ?, ?, ?)",
+            (self.name, state, opened_at, probe_at)
+        )
+
+    def _try_enter(self) -> float:
+        """Let a call through if the circuit allows it; otherwise return the seconds until it might"""
+        connection = self._connect()
+        try:
+            # The closed state is the common case and needs no write lock
+            if self._read(connection)["state"] == STATE_CLOSED:
+                return 0.0
+
+            now = time.time()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                circuit = self._read(connection)
+                wait = 0.0
+                if circuit["state"] == STATE_OPEN:
+                    wait = circuit["opened_at"] + self.open_seconds - now
+                    if wait <= 0:
+                        # Cooldown over: this call is the probe
+                        self._write(connection, STATE_HALF_OPEN, circuit["opened_at"], now)
+                        print(f"Circuit breaker for {self.name} is half-open; sending a probe call")
+                elif circuit["state"] == STATE_HALF_OPEN:
+                    if circuit["probe_at"] is not None and now - circuit["probe_at"] < self.probe_timeout:
+                        wait = min(self.open_seconds, circuit["probe_at"] + self.probe_timeout - now)
+                    else:
+                        self._write(connection, STATE_HALF_OPEN, circuit["opened_at"], now)
+                connection.execute("COMMIT")
+                return max(0.0, wait)
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+
+    def allow(self, wait: bool = False, deadline: Optional[Deadline] = None) -> None:
+        """
+        Check the circuit before an upstream call
+
+        Args:
+            wait: Queue until the circuit lets the call through instead of failing at once
+                (for bulk work that is not waiting on a user)
+            deadline: Optional request deadline bounding the wait
+
+        Raises:
+            CircuitOpenError: If the circuit is open (and not waiting, or the deadline comes first)
+        """
+        while True:
+            retry_after = self._try_enter()
+            if retry_after <= 0:
+                return
+            if not wait or (deadline is not None and deadline.remaining() < retry_after):
+                raise CircuitOpenError(
+                    f"The AI service is unavailable right now (circuit open); retry in {retry_after:.0f}s",
+                    retry_after
+                )
+            time.sleep(min(retry_after, MAX_WAIT_POLL_SECONDS))
+
+    def record(self, seconds: float, failed: bool = False, timed_out: bool = False) -> None:
+        """
+        Record the outcome of an upstream call
+
+        Args:
+            seconds: Duration of the call
+            failed: Whether the call failed for an upstream reason (not a bad request)
+            timed_out: Whether the call hit its timeout; counted as slow
+        """
+        slow = timed_out or seconds >= self.slow_call_seconds
+        now = time.time()
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                circuit = self._read(connection)
+                if circuit["state"] == STATE_HALF_OPEN:
+                    # The probe decides: a healthy answer closes the circuit with a fresh window
+                    if failed or slow:
+                        self._write(connection, STATE_OPEN, now)
+                        print(f"Circuit breaker for {self.name} probe failed; open again")
+                    else:
+                        self._write(connection, STATE_CLOSED)
+                        connection.execute("DELETE FROM calls WHERE name = ?", (self.name,))
+                        print(f"Circuit breaker for {self.name} closed")
+                elif circuit["state"] == STATE_CLOSED:
+                    connection.execute(
+                        "INSERT INTO calls (name, at, failed, slow) VALUES (?, ?, ?, ?)",
+                        (self.name, now, int(failed), int(slow))
+                    )
+                    connection.execute("DELETE FROM calls WHERE name = ? AND at < ?",
+                                       (self.name, now - self.window_seconds))
+                    total, failures, slow_calls = connection.execute(
+                        "SELECT COUNT(*), SUM(failed), SUM(slow) FROM calls WHERE name = ?", (self.name,)
+                    ).fetchone()
+                    if total >= self.min_calls and (failures / total >= self.failure_rate
+                                                    or slow_calls / total >= self.slow_call_rate):
+                        self._write(connection, STATE_OPEN, now)
+                        print(f"Circuit breaker for {self.name} opened: {failures} failed and "
+                              f"{slow_calls} slow of the last {total} calls")
+                # Calls finishing while the circuit is open were already counted against it
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Current state and the calls in the window
+
+        Returns:
+            Dictionary with state, seconds until a probe is allowed (when open), and the
+            number of calls, failures and slow calls in the window
+        """
+        connection = self._connect()
+        try:
+            circuit = self._read(connection)
+            total, failures, slow_calls = connection.execute(
+                "SELECT COUNT(*), SUM(failed), SUM(slow) FROM calls WHERE name = ? AND at >= ?",
+                (self.name, time.time() - self.window_seconds)
+            ).fetchone()
+        finally:
+            connection.close()
+        retry_after = 0.0
+        if circuit["state"] == STATE_OPEN:
+            retry_after = max(0.0, circuit["opened_at"] + self.open_seconds - time.time())
+        return {
+            "state": circuit["state"],
+            "retry_after": round(retry_after, 1),
+            "calls": total,
+            "failures": failures or 0,
+            "slow_calls": slow_calls or 0,
+        }
@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import List, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's time budget runs out before an LLM call completes"""
+
+
+class Deadline:
+    """Per-request time budget passed down through the summarization pipeline"""
+
+    def __init__(self, seconds: float):
+        """
+        Initialize the deadline
+
+        Args:
+            seconds: Total time budget for the request in seconds
+        """
+        self.budget = seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + seconds
+        self.degradations: List[str] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        """Seconds spent since the deadline was created"""
+        return time.monotonic() - self.started_at
+
+    def expired(self) -> bool:
+        """True once the time budget is used up"""
+        return self.remaining() <= 0
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """
+        Timeout to use for a single upstream call
+
+        Args:
+            cap: Optional upper bound for the call timeout
+
+        Returns:
+            Remaining seconds, limited to cap if given
+        """
+        remaining = self.remaining()
+        if cap is not None:
+            return min(remaining, cap)
+        return remaining
+
+    def record_degradation(self, note: str) -> None:
+        """
+        Record a controlled degradation so the summary can be flagged as partial
+
+        Args:
+            note: Human readable description of what was cut back
+        """
+        with self._lock:
+            if note in self.degradations:
+                return
+            self.degradations.append(note)
+        print(f"Deadline degradation ({self.remaining():.1f}s left): {note}")
+
+    @property
+    def degraded(self) -> bool:
+        """True if any stage had to degrade to stay within the budget"""
+        return bool(self.degradations)
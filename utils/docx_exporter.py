@@ -4,6 +4,7 @@ from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.enum.style import WD_STYLE_TYPE
+from utils.quote_verifier import quote_verification_label
 import re
 
 
@@ -33,11 +34,13 @@ class DocxExporter:
 
         # If we have the markdown, use that directly
         if 'markdown' in summary and summary['markdown']:
-            self._add_from_markdown(doc, summary['markdown'])
+            self._add_from_markdown(doc, summary['markdown'], summary.get("key_quotes"))
 
             # Check if key quotes were properly added from markdown
             # If not, add them from structured data as fallback
-            if summary.get("key_quotes") and self._should_add_quotes_fallback(summary['markdown']):
+            # (verified quotes are already written from structured data in place of the markdown)
+            if summary.get("key_quotes") and self._should_add_quotes_fallback(summary['markdown']) and \
+                    not (self._has_verified_quotes(summary["key_quotes"]) and "Key Quotes" in summary['markdown']):
                 print("Adding key quotes from structured data as fallback...")
                 doc.add_heading("Key Quotes", level=1)
                 self._add_key_quotes_structured(doc, summary.get("key_quotes", []))
@@ -73,6 +76,10 @@ class DocxExporter:
             # Add technical terminology
             self._add_terminology(doc, summary.get("terminology", []))
 
+        # Add locally computed meeting dynamics
+        if summary.get("speaker_analytics"):
+            self._add_speaker_analytics(doc, summary["speaker_analytics"])
+
         # Save document
         doc.save(output_path)
 
@@ -217,6 +224,7 @@ class DocxExporter:
                 p.add_run(f'"{quote["quote"]}"')
                 if "attribution" in quote and quote["attribution"]:
                     p.add_run(f" — {quote['attribution']}")
+                self._add_quote_verification(p, quote)
             elif isinstance(quote, str):
                 p = doc.add_paragraph(style='Quote')
                 # If it's already quoted, use as-is, otherwise add quotes
@@ -225,13 +233,37 @@ class DocxExporter:
                 else:
                     p.add_run(f'"{quote}"')
 
-    def _add_from_markdown(self, doc: Document, markdown_text: str) -> None:
+    def _has_verified_quotes(self, quotes: Optional[List[Any]]) -> bool:
+        """True if the structured quotes carry results from verify_quotes"""
+        return bool(quotes) and any(isinstance(quote, dict) and "verified" in quote for quote in quotes)
+
+    def _add_quote_verification(self, paragraph, quote: Dict[str, Any]) -> None:
+        """
+        Flag a quote that was not matched word for word in the transcript
+
+        Args:
+            paragraph: The quote paragraph
+            quote: Quote dictionary annotated by verify_quotes
+        """
+        label = quote_verification_label(quote)
+        if not label or quote.get("exact"):
+            return
+
+        run = paragraph.add_run(f" [{label}]")
+        run.italic = True
+        run.font.size = Pt(9)
+        # Red for quotes that were not found, grey for paraphrase-level matches
+        run.font.color.rgb = RGBColor(0x6C, 0x75, 0x7D) if quote.get("verified") else RGBColor(0xC0, 0x00, 0x00)
+
+    def _add_from_markdown(self, doc: Document, markdown_text: str,
+                           key_quotes: Optional[List[Any]] = None) -> None:
         """
         Parse markdown and add it to the document with appropriate formatting
 
         Args:
             doc: The Document object
             markdown_text: The markdown text to add
+            key_quotes: Structured key quotes; used instead of the markdown when they carry verification results
         """
         import re
 
@@ -268,8 +300,12 @@ class DocxExporter:
                     doc.add_paragraph(clean_content.strip())
 
             elif "Key Quotes" in section_title:
-                # Handle multiple quote formats more robustly
-                self._add_key_quotes_from_markdown(doc, section_content)
+                if self._has_verified_quotes(key_quotes):
+                    # Same quotes, but flagged where they could not be found in the transcript
+                    self._add_key_quotes_structured(doc, key_quotes)
+                else:
+                    # Handle multiple quote formats more robustly
+                    self._add_key_quotes_from_markdown(doc, section_content)
 
             elif "Content Gaps" in section_title:
                 # Extract numbered list items
@@ -686,6 +722,7 @@ class DocxExporter:
                 p.add_run(f'"{quote["quote"]}"')
                 if "attribution" in quote and quote["attribution"]:
                     p.add_run(f" — {quote['attribution']}")
+                self._add_quote_verification(p, quote)
             elif isinstance(quote, str):
                 p = doc.add_paragraph(style='Quote')
                 # If it's already quoted, use as-is, otherwise add quotes
@@ -764,3 +801,40 @@ class DocxExporter:
                 row_cells[1].text = ""
 
         # Removed extra spacing at the end
+
+    def _add_speaker_analytics(self, doc: Document, analytics: Dict[str, Any]) -> None:
+        """Add meeting dynamics section computed from the speaker labels"""
+        doc.add_heading("Meeting Dynamics", level=1)
+
+        basis = "timestamps" if analytics.get("basis") == "timestamps" else "word counts"
+        doc.add_paragraph(
+            f"{analytics.get('total_turns', 0)} speaker turns and {analytics.get('total_words', 0)} words. "
+            f"Share of talk time is based on {basis}."
+        )
+
+        # Create table
+        table = doc.add_table(rows=1, cols=5)
+        table.style = 'Table Grid'
+
+        # Set header row
+        header_cells = table.rows[0].cells
+        header_cells[0].text = "Speaker"
+        header_cells[1].text = "Turns"
+        header_cells[2].text = "Words"
+        header_cells[3].text = "Share of Talk"
+        header_cells[4].text = "Interruptions (made / received)"
+
+        # Make header row bold
+        for cell in header_cells:
+            for paragraph in cell.paragraphs:
+                for run in paragraph.runs:
+                    run.bold = True
+
+        # Add speaker rows
+        for speaker in analytics.get("speakers", []):
+            row_cells = table.add_row().cells
+            row_cells[0].text = speaker.get("name", "")
+            row_cells[1].text = str(speaker.get("turns", 0))
+            row_cells[2].text = str(speaker.get("words", 0))
+            row_cells[3].text = f"{speaker.get('talk_share', 0)}%"
+            row_cells[4].text = f"{speaker.get('interruptions_made', 0)} / {speaker.get('times_interrupted', 0)}"
@@ -0,0 +1,203 @@
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from utils.transcript_index import TranscriptIndex, format_timestamp
+
+# Rough size of a token in English text, used to turn token budgets into characters
+CHARS_PER_TOKEN = 4
+
+# The decision and action cues the summary prompts look for; sentences containing them are always kept
+CUE_PATTERN = re.compile(
+    r"\b(?:agreed?|agreement|decided|decision|confirm(?:ed|s)?|approved?|"
+    r"we will|we'll|i will|i'll|please|action items?|follow(?:ing)?[ -]up|deadline|next steps?)\b",
+    re.IGNORECASE
+)
+
+SENTENCE_PATTERN = re.compile(r'[^.!?\n]+(?:[.!?]+|\n|$)')
+TERM_PATTERN = re.compile(r"[a-z][a-z0-9']+")
+
+# Sentences shorter than this ("Yeah.", "Okay, sure.") are never selected unless they carry a cue
+MIN_SENTENCE_WORDS = 4
+
+STOPWORDS = {
+    "the", "and", "for", "that", "this", "with", "was", "were", "are", "has", "have", "had", "been", "from",
+    "they", "them", "there", "then", "than", "which", "who", "what", "when", "where", "how", "also", "about",
+    "into", "not", "but", "all", "any", "can", "could", "would", "should", "just", "you", "your", "our",
+    "yeah", "okay", "like", "know", "think", "really", "going", "right", "well", "sure", "it's", "that's",
+}
+
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+
+def split_sentences(transcript_index: TranscriptIndex) -> List[Tuple[int, str]]:
+    """
+    Split every turn into sentences
+
+    Args:
+        transcript_index: Speaker-turn index of the transcript
+
+    Returns:
+        List of (turn number, sentence) pairs in transcript order
+    """
+    sentences = []
+    for turn in range(len(transcript_index)):
+        text = re.sub(r'[ \t]+', ' ', transcript_index.turn_text(turn))
+        for match in SENTENCE_PATTERN.finditer(text):
+            sentence = match.group().strip()
+            if sentence:
+                sentences.append((turn, sentence))
+    return sentences
+
+
+def _tfidf_matrix(sentences: List[str]) -> sparse.csr_matrix:
+    """Sparse sentence-by-term TF-IDF matrix with L2-normalized rows"""
+    vocabulary: Dict[str, int] = {}
+    rows, cols, counts = [], [], []
+    for row, sentence in enumerate(sentences):
+        terms = [term for term in TERM_PATTERN.findall(sentence.lower()) if term not in STOPWORDS]
+        for term in terms:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(1.0)
+
+    # Duplicate (row, col) entries are summed into term counts
+    matrix = sparse.csr_matrix((counts, (rows, cols)), shape=(len(sentences), max(1, len(vocabulary))))
+    matrix.sum_duplicates()
+    matrix.data = np.log1p(matrix.data)
+
+    document_frequency = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = np.log(len(sentences) / np.maximum(document_frequency, 1)) + 1.0
+    matrix = matrix @ sparse.diags(idf)
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    return sparse.diags(1.0 / np.maximum(norms, 1e-12)) @ matrix
+
+
+def textrank_scores(sentences: List[str]) -> np.ndarray:
+    """
+    Score sentences with TextRank over cosine similarity
+
+    The similarity matrix X·Xᵀ is never formed: each power iteration multiplies by X
+    and Xᵀ in turn, so memory and time stay linear in the number of terms.
+
+    Args:
+        sentences: Sentence texts
+
+    Returns:
+        Array of scores, one per sentence
+    """
+    count = len(sentences)
+    if count == 0:
+        return np.zeros(0)
+
+    matrix = _tfidf_matrix(sentences)
+    transposed = matrix.T.tocsr()
+    # Rows are unit length, except sentences with no terms, which are all zero
+    self_similarity = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+
+    def similarity(vector: np.ndarray) -> np.ndarray:
+        # (X·Xᵀ - diag)·v: similarity to every other sentence, excluding itself
+        return matrix @ (transposed @ vector) - self_similarity * vector
+
+    degree = similarity(np.ones(count))
+    has_links = degree > 1e-12
+    inverse_degree = np.where(has_links, 1.0 / np.where(has_links, degree, 1.0), 0.0)
+
+    scores = np.full(count, 1.0 / count)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * similarity(scores * inverse_degree)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def extractive_reduce(transcript_index: TranscriptIndex, target_tokens: int) -> Optional[Dict[str, Any]]:
+    """
+    Cut a transcript down to a token budget by keeping its most central sentences
+
+    Every sentence with a decision or action cue is kept; the rest of the budget is
+    filled by TextRank score. Kept sentences are rendered in transcript order under
+    their speaker labels, with "[...]" where turns were dropped.
+
+    Args:
+        transcript_index: Speaker-turn index of the original transcript
+        target_tokens: Approximate size of the reduced transcript in tokens
+
+    Returns:
+        Dictionary with the reduced "transcript" and sentence/character counts, or None
+        if the transcript already fits the budget
+    """
+    budget_chars = target_tokens * CHARS_PER_TOKEN
+    if len(transcript_index.text) <= budget_chars:
+        return None
+
+    sentences = split_sentences(transcript_index)
+    texts = [sentence for _, sentence in sentences]
+    lengths = np.array([len(text) + 1 for text in texts])
+
+    is_cue = np.array([bool(CUE_PATTERN.search(text)) for text in texts], dtype=bool)
+    is_short = np.array([len(text.split()) < MIN_SENTENCE_WORDS for text in texts], dtype=bool)
+
+    scores = textrank_scores(texts)
+
+    keep = is_cue.copy()
+    used = lengths[keep].sum()
+    # Fill what is left of the budget with the highest-ranked remaining sentences
+    for position in np.argsort(-scores, kind='stable'):
+        if keep[position] or is_short[position]:
+            continue
+        if used + lengths[position] > budget_chars:
+            continue
+        keep[position] = True
+        used += lengths[position]
+
+    reduced = _render(transcript_index, sentences, keep)
+    print(f"Extractive pre-summary kept {int(keep.sum())} of {len(texts)} sentences "
+          f"({int(is_cue.sum())} with decision/action cues): "
+          f"{len(transcript_index.text)} -> {len(reduced)} characters")
+
+    return {
+        "transcript": reduced,
+        "sentences_total": len(texts),
+        "sentences_kept": int(keep.sum()),
+        "cue_sentences": int(is_cue.sum()),
+        "original_chars": len(transcript_index.text),
+    }
+
+
+def _render(transcript_index: TranscriptIndex, sentences: List[Tuple[int, str]], keep: np.ndarray) -> str:
+    """Render kept sentences grouped by turn, marking dropped stretches"""
+    lines = []
+    current_turn = None
+    previous_kept_turn = -1
+    parts: List[str] = []
+
+    def flush():
+        if current_turn is None or not parts:
+            return
+        speaker = transcript_index.speaker_name(current_turn)
+        timestamp = format_timestamp(transcript_index.turn_time[current_turn])
+        prefix = f"[{timestamp}] " if timestamp else ""
+        content = " ".join(parts)
+        lines.append(f"{prefix}{speaker}: {content}" if speaker else f"{prefix}{content}")
+
+    for (turn, sentence), kept in zip(sentences, keep):
+        if not kept:
+            continue
+        if turn != current_turn:
+            flush()
+            if turn > previous_kept_turn + 1:
+                lines.append("[...]")
+            current_turn, parts = turn, []
+        parts.append(sentence)
+        previous_kept_turn = turn
+    flush()
+
+    return "\n".join(lines)
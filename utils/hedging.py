@@ -0,0 +1,130 @@
+import contextvars
+import math
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Recent call latencies kept per size bucket
+LATENCY_SAMPLES = 200
+# Calls observed in a bucket before its p90 is trusted for hedging
+MIN_HEDGE_SAMPLES = 20
+# Never hedge sooner than this, however fast the bucket usually is
+MIN_HEDGE_DELAY_SECONDS = 2.0
+
+
+def size_bucket(tokens: int) -> int:
+    """Round a call's input size up to a power of two (in thousands of tokens) for grouping latencies"""
+    return 2 ** max(0, math.ceil(math.log2(max(1.0, tokens / 1000))))
+
+
+class LatencyStats:
+    """Recent call latencies per (model, size bucket), shared by every request in the process"""
+
+    def __init__(self, samples: int = LATENCY_SAMPLES):
+        self._samples = samples
+        self._latencies: Dict[Tuple[str, int], deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, tokens: int, seconds: float) -> None:
+        """Record the latency of a successful call with the given input size"""
+        key = (model, size_bucket(tokens))
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=self._samples)).append(seconds)
+
+    def percentile(self, model: str, tokens: int, fraction: float,
+                   min_samples: int = MIN_HEDGE_SAMPLES) -> Optional[float]:
+        """
+        Latency percentile of calls of this size
+
+        Args:
+            model: Model the calls go to
+            tokens: Input size of the call
+            fraction: Percentile as a fraction, e.g. 0.9
+            min_samples: Fewest observations for an answer
+
+        Returns:
+            Latency in seconds, or None if there are too few observations
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get((model, size_bucket(tokens)), ()))
+        if len(latencies) < max(1, min_samples):
+            return None
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+
+class HedgeBudget:
+    """Cap on the duplicate calls one map phase may send"""
+
+    def __init__(self, calls: int, fraction: float):
+        """
+        Args:
+            calls: Calls in the map phase
+            fraction: Extra calls allowed as a share of them (at least one when positive)
+        """
+        self.allowed = max(1, int(calls * fraction)) if fraction > 0 else 0
+        self.used = 0
+        self.wins = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Reserve one duplicate call; False once the budget is spent"""
+        with self._lock:
+            if self.used >= self.allowed:
+                return False
+            self.used += 1
+            return True
+
+    def record_win(self) -> None:
+        with self._lock:
+            self.wins += 1
+
+
+def hedged_call(call: Callable[[], T], delay: Optional[float], budget: HedgeBudget) -> T:
+    """
+    Run a call, and send a duplicate if it has not finished after the delay
+
+    The first successful response wins. A duplicate that has not started is cancelled;
+    one already in flight cannot be aborted by the synchronous client, so its result is
+    dropped when it arrives.
+
+    Args:
+        call: The call; it runs in a copy of the caller's context
+        delay: Seconds to wait before hedging, or None to never hedge
+        budget: Budget the duplicate is taken from
+
+    Returns:
+        The first successful result
+
+    Raises:
+        Exception: The first error, if every attempt failed
+    """
+    if delay is None or not budget.allowed:
+        return call()
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        primary = executor.submit(contextvars.copy_context().run, call)
+        done, _ = wait([primary], timeout=delay)
+        if done or not budget.take():
+            return primary.result()
+
+        backup = executor.submit(contextvars.copy_context().run, call)
+        pending = {primary, backup}
+        errors = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        budget.record_win()
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+                errors.append(future.exception())
+        raise errors[0]
+    finally:
+        # Do not wait for the losing attempt
+        executor.shutdown(wait=False)
@@ -0,0 +1,362 @@
+import bisect
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from utils.autotuner import MIN_CHUNK_SIZE
+from utils.chunk_records import unstructured_record
+from utils.circuit_breaker import CircuitOpenError
+from utils.deadline import Deadline
+from utils.openai_helper import OpenAIHelper
+from utils.pipeline_state import PipelineStateStore
+from utils.redaction import Redactor
+from utils.transcript_index import TranscriptIndex
+
+# Default refresh schedule: re-consolidate after this many new chunks or this many seconds
+DEFAULT_REFRESH_CHUNKS = 4
+DEFAULT_REFRESH_SECONDS = 300
+
+# Streams kept next to the session state: the original text and the text sent to the model
+SOURCE_STREAM = "source"
+MODEL_STREAM = "model"
+
+# With redaction on, the unfinished last line of the text received so far is held back from the
+# model stream, so a value split across two deltas is still redacted as a whole. A line that grows
+# past MAX_HELD_CHARS is released up to a space, keeping the last HELD_TAIL_CHARS back. Scheduled
+# refreshes leave held text out; flush() releases it when the client asks for a summary.
+MAX_HELD_CHARS = 2000
+HELD_TAIL_CHARS = 200
+
+
+class LiveMeetingSession:
+    """
+    Summarize a meeting while it is still running
+
+    Transcript text arrives as deltas. Each delta is appended to the stored transcript and
+    only newly completed chunks are sent to the map phase; their records accumulate in the
+    session state. Consolidating those records into a summary (the reduce phase) is done
+    on a schedule or on demand, so the model cost of an update follows the size of the delta.
+
+    Hold the store's lock(session_id) around load() and the update, so concurrent appends to
+    the same meeting (from any worker) do not release or analyze the same text twice.
+    """
+
+    def __init__(self, openai_helper: OpenAIHelper, store: PipelineStateStore,
+                 session_id: str, state: Dict[str, Any],
+                 redactor: Optional[Redactor] = None):
+        """
+        Wrap a stored live session; use start() or load() to get one
+
+        Args:
+            openai_helper: Instance of OpenAIHelper for API interactions
+            store: Store holding the session state and transcript streams
+            session_id: Id of the session in the store
+            state: Session state as saved in the store
+            redactor: Optional PII redactor applied to the text before it reaches the model
+        """
+        self.openai_helper = openai_helper
+        self.store = store
+        self.session_id = session_id
+        self.state = state
+        self.redactor = redactor
+
+    @classmethod
+    def start(cls, openai_helper: OpenAIHelper, store: PipelineStateStore,
+              title: str = "", date: str = "", duration: str = "",
+              persona_prompt: str = "", context_prompt: str = "",
+              redactor: Optional[Redactor] = None) -> "LiveMeetingSession":
+        """
+        Create a new, empty live session
+
+        Args:
+            openai_helper: Instance of OpenAIHelper for API interactions
+            store: Store that keeps the session between requests
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration (may be left empty while the meeting runs)
+            persona_prompt: Custom persona instructions for the AI
+            context_prompt: Additional context about the meeting
+            redactor: Optional PII redactor
+
+        Returns:
+            The new session
+        """
+        now = time.time()
+        state = {
+            "live": True,
+            "title": title,
+            "date": date,
+            "duration": duration,
+            "persona_prompt": persona_prompt,
+            "context_prompt": context_prompt,
+            "chunk_analyses": [],
+            "redactions": {},
+            # Byte offsets into the streams: how much has been received, passed on to the
+            # model stream (the rest is held back for redaction) and analyzed
+            "source_bytes": 0,
+            "released_bytes": 0,
+            "model_bytes": 0,
+            "analyzed_bytes": 0,
+            "created_at": now,
+            "refreshed_at": now,
+            "refreshed_chunks": 0,
+            "refreshed_bytes": 0,
+        }
+        session_id = store.save(state)
+        return cls(openai_helper, store, session_id, state, redactor)
+
+    @classmethod
+    def load(cls, openai_helper: OpenAIHelper, store: PipelineStateStore, session_id: str,
+             redactor: Optional[Redactor] = None) -> Optional["LiveMeetingSession"]:
+        """
+        Load a live session from the store
+
+        Args:
+            openai_helper: Instance of OpenAIHelper for API interactions
+            store: Store holding the session
+            session_id: Id returned when the session was started
+            redactor: Optional PII redactor
+
+        Returns:
+            The session, or None if it does not exist or is not a live session
+        """
+        state = store.load(session_id)
+        if not state or not state.get("live"):
+            return None
+        # Sessions started before text was held back passed on everything they received
+        state.setdefault("released_bytes", state["source_bytes"])
+        return cls(openai_helper, store, session_id, state, redactor)
+
+    def append(self, delta: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Add new transcript text and analyze any chunks it completes
+
+        Only the text after the last analyzed chunk is read back, so an update costs one
+        map call per completed chunk no matter how long the meeting has been running.
+        A chunk whose analysis fails is left pending and retried on the next append.
+
+        Args:
+            delta: Transcript text received since the last append
+            deadline: Optional request deadline
+
+        Returns:
+            Progress dictionary (see progress())
+        """
+        state = self.state
+        if delta:
+            state["source_bytes"] = self.store.append_text(self.session_id, SOURCE_STREAM, delta)
+            self._release_model_text()
+
+        pending = self.store.read_text(self.session_id, MODEL_STREAM, state["analyzed_bytes"])
+        cuts = self._complete_chunk_ends(pending, self._chunk_size(pending))
+        if cuts:
+            chunks = [pending[start:end].strip() for start, end in zip([0] + cuts, cuts)]
+            records = self._analyze_chunks(chunks, deadline)
+
+            # Commit records up to the first failure so nothing is skipped
+            committed = 0
+            for record in records:
+                if record is None:
+                    break
+                state["chunk_analyses"].append(record)
+                committed += 1
+            if committed:
+                state["analyzed_bytes"] += len(pending[:cuts[committed - 1]].encode('utf-8'))
+            if committed < len(chunks):
+                print(f"Live session {self.session_id}: {len(chunks) - committed} chunks left pending for retry")
+
+        self.save()
+        return self.progress()
+
+    def _held_text(self) -> str:
+        """Received text not yet passed on to the model stream"""
+        return self.store.read_text(self.session_id, SOURCE_STREAM, self.state["released_bytes"])
+
+    def _release_model_text(self, everything: bool = False) -> None:
+        """Redact the received text up to the end of its last complete line and add it to the model stream"""
+        state = self.state
+        held = self._held_text()
+        end = len(held)
+        if self.redactor and not everything:
+            end = held.rfind('\n') + 1
+            if len(held) - end > MAX_HELD_CHARS:
+                end = max(end, held.rfind(' ', 0, len(held) - HELD_TAIL_CHARS) + 1)
+        released = held[:end]
+        if not released:
+            return
+        model_text = released
+        if self.redactor:
+            redaction = self.redactor.redact(released, state["redactions"])
+            state["redactions"] = redaction.placeholders
+            model_text = redaction.text
+        state["model_bytes"] = self.store.append_text(self.session_id, MODEL_STREAM, model_text)
+        state["released_bytes"] += len(released.encode('utf-8'))
+
+    def flush(self) -> None:
+        """
+        Pass text held back for redaction on to the model stream
+
+        Call before a summary the client asked for, such as the last one of a meeting, so it
+        covers everything received. A value split between the held text and the next delta
+        is then not redacted as a whole.
+        """
+        self._release_model_text(everything=True)
+
+    def _chunk_size(self, pending: str) -> int:
+        """
+        Chunk size the autotuner picks (or the configured CHUNK_SIZE) for the meeting so far
+
+        Same choice as the large-transcript map phase, so live and batch records look alike.
+        The meeting's length is taken from the model stream's size in bytes, to avoid reading it.
+        """
+        tuner = self.openai_helper.autotuner
+        if tuner.chunk_size:
+            return tuner.chunk_size
+        if len(pending) <= MIN_CHUNK_SIZE:
+            # No tuned size can complete a chunk yet; skip planning
+            return MIN_CHUNK_SIZE
+        return self.openai_helper.plan_summary(self.state["model_bytes"])["chunk_size"]
+
+    def _complete_chunk_ends(self, pending: str, chunk_size: int) -> List[int]:
+        """
+        Find where complete chunks end in the text that has not been analyzed yet
+
+        Chunks are packed greedily on speaker-turn boundaries like TranscriptIndex.chunk(),
+        but text is only cut once more than a full chunk is waiting, so the last chunk can
+        still grow with the next delta.
+
+        Args:
+            pending: Model-side text after the last analyzed chunk
+            chunk_size: Chunk size in characters
+
+        Returns:
+            Character offsets in pending where each complete chunk ends
+        """
+        if len(pending) <= chunk_size:
+            return []
+
+        index = TranscriptIndex(pending)
+        boundaries = [int(start) for start in index.turn_start] if index.has_speakers else []
+        cuts = []
+        start = 0
+        while len(pending) - start > chunk_size:
+            limit = start + chunk_size
+            # Latest turn start that keeps the chunk within the size limit
+            position = bisect.bisect_right(boundaries, limit) - 1
+            cut = boundaries[position] if position >= 0 and boundaries[position] > start else -1
+            if cut == -1:
+                # One long turn: cut at a paragraph break, then a space, then anywhere
+                cut = pending.rfind('\n', start + 1, limit)
+                if cut <= start:
+                    cut = pending.rfind(' ', start + 1, limit)
+                if cut <= start:
+                    cut = limit
+            cuts.append(cut)
+            start = cut
+        return cuts
+
+    def _analyze_chunks(self, chunks: List[str], deadline: Optional[Deadline]) -> List[Optional[Dict[str, Any]]]:
+        """Run the map phase on new chunks concurrently, keeping transcript order"""
+        state = self.state
+        first = len(state["chunk_analyses"])
+        concurrency = max(1, int(self.openai_helper.stage_settings("map")["concurrency"]))
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+            futures = [
+                # Copy the caller's context so the request priority carries over
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self.openai_helper.analyze_chunk, chunk, first + i, None,
+                    state["title"], state["date"], state["duration"], state["context_prompt"], deadline
+                )
+                for i, chunk in enumerate(chunks)
+            ]
+            records = []
+            for future in futures:
+                try:
+                    records.append(future.result())
+                except CircuitOpenError:
+                    # Upstream is down: keep the text and leave this chunk and the rest pending
+                    for pending in futures:
+                        pending.cancel()
+                    records.extend([None] * (len(futures) - len(records)))
+                    break
+            return records
+
+    def refresh_due(self, refresh_chunks: int = DEFAULT_REFRESH_CHUNKS,
+                    refresh_seconds: float = DEFAULT_REFRESH_SECONDS) -> bool:
+        """
+        Check whether the scheduled summary refresh is due
+
+        Args:
+            refresh_chunks: Refresh after this many newly analyzed chunks (0 disables)
+            refresh_seconds: Refresh when this much time has passed and new text arrived (0 disables)
+
+        Returns:
+            True if the summary should be re-consolidated now
+        """
+        state = self.state
+        if state["source_bytes"] == state["refreshed_bytes"]:
+            return False
+        new_chunks = len(state["chunk_analyses"]) - state["refreshed_chunks"]
+        if refresh_chunks and new_chunks >= refresh_chunks:
+            return True
+        return bool(refresh_seconds) and time.time() - state["refreshed_at"] >= refresh_seconds
+
+    def consolidation_records(self) -> List[Dict[str, Any]]:
+        """
+        Chunk records to consolidate: every analyzed chunk plus the text still pending
+
+        The pending text is at most about one chunk, so it is passed as notes rather than
+        spending a map call on a chunk that is still growing.
+        """
+        records = list(self.state["chunk_analyses"])
+        pending = self.store.read_text(self.session_id, MODEL_STREAM, self.state["analyzed_bytes"]).strip()
+        if pending:
+            records.append(unstructured_record(pending))
+        return records
+
+    def source_transcript(self) -> str:
+        """Full original transcript received so far"""
+        return self.store.read_text(self.session_id, SOURCE_STREAM)
+
+    def model_transcript(self) -> str:
+        """Full transcript received so far as sent to the model (redacted when enabled)"""
+        return self.store.read_text(self.session_id, MODEL_STREAM)
+
+    def mark_refreshed(self, summary: Dict[str, Any]) -> None:
+        """
+        Store a freshly consolidated summary and restart the refresh schedule
+
+        Args:
+            summary: Processed summary dictionary
+        """
+        state = self.state
+        state["summary"] = summary
+        state["refreshed_at"] = time.time()
+        state["refreshed_chunks"] = len(state["chunk_analyses"])
+        state["refreshed_bytes"] = state["source_bytes"]
+        self.save()
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Describe how far the session has got
+
+        Returns:
+            Dictionary with the session id, received/analyzed byte counts, chunk count
+            and when the summary was last refreshed
+        """
+        state = self.state
+        return {
+            "session_id": self.session_id,
+            "received_bytes": state["source_bytes"],
+            "analyzed_bytes": state["analyzed_bytes"],
+            "pending_bytes": state["model_bytes"] - state["analyzed_bytes"],
+            "chunks_analyzed": len(state["chunk_analyses"]),
+            "refreshed_at": state["refreshed_at"],
+            "has_summary": "summary" in state,
+        }
+
+    def save(self) -> None:
+        """Write the session state back to the store"""
+        self.store.save(self.state, self.session_id)
@@ -0,0 +1,162 @@
+import re
+from array import array
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+
+# Words are matched case-insensitively, with curly apostrophes folded to straight ones
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+# Fillers that transcripts keep and quotes usually drop
+FILLER_WORDS = {"um", "uh", "erm", "er", "ah", "hmm", "mm", "mhm", "uhm"}
+
+DEFAULT_NGRAM_SIZE = 3
+
+# Query n-grams whose rarest word occurs more often than this are skipped as uninformative
+MAX_POSTINGS_PER_NGRAM = 2000
+
+# Width, in words, of the alignment band in which n-gram hits are counted together
+ALIGNMENT_BAND = 8
+
+
+def normalize_words(text: str) -> List[Tuple[str, int]]:
+    """
+    Split text into normalized words
+
+    Args:
+        text: Any text
+
+    Returns:
+        List of (word, character offset) pairs with fillers removed
+    """
+    folded = text.lower().replace("’", "'").replace("‘", "'")
+    return [
+        (match.group(), match.start())
+        for match in WORD_PATTERN.finditer(folded)
+        if match.group() not in FILLER_WORDS
+    ]
+
+
+class NGramIndex:
+    """Inverted word index over a transcript for locating phrases by n-gram alignment"""
+
+    def __init__(self, text: str, ngram_size: int = DEFAULT_NGRAM_SIZE):
+        """
+        Build the index in one pass over the text
+
+        Args:
+            text: Original transcript text; reported offsets point into it
+            ngram_size: Number of consecutive words compared when locating a phrase
+        """
+        self.text = text
+        self.ngram_size = ngram_size
+
+        self.words: List[str] = []
+        self.word_start = array('q')
+        self.word_end = array('q')
+        self._postings: Dict[str, array] = defaultdict(lambda: array('i'))
+
+        folded = text.lower().replace("’", "'").replace("‘", "'")
+        for match in WORD_PATTERN.finditer(folded):
+            word = match.group()
+            if word in FILLER_WORDS:
+                continue
+            self._postings[word].append(len(self.words))
+            self.words.append(word)
+            self.word_start.append(match.start())
+            self.word_end.append(match.end())
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def word_positions(self, word: str) -> array:
+        """Word positions of a normalized word (empty if it does not occur)"""
+        return self._postings.get(word, array('i'))
+
+    def ngram_positions(self, gram: Tuple[str, ...]) -> List[int]:
+        """Word positions where a sequence of normalized words starts"""
+        return self._ngram_hits(gram, None)
+
+    def _ngram_hits(self, gram: Tuple[str, ...], max_postings: Optional[int]) -> Optional[List[int]]:
+        """Word positions where the n-gram starts, or None if it is too common to be useful"""
+        postings = [self._postings.get(word) for word in gram]
+        if any(not posting for posting in postings):
+            return []
+
+        # Scan the rarest word's postings and check its neighbours directly
+        rarest = min(range(len(gram)), key=lambda k: len(postings[k]))
+        if max_postings is not None and len(postings[rarest]) > max_postings:
+            return None
+
+        hits = []
+        size = len(gram)
+        for position in postings[rarest]:
+            start = position - rarest
+            if start >= 0 and tuple(self.words[start:start + size]) == gram:
+                hits.append(start)
+        return hits
+
+    def find(self, phrase: str) -> Optional[Dict[str, Any]]:
+        """
+        Locate the best match for a phrase
+
+        Each n-gram of the phrase votes for the alignment it implies; the band of
+        alignments with the most votes is the match. Cost depends on the phrase and
+        the posting lists it touches, not on the length of the transcript.
+
+        Args:
+            phrase: Text to look for, e.g. a quote
+
+        Returns:
+            Dictionary with score (share of the phrase's n-grams found), exact flag and
+            start/end character offsets, or None if nothing matched
+        """
+        query = [word for word, _ in normalize_words(phrase)]
+        if not query:
+            return None
+
+        size = min(self.ngram_size, len(query))
+        grams = [tuple(query[i:i + size]) for i in range(len(query) - size + 1)]
+
+        # Vote: which n-grams of the query support a match starting near each band
+        band_votes: Dict[int, set] = defaultdict(set)
+        band_spans: Dict[int, List[int]] = {}
+        usable = 0
+        # A phrase made only of common words is still looked up, just more slowly
+        max_postings = MAX_POSTINGS_PER_NGRAM
+        if all(self._ngram_hits(gram, max_postings) is None for gram in grams):
+            max_postings = None
+
+        for gram_number, gram in enumerate(grams):
+            hits = self._ngram_hits(gram, max_postings)
+            if hits is None:
+                continue
+            usable += 1
+            for start in hits:
+                band = (start - gram_number) // ALIGNMENT_BAND
+                band_votes[band].add(gram_number)
+                span = band_spans.setdefault(band, [start, start + size])
+                span[0] = min(span[0], start)
+                span[1] = max(span[1], start + size)
+
+        if not band_votes:
+            return None
+
+        # Hits near a band edge fall into two bands; count them together
+        def support(band: int) -> int:
+            return len(band_votes[band] | band_votes.get(band + 1, set()))
+
+        best_band = max(band_votes, key=lambda band: (support(band), -band))
+        matched = band_votes[best_band] | band_votes.get(best_band + 1, set())
+        first_word, last_word = band_spans[best_band]
+        if best_band + 1 in band_spans:
+            first_word = min(first_word, band_spans[best_band + 1][0])
+            last_word = max(last_word, band_spans[best_band + 1][1])
+
+        score = len(matched) / usable
+        exact = len(matched) == usable and last_word - first_word == len(query)
+        return {
+            "score": round(score, 2),
+            "exact": exact,
+            "start": self.word_start[first_word],
+            "end": self.word_end[last_word - 1],
+        }
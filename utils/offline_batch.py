@@ -0,0 +1,363 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils.batch_runner import export_docx_file, write_report
+from utils.openai_helper import OpenAIHelper
+from utils.pipeline_state import PipelineStateStore
+from utils.redaction import Redactor
+from utils.summary_generator import SummaryGenerator
+from utils.summary_store import SummaryStore
+from utils.transcript_loader import load_transcript
+
+# Endpoint every batch request line targets
+BATCH_URL = "/v1/chat/completions"
+
+# Stages of an offline batch: chunk requests out, consolidation requests out, summaries ready
+STAGE_MAP = "map"
+STAGE_REDUCE = "reduce"
+STAGE_DONE = "done"
+
+
+def _custom_id(state_id: str, stage: str, index: int = 0) -> str:
+    return f"{state_id}-{stage}-{index}"
+
+
+def write_requests(path: str, requests: List[Tuple[str, Dict[str, Any]]]) -> int:
+    """
+    Write chat requests as a batch input file (one JSON request per line)
+
+    Args:
+        path: Output JSONL path
+        requests: (custom_id, request body) pairs
+
+    Returns:
+        Number of requests written
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for custom_id, body in requests:
+            line = {"custom_id": custom_id, "method": "POST", "url": BATCH_URL, "body": body}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return len(requests)
+
+
+def read_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read a batch output file
+
+    Args:
+        path: Results JSONL path, in the batch API output format
+
+    Returns:
+        Dictionary mapping custom_id to {"content", "finish_reason", "error"}; error is
+        empty for a successful request
+    """
+    results = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            result = {"content": "", "finish_reason": "", "error": ""}
+            if record.get("error"):
+                result["error"] = str(record["error"].get("message") or record["error"])
+            elif response.get("status_code") != 200:
+                result["error"] = f"HTTP {response.get('status_code')}: {json.dumps(response.get('body'))[:200]}"
+            else:
+                choice = response["body"]["choices"][0]
+                result["content"] = choice["message"].get("content") or ""
+                result["finish_reason"] = choice.get("finish_reason") or ""
+            results[record["custom_id"]] = result
+    return results
+
+
+def run_batch_locally(openai_helper: OpenAIHelper, requests_path: str, results_path: str,
+                      concurrency: int = 1) -> int:
+    """
+    Process a batch input file with live calls and write a batch output file
+
+    Stands in for the hosted batch service, e.g. against a local OpenAI-compatible server
+    or to check a run end to end before submitting it.
+
+    Args:
+        openai_helper: Helper used to send the requests (its rate limits apply)
+        requests_path: Batch input JSONL
+        results_path: Batch output JSONL to write
+        concurrency: Requests sent at once
+
+    Returns:
+        Number of requests that failed
+    """
+    with open(requests_path, encoding="utf-8") as f:
+        requests = [json.loads(line) for line in f if line.strip()]
+
+    def process(request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            content, finish_reason = openai_helper.complete_chat_request(request["body"])
+        except Exception as e:
+            print(f"Batch request {request['custom_id']} failed: {str(e)}")
+            return {"custom_id": request["custom_id"], "response": None, "error": {"message": str(e)}}
+        return {
+            "custom_id": request["custom_id"],
+            "response": {"status_code": 200, "body": {"choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }]}},
+            "error": None,
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = list(executor.map(process, requests))
+
+    with open(results_path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return sum(1 for result in results if result["error"])
+
+
+class OfflineBatch:
+    """
+    Summarize transcripts through batch request files instead of live calls
+
+    Two rounds: export() writes the chunk (map) requests; ingesting their results writes
+    the consolidation (reduce) requests; ingesting those produces the summaries. The
+    requests are the ones OpenAIHelper would send live. Each transcript's pipeline state
+    and the batch's own progress are saved in the PipelineStateStore between rounds, so
+    the rounds can run hours apart and in different processes.
+    """
+
+    def __init__(self, summary_generator: SummaryGenerator, pipeline_store: PipelineStateStore):
+        """
+        Initialize the batch
+
+        Args:
+            summary_generator: Generator whose helper builds the requests
+            pipeline_store: Store for the batch and per-transcript pipeline state
+        """
+        self.summary_generator = summary_generator
+        self.openai_helper = summary_generator.openai_helper
+        self.pipeline_store = pipeline_store
+
+    def load(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Load a batch's progress
+
+        Raises:
+            ValueError: If the id is not a stored offline batch
+        """
+        batch = self.pipeline_store.load(batch_id)
+        if not batch or batch.get("kind") != "offline_batch":
+            raise ValueError(f"Unknown offline batch: {batch_id}")
+        return batch
+
+    def export(self, jobs: List[Dict[str, Any]], requests_path: str,
+               redactor: Optional[Redactor] = None) -> str:
+        """
+        Prepare every transcript and write the chunk requests
+
+        Args:
+            jobs: Jobs from batch_runner.collect_jobs()
+            requests_path: Batch input JSONL to write
+            redactor: Optional PII redactor applied before anything is written out
+
+        Returns:
+            Batch id to pass to ingest()
+        """
+        requests = []
+        meetings = []
+        for job in jobs:
+            meeting = dict(job, state_id="", requests=0, status="pending", error="", notes=[])
+            meetings.append(meeting)
+            try:
+                transcript = load_transcript(job["path"])
+                if len(transcript) < 100:
+                    raise Exception("Transcript is too short")
+                pipeline_state = {}
+                chunk_requests = self.summary_generator.build_batch_requests(
+                    transcript, pipeline_state,
+                    title=job["title"],
+                    date=job["date"],
+                    duration=job["duration"],
+                    persona_prompt=job["persona_prompt"],
+                    context_prompt=job["context_prompt"],
+                    redaction=redactor.redact(transcript) if redactor else None
+                )
+            except Exception as e:
+                print(f"Skipping {job['path']}: {str(e)}")
+                meeting.update(status="error", error=str(e))
+                continue
+
+            meeting["state_id"] = self.pipeline_store.save(pipeline_state)
+            meeting["requests"] = len(chunk_requests)
+            requests.extend(
+                (_custom_id(meeting["state_id"], STAGE_MAP, i), body) for i, body in enumerate(chunk_requests)
+            )
+
+        write_requests(requests_path, requests)
+        batch_id = self.pipeline_store.save({
+            "kind": "offline_batch",
+            "stage": STAGE_MAP,
+            "created_at": time.time(),
+            "meetings": meetings,
+        })
+        print(f"Offline batch {batch_id}: wrote {len(requests)} chunk requests for "
+              f"{sum(1 for m in meetings if m['status'] == 'pending')} transcripts to {requests_path}")
+        return batch_id
+
+    def ingest(self, batch_id: str, results_path: str,
+               requests_path: Optional[str] = None) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Read the results of the batch's current stage and move it to the next one
+
+        After the chunk stage this writes the consolidation requests to requests_path.
+        After the consolidation stage it returns the finished summaries.
+
+        Args:
+            batch_id: Id returned by export()
+            results_path: Batch output JSONL for the current stage
+            requests_path: Batch input JSONL for the consolidation requests (chunk stage only)
+
+        Returns:
+            (meeting, summary) pairs once the consolidation results are in; otherwise empty
+
+        Raises:
+            ValueError: If the batch is unknown, finished, or requests_path is missing for the chunk stage
+        """
+        batch = self.load(batch_id)
+        results = read_results(results_path)
+
+        if batch["stage"] == STAGE_MAP:
+            if not requests_path:
+                raise ValueError("The chunk stage needs a path for the consolidation requests")
+            requests = self._ingest_chunks(batch, results)
+            write_requests(requests_path, requests)
+            batch["stage"] = STAGE_REDUCE
+            self.pipeline_store.save(batch, batch_id)
+            print(f"Offline batch {batch_id}: wrote {len(requests)} consolidation requests to {requests_path}")
+            return []
+
+        if batch["stage"] == STAGE_REDUCE:
+            summaries = self._ingest_consolidations(batch, results)
+            batch["stage"] = STAGE_DONE
+            self.pipeline_store.save(batch, batch_id)
+            print(f"Offline batch {batch_id}: {len(summaries)} summaries ready")
+            return summaries
+
+        raise ValueError(f"Offline batch {batch_id} is already finished")
+
+    def _ingest_chunks(self, batch: Dict[str, Any],
+                       results: Dict[str, Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Turn chunk results into chunk records and build each transcript's consolidation request"""
+        requests = []
+        for meeting in batch["meetings"]:
+            if meeting["status"] != "pending":
+                continue
+            pipeline_state = self.pipeline_store.load(meeting["state_id"])
+            if pipeline_state is None:
+                meeting.update(status="error", error="Pipeline state is missing")
+                continue
+
+            # Failed chunks are left out, as in the live map phase
+            chunk_analyses = []
+            for i in range(meeting["requests"]):
+                result = results.get(_custom_id(meeting["state_id"], STAGE_MAP, i))
+                if result is None or result["error"]:
+                    print(f"Chunk {i + 1} of {meeting['path']} failed: "
+                          f"{result['error'] if result else 'no result'}")
+                    continue
+                chunk_analyses.append(self.openai_helper.chunk_record_from_response(result["content"], i))
+
+            if not chunk_analyses:
+                meeting.update(status="error", error="No chunk requests succeeded")
+                continue
+            if len(chunk_analyses) < meeting["requests"]:
+                meeting["notes"].append(
+                    f"Consolidated from {len(chunk_analyses)} of {meeting['requests']} transcript sections; "
+                    f"the other sections failed in the batch"
+                )
+
+            pipeline_state["chunk_analyses"] = chunk_analyses
+            self.pipeline_store.save(pipeline_state, meeting["state_id"])
+            requests.append((
+                _custom_id(meeting["state_id"], STAGE_REDUCE),
+                self.summary_generator.build_batch_consolidation_request(pipeline_state)
+            ))
+        return requests
+
+    def _ingest_consolidations(self, batch: Dict[str, Any],
+                               results: Dict[str, Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Turn consolidation results into structured summaries"""
+        summaries = []
+        for meeting in batch["meetings"]:
+            if meeting["status"] != "pending":
+                continue
+            result = results.get(_custom_id(meeting["state_id"], STAGE_REDUCE))
+            if result is None or result["error"]:
+                meeting.update(status="error", error=result["error"] if result else "No consolidation result")
+                continue
+
+            # Same stitching as generate_markdown_sections, minus the continuation calls
+            section_blocks = self.openai_helper.split_markdown_sections(result["content"])
+            markdown_summary = result["content"]
+            if section_blocks:
+                markdown_summary = "\n\n".join(section_blocks[n] for n in sorted(section_blocks)) + "\n"
+            if result["finish_reason"] == "length":
+                meeting["notes"].append("Consolidation was cut off at max_tokens; the last section may be incomplete")
+
+            try:
+                summary = self.summary_generator.finish_batch_summary(
+                    markdown_summary, self.pipeline_store.load(meeting["state_id"])
+                )
+            except Exception as e:
+                meeting.update(status="error", error=str(e))
+                continue
+            summary["partial"] = bool(meeting["notes"])
+            summary["degradation_notes"] = list(meeting["notes"])
+            meeting["status"] = "ok"
+            summaries.append((meeting, summary))
+        return summaries
+
+
+def save_summaries(batch: Dict[str, Any], summaries: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                   output_dir: str, summary_store: Optional[SummaryStore] = None) -> str:
+    """
+    Write the summaries of a finished batch as JSON and Word files, plus report.csv
+
+    Args:
+        batch: Batch progress from OfflineBatch.load()
+        summaries: Pairs returned by the final OfflineBatch.ingest()
+        output_dir: Directory for the outputs
+        summary_store: Optional store the summaries are saved to (for series and search)
+
+    Returns:
+        Path of the report
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    finished = {meeting["state_id"]: summary for meeting, summary in summaries}
+    results = []
+    for index, meeting in enumerate(batch["meetings"]):
+        name = os.path.splitext(os.path.basename(meeting["path"]))[0]
+        base = os.path.join(output_dir, f"{index:04d}-{name}")
+        result = {"file": meeting["path"], "title": meeting["title"], "status": meeting["status"],
+                  "error": meeting["error"], "partial": bool(meeting["notes"])}
+        summary = finished.get(meeting["state_id"])
+        if summary is not None:
+            result["summary_json"] = base + ".summary.json"
+            with open(result["summary_json"], "w", encoding="utf-8") as f:
+                json.dump(summary, f, ensure_ascii=False)
+            try:
+                result["docx"] = export_docx_file(summary, base + ".docx", meeting["title"],
+                                                  meeting["date"], meeting["duration"])
+            except Exception as e:
+                result.update(status="error", error=f"Word export failed: {str(e)}")
+            if summary_store:
+                result["meeting_id"] = summary_store.add_meeting(
+                    summary, meeting["title"], meeting["date"], meeting["duration"],
+                    series=meeting["series"] or None
+                )
+        results.append(result)
+    return write_report(output_dir, results)
@@ -2,25 +2,183 @@ import openai
 import json
 import re
 import markdown
-from typing import Dict, Any, Optional, List
+import contextvars
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.chunk_records import (
+    CHUNK_RECORD_SCHEMA_PROMPT, parse_chunk_record, unstructured_record,
+    merge_chunk_records, render_merged_record, is_chunk_record
+)
+from utils.transcript_analyzer import render_transcript_facts
+from utils.transcript_index import TranscriptIndex
+from utils.retrieval import PassageIndex
+from utils.rate_limiter import SharedRateLimiter, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from utils.scheduler import PriorityScheduler, request_priority
+from utils.backend_pool import BackendPool, is_backend_failure
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.hedging import LatencyStats, HedgeBudget, hedged_call, MIN_HEDGE_DELAY_SECONDS
+from utils.autotuner import ChunkTuner, DEFAULT_CHUNK_SIZE, MODE_MAP_REDUCE
+
+# A map call still running after this percentile of similar calls' latency gets a duplicate
+HEDGE_PERCENTILE = 0.9
+
+# Rough timing estimates used to decide when to degrade under a deadline
+ESTIMATED_SECONDS_PER_CHUNK = 20
+ESTIMATED_SECONDS_DIRECT_SUMMARY = 90
+ESTIMATED_SECONDS_SECTION_GROUP = 45
+RESERVED_SECONDS_FOR_CONSOLIDATION = 60
+MAX_DEGRADED_CHUNK_SIZE = 22500
+
+# Rough size of a token in characters, for turning token budgets into text lengths
+CHARS_PER_TOKEN = 4
+
+# Per-stage settings: "map" extracts facts from each chunk, "reduce" consolidates
+# the chunk analyses and "direct" summarizes a transcript in a single call.
+# A model of None means "use the helper's primary model".
+DEFAULT_STAGE_CONFIG = {
+    "map": {"model": "gpt-4.1-mini", "max_tokens": 1500, "concurrency": 4},
+    "reduce": {"model": None, "max_tokens": 8000, "concurrency": 1},
+    "direct": {"model": None, "max_tokens": 8000, "concurrency": 1},
+    "section": {"model": None, "max_tokens": 4000, "concurrency": 4},
+}
+
+STAGE_LABELS = {
+    "map": "section analysis",
+    "reduce": "consolidation",
+    "direct": "summary",
+    "section": "section-wise summary",
+}
+
+# Numbered summary sections, matching the headings in the summary prompts
+SECTION_TITLES = {
+    1: "Executive Summary",
+    2: "Participants",
+    3: "Conversation Flow Summary",
+    4: "Decisions Made",
+    5: "Actions Planned",
+    6: "Open Questions",
+    7: "Key Quotes",
+    8: "Sentiment Analysis",
+    9: "Content Gaps",
+    10: "Technical Terminology & Acronyms",
+}
+
+# Independent section groups generated concurrently in section-wise mode
+SECTION_GROUPS = [
+    (1, 8, 9),
+    (2, 10),
+    (3,),
+    (4, 5, 6, 7),
+]
+
+# Typical completion tokens per section, used to size max_tokens for a call
+SECTION_TOKEN_BUDGETS = {
+    1: 500,
+    2: 250,
+    3: 1400,
+    4: 300,
+    5: 300,
+    6: 250,
+    7: 300,
+    8: 150,
+    9: 350,
+    10: 400,
+}
+
+# Sections whose length grows with the length of the meeting
+SCALING_SECTIONS = (2, 3, 4, 5, 6, 10)
+
+# Continuation calls allowed when a summary is truncated at max_tokens
+MAX_CONTINUATIONS = 2
 
 
 class OpenAIHelper:
     """Helper class for interacting with OpenAI API"""
 
-    def __init__(self, api_key: str, model: str = "gpt-4.1"):
+    def __init__(self, api_key: str, model: str = "gpt-4.1",
+                 fallback_model: Optional[str] = "gpt-4.1-mini",
+                 stage_config: Optional[Dict[str, Dict[str, Any]]] = None,
+                 section_parallel: bool = False,
+                 retrieval_token_budget: Optional[int] = None,
+                 rate_limiter: Optional[SharedRateLimiter] = None,
+                 priority: str = PRIORITY_INTERACTIVE,
+                 scheduler: Optional[PriorityScheduler] = None,
+                 backend_pool: Optional[BackendPool] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 hedge_budget: float = 0.0,
+                 autotuner: Optional[ChunkTuner] = None):
         """
         Initialize the OpenAI helper
 
         Args:
             api_key: OpenAI API key
             model: Model to use for text generation
+            fallback_model: Faster model used when a request is running out of time
+            stage_config: Optional per-stage overrides ("map", "reduce", "direct", "section")
+                of model, max_tokens and concurrency
+            section_parallel: Generate medium transcripts as concurrent section groups
+            retrieval_token_budget: In section-wise mode, give section groups that depend on a
+                few turns (participants, decisions, actions, ...) only the best-matching
+                transcript passages up to this many tokens instead of the whole transcript
+            rate_limiter: Optional rate limits shared with other processes (not used with a
+                backend pool, which applies each backend's limits)
+            priority: Default priority class of this helper's calls; a priority set for the current
+                request (scheduler.request_priority) takes precedence
+            scheduler: Optional scheduler sharing a fixed number of call slots between priority classes
+            backend_pool: Optional pool of endpoints/keys to spread calls over; api_key is then unused
+            circuit_breaker: Optional breaker that fails calls fast while upstream is unhealthy
+            hedge_budget: Duplicate map calls allowed per transcript, as a share of its chunks, for
+                chunk calls slower than the usual p90 of their size (0 disables hedging)
+            autotuner: Tuner choosing the chunk size and direct vs map-reduce from observed latency
+                (a fresh one if not given; pass one to share observations between helpers)
         """
         openai.api_key = api_key
         self.model = model
+        self.fallback_model = fallback_model or model
+        self.section_parallel = section_parallel
+        self.retrieval_token_budget = retrieval_token_budget
+        self.rate_limiter = rate_limiter
+        self.priority = priority
+        self.scheduler = scheduler
+        self.backend_pool = backend_pool
+        self.circuit_breaker = circuit_breaker
+        self.hedge_budget = hedge_budget
+        # Map-call latencies by size, the baseline for deciding that a call is slow
+        self.latency_stats = LatencyStats()
+        self.autotuner = autotuner or ChunkTuner()
+        self._prompt_overhead = None
+
+        # Merge any overrides over the defaults, ignoring unset values
+        self.stage_config = {}
+        for stage, defaults in DEFAULT_STAGE_CONFIG.items():
+            overrides = (stage_config or {}).get(stage, {})
+            self.stage_config[stage] = {
+                **defaults,
+                **{key: value for key, value in overrides.items() if value is not None}
+            }
+
+    def stage_settings(self, stage: str) -> Dict[str, Any]:
+        """
+        Get the model, max_tokens and concurrency for a pipeline stage
+
+        Args:
+            stage: Stage name ("map", "reduce", "direct" or "section")
+
+        Returns:
+            Dictionary of stage settings with the model resolved
+        """
+        settings = dict(self.stage_config[stage])
+        settings["model"] = settings["model"] or self.model
+        return settings
 
     def generate_text(self, prompt: str, system_prompt: Optional[str] = None,
-                      temp: float = 0.7, max_tokens: int = 4000) -> str:
+                      temp: float = 0.7, max_tokens: int = 4000,
+                      model: Optional[str] = None,
+                      deadline: Optional[Deadline] = None,
+                      response_format: Optional[Dict[str, Any]] = None) -> str:
         """
         Generate text using OpenAI's API
 
@@ -29,6 +187,9 @@ class OpenAIHelper:
             system_prompt: Optional system prompt
             temp: Temperature for text generation (not used with current model)
             max_tokens: Maximum tokens to generate
+            model: Optional model override for this call
+            deadline: Optional request deadline; the call times out when it expires
+            response_format: Optional response format, e.g. {"type": "json_object"}
 
         Returns:
             Generated text response
@@ -40,19 +201,237 @@ class OpenAIHelper:
 
         messages.append({"role": "user", "content": prompt})
 
-        try:
-            response = openai.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_completion_tokens=max_tokens
-                # Temperature parameter removed as it's not supported
-            )
+        content, _ = self._chat_completion(messages, max_tokens, model, deadline, response_format)
+        return content
+
+    def _chat_completion(self, messages: List[Dict[str, str]], max_tokens: int,
+                         model: Optional[str] = None,
+                         deadline: Optional[Deadline] = None,
+                         response_format: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """
+        Send a chat completion request
+
+        Args:
+            messages: Chat messages to send
+            max_tokens: Maximum tokens to generate
+            model: Optional model override for this call
+            deadline: Optional request deadline; the call times out when it expires
+            response_format: Optional response format, e.g. {"type": "json_object"}
+
+        Returns:
+            Tuple of (generated text, finish reason)
+        """
+        request_body = self.chat_request(messages, max_tokens, model, response_format)
+        request_options = {}
+
+        priority = request_priority.get() or self.priority
+        if self.circuit_breaker is not None:
+            # Fail fast while upstream is down; bulk work queues until it recovers instead
+            self.circuit_breaker.allow(wait=priority == PRIORITY_BATCH, deadline=deadline)
+
+        # Count the prompt and the largest possible completion, as the API's token limit does
+        tokens = sum(len(message["content"]) for message in messages) // CHARS_PER_TOKEN + max_tokens
+
+        slot = self.scheduler.slot(priority, tokens / 1000, deadline) if self.scheduler else nullcontext()
+        with slot:
+            # A backend pool applies each backend's own limits instead
+            if self.rate_limiter and self.backend_pool is None:
+                self.rate_limiter.acquire(tokens, priority, deadline)
+
+            if deadline is not None:
+                if deadline.expired():
+                    raise DeadlineExceeded("Request deadline exceeded before calling OpenAI")
+                request_options["timeout"] = deadline.timeout()
+
+            return self._send_chat_completion(request_body, deadline, request_options, tokens, priority)
+
+    def chat_request(self, messages: List[Dict[str, str]], max_tokens: int,
+                     model: Optional[str] = None,
+                     response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Build the body of a chat completion request, as sent live and written to batch files
 
-            return response.choices[0].message.content
+        Args:
+            messages: Chat messages to send
+            max_tokens: Maximum tokens to generate
+            model: Optional model override for this call
+            response_format: Optional response format, e.g. {"type": "json_object"}
 
+        Returns:
+            Request body for the chat completions endpoint
+        """
+        # Temperature parameter removed as it's not supported
+        request_body = {
+            "model": model or self.model,
+            "messages": messages,
+            "max_completion_tokens": max_tokens,
+        }
+        if response_format is not None:
+            request_body["response_format"] = response_format
+        return request_body
+
+    def _send_chat_completion(self, request_body: Dict[str, Any], deadline: Optional[Deadline],
+                              request_options: Dict[str, Any], tokens: int = 0,
+                              priority: str = PRIORITY_INTERACTIVE) -> Tuple[str, str]:
+        """Make the API call for _chat_completion, through the backend pool if there is one, and map its errors"""
+        started = time.monotonic()
+        try:
+            if self.backend_pool is not None:
+                response = self.backend_pool.complete(request_body, request_options, tokens, priority, deadline)
+            else:
+                response = openai.chat.completions.create(**request_body, **request_options)
+
+            choice = response.choices[0]
+
+        except DeadlineExceeded:
+            # Gave up waiting for capacity; nothing was sent upstream
+            raise
+        except openai.APITimeoutError as e:
+            # A call cut short by our own request deadline only counts if it was already slow
+            if deadline is None or (self.circuit_breaker is not None and
+                                    time.monotonic() - started >= self.circuit_breaker.slow_call_seconds):
+                self._record_upstream_call(started, timed_out=True)
+            if deadline is not None:
+                raise DeadlineExceeded(f"OpenAI call timed out at request deadline: {str(e)}")
+            raise Exception(f"OpenAI API Error: {str(e)}")
         except Exception as e:
+            self._record_upstream_call(started, failed=is_backend_failure(e))
             raise Exception(f"OpenAI API Error: {str(e)}")
 
+        self._record_upstream_call(started)
+        content = choice.message.content or ""
+
+        # Prefer the token counts the API reports over estimates from the text
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "prompt_tokens", None) or \
+            sum(len(message["content"]) for message in request_body["messages"]) // CHARS_PER_TOKEN
+        output_tokens = getattr(usage, "completion_tokens", None) or len(content) // CHARS_PER_TOKEN
+        self.autotuner.record(request_body["model"], input_tokens, output_tokens, time.monotonic() - started)
+
+        return content, choice.finish_reason
+
+    def _record_upstream_call(self, started: float, failed: bool = False, timed_out: bool = False) -> None:
+        """Report a finished upstream call to the circuit breaker, if there is one"""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(time.monotonic() - started, failed, timed_out)
+
+    def generate_markdown_sections(self, prompt: str, system_prompt: Optional[str] = None,
+                                   max_tokens: int = 4000, model: Optional[str] = None,
+                                   deadline: Optional[Deadline] = None,
+                                   max_continuations: int = MAX_CONTINUATIONS) -> str:
+        """
+        Generate numbered markdown sections, continuing automatically if the output is truncated
+
+        When the response stops at max_tokens, the cut-off section is dropped and the model
+        is asked to resume from that section; the pieces are stitched in section order.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens to generate per call
+            model: Optional model override for this call
+            deadline: Optional request deadline
+            max_continuations: Maximum number of continuation calls
+
+        Returns:
+            Markdown text made of numbered `## n.` sections
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        text, finish_reason = self._chat_completion(messages, max_tokens, model, deadline)
+        section_blocks = self.split_markdown_sections(text)
+
+        continuations = 0
+        while finish_reason == "length" and section_blocks and continuations < max_continuations:
+            # The last section was cut off mid-way, so regenerate it from its heading
+            truncated_number = max(section_blocks)
+            del section_blocks[truncated_number]
+            continuations += 1
+            print(f"Summary truncated at max_tokens; continuing from section {truncated_number} "
+                  f"(continuation {continuations} of {max_continuations})")
+
+            completed_text = "\n\n".join(section_blocks[number] for number in sorted(section_blocks))
+            continuation_messages = messages + [
+                {"role": "assistant", "content": completed_text},
+                {"role": "user", "content": (
+                    f"Your previous response was cut off. Continue the summary starting with the heading "
+                    f"`## {truncated_number}. {SECTION_TITLES.get(truncated_number, '')}` and write every remaining "
+                    f"section that was requested. Do not repeat sections that are already complete."
+                )}
+            ]
+
+            continuation_text, finish_reason = self._chat_completion(
+                continuation_messages, max_tokens, model, deadline
+            )
+            for number, block in self.split_markdown_sections(continuation_text).items():
+                if number not in section_blocks:
+                    section_blocks[number] = block
+
+        if not section_blocks:
+            return text
+
+        if finish_reason == "length":
+            print("Summary still truncated after continuations; the last section may be incomplete")
+
+        return "\n\n".join(section_blocks[number] for number in sorted(section_blocks)) + "\n"
+
+    def estimate_output_tokens(self, source_chars: int,
+                               sections: Optional[Tuple[int, ...]] = None,
+                               cap: Optional[int] = None) -> int:
+        """
+        Estimate the completion tokens needed for a set of summary sections
+
+        List-like sections (participants, scenes, decisions, actions, questions, terms)
+        grow with the source length; prose sections have a fixed budget.
+
+        Args:
+            source_chars: Length of the material being summarized in characters
+            sections: Section numbers to be generated (defaults to all ten)
+            cap: Optional upper bound, usually the stage's max_tokens
+
+        Returns:
+            Suggested max_tokens value
+        """
+        sections = sections or tuple(SECTION_TITLES)
+        scale = min(2.0, max(0.75, source_chars / 40000))
+
+        estimate = 0
+        for number in sections:
+            budget = SECTION_TOKEN_BUDGETS[number]
+            estimate += budget * scale if number in SCALING_SECTIONS else budget
+
+        # Leave headroom for headings and table markup
+        estimate = int(estimate * 1.2)
+        if cap is not None:
+            estimate = min(estimate, cap)
+        return estimate
+
+    def _model_for_stage(self, stage: str, deadline: Optional[Deadline] = None,
+                         needed_seconds: float = 0) -> str:
+        """
+        Pick the model for a stage, switching to the faster model when time is short
+
+        Args:
+            stage: Pipeline stage name ("map", "reduce", "direct" or "section")
+            deadline: Optional request deadline
+            needed_seconds: Expected duration of the call with the stage's model
+
+        Returns:
+            Model name to use
+        """
+        model = self.stage_settings(stage)["model"]
+        if deadline is None or self.fallback_model == model:
+            return model
+
+        if deadline.remaining() < needed_seconds:
+            deadline.record_degradation(f"Used faster model {self.fallback_model} for {STAGE_LABELS[stage]}")
+            return self.fallback_model
+
+        return model
+
     def chunk_text(self, text: str, max_chunk_size: int = 15000) -> List[str]:
         """
         Break down large text into smaller chunks
@@ -90,11 +469,98 @@ class OpenAIHelper:
 
         return chunks
 
+    def _chunk_transcript(self, transcript: str, max_chunk_size: int,
+                          transcript_index: Optional[TranscriptIndex] = None) -> List[str]:
+        """
+        Chunk a transcript on speaker-turn boundaries when an index is available
+
+        Args:
+            transcript: Transcript text
+            max_chunk_size: Maximum size of each chunk in characters
+            transcript_index: Optional speaker-turn index of the same text
+
+        Returns:
+            List of text chunks
+        """
+        if transcript_index is not None and transcript_index.text is transcript:
+            return transcript_index.chunk(max_chunk_size)
+        return self.chunk_text(transcript, max_chunk_size=max_chunk_size)
+
+    def plan_summary(self, transcript_chars: int) -> Dict[str, Any]:
+        """
+        Choose between a direct summary and map-reduce, and the chunk size, for a transcript
+
+        Args:
+            transcript_chars: Length of the transcript sent to the model in characters
+
+        Returns:
+            The autotuner's plan: mode, chunk_size, predicted seconds and reason
+        """
+        if self._prompt_overhead is None:
+            # Prompt tokens around the transcript text, measured once from empty prompts
+            self._prompt_overhead = {
+                stage: sum(len(prompt) for prompt in prompts) // CHARS_PER_TOKEN
+                for stage, prompts in (
+                    ("direct", self._build_direct_prompts("", "", "", "")),
+                    ("map", self._build_chunk_prompts("", 0, 1, "", "", "")),
+                    ("reduce", self._build_consolidation_prompts([], "", "", "")),
+                )
+            }
+
+        direct_settings = self.stage_settings("direct")
+        map_settings = self.stage_settings("map")
+        reduce_settings = self.stage_settings("reduce")
+        concurrency = max(1, int(map_settings["concurrency"]))
+        if self.scheduler is not None:
+            concurrency = min(concurrency, self.scheduler.slots)
+
+        # Limits the map calls share; an unlimited backend leaves the pool unlimited
+        limiters = [backend.limiter for backend in self.backend_pool.backends] if self.backend_pool \
+            else [self.rate_limiter]
+        limits = {"requests": 0.0, "tokens": 0.0}
+        for name in limits:
+            if all(limiter and limiter.limits[name] for limiter in limiters):
+                limits[name] = sum(limiter.limits[name] for limiter in limiters)
+
+        plan = self.autotuner.plan(
+            transcript_chars,
+            direct_stage={
+                "model": direct_settings["model"],
+                "overhead_tokens": self._prompt_overhead["direct"],
+                "output_tokens": self.estimate_output_tokens(transcript_chars, cap=direct_settings["max_tokens"]),
+            },
+            map_stage={
+                "model": map_settings["model"],
+                "overhead_tokens": self._prompt_overhead["map"],
+                "max_tokens": map_settings["max_tokens"],
+                "concurrency": concurrency,
+            },
+            reduce_stage={
+                "model": reduce_settings["model"],
+                "overhead_tokens": self._prompt_overhead["reduce"],
+                "output_tokens": self.estimate_output_tokens(transcript_chars, cap=reduce_settings["max_tokens"]),
+            },
+            chars_per_token=CHARS_PER_TOKEN,
+            requests_per_minute=limits["requests"],
+            tokens_per_minute=limits["tokens"]
+        )
+        predicted = ""
+        if plan["direct_seconds"] is not None:
+            predicted = f"; predicted {plan['direct_seconds']}s direct, {plan['map_reduce_seconds']}s map-reduce"
+        print(f"Summary plan for {transcript_chars} characters: {plan['mode']} with {plan['chunk_size']}-character "
+              f"chunks ({plan['reason']}{predicted})")
+        return plan
+
     def generate_structured_summary(self, transcript: str,
                                     title: str, date: str,
                                     duration: str,
                                     persona_prompt: str = "",
-                                    context_prompt: str = "") -> str:
+                                    context_prompt: str = "",
+                                    deadline: Optional[Deadline] = None,
+                                    section_parallel: Optional[bool] = None,
+                                    pipeline_state: Optional[Dict[str, Any]] = None,
+                                    transcript_facts: Optional[Dict[str, Any]] = None,
+                                    transcript_index: Optional[TranscriptIndex] = None) -> str:
         """
         Generate a structured meeting summary in Markdown format
 
@@ -105,21 +571,93 @@ class OpenAIHelper:
             duration: Meeting duration
             persona_prompt: Custom persona instructions for the AI
             context_prompt: Additional context about the meeting
+            deadline: Optional request deadline used to degrade instead of hanging
+            section_parallel: Generate section groups concurrently (defaults to the helper setting)
+            pipeline_state: Optional dictionary that receives intermediate results (chunk analyses)
+            transcript_facts: Optional speakers/acronyms found locally, given to the model as facts
+            transcript_index: Optional speaker-turn index used to chunk on turn boundaries
 
         Returns:
             String containing structured summary in Markdown format
         """
-        # Check if transcript is too large
-        if len(transcript) > 100000:  # Approximately 25k tokens
+        # Summarize in one call or map-reduce, whichever is expected to finish first
+        plan = self.plan_summary(len(transcript))
+        if plan["mode"] == MODE_MAP_REDUCE:
             return self.generate_summary_from_large_transcript(
                 transcript=transcript,
                 title=title,
                 date=date,
                 duration=duration,
                 persona_prompt=persona_prompt,
-                context_prompt=context_prompt
+                context_prompt=context_prompt,
+                deadline=deadline,
+                pipeline_state=pipeline_state,
+                transcript_facts=transcript_facts,
+                transcript_index=transcript_index,
+                chunk_size=plan["chunk_size"]
             )
 
+        system_prompt, user_prompt = self._build_direct_prompts(
+            transcript, title, date, duration, persona_prompt, context_prompt, transcript_facts
+        )
+
+        if section_parallel is None:
+            section_parallel = self.section_parallel
+
+        if section_parallel:
+            group_prompts = None
+            if self.retrieval_token_budget:
+                group_prompts = self._build_retrieval_prompts(
+                    transcript, title, date, duration, persona_prompt, context_prompt,
+                    transcript_facts, transcript_index
+                )
+            return self._generate_sections_in_parallel(
+                system_prompt, user_prompt, title, len(transcript), deadline, group_prompts
+            )
+
+        model = self._model_for_stage("direct", deadline, ESTIMATED_SECONDS_DIRECT_SUMMARY)
+        max_tokens = self.estimate_output_tokens(
+            len(transcript), cap=self.stage_settings("direct")["max_tokens"]
+        )
+
+        try:
+            return self.generate_markdown_sections(
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                model=model,
+                deadline=deadline
+            )
+
+        except DeadlineExceeded as e:
+            deadline.record_degradation(f"Summary call did not finish in time: {str(e)}")
+            return self._build_fallback_summary(
+                title, "The summary could not be completed within the allotted processing time."
+            )
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate summary: {str(e)}")
+
+    def _build_direct_prompts(self, transcript: str, title: str, date: str, duration: str,
+                              persona_prompt: str = "",
+                              context_prompt: str = "",
+                              transcript_facts: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """
+        Build the system and user prompts for a single-call structured summary
+
+        Args:
+            transcript: Meeting transcript text
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            persona_prompt: Custom persona instructions for the AI
+            context_prompt: Additional context about the meeting
+            transcript_facts: Optional speakers/acronyms found locally
+
+        Returns:
+            Tuple of (system_prompt, user_prompt)
+        """
         # Base system prompt - conditionally apply persona
         if persona_prompt:
             system_prompt = f"""
@@ -228,6 +766,13 @@ class OpenAIHelper:
         {context_prompt}
         """
 
+        # Add locally extracted speakers and acronyms so the model only fills in roles and definitions
+        facts_text = render_transcript_facts(transcript_facts or {})
+        if facts_text:
+            user_prompt += f"""
+        {facts_text}
+        """
+
         user_prompt += f"""
         MEETING TRANSCRIPT:
         {transcript}
@@ -247,21 +792,248 @@ class OpenAIHelper:
         1. For the Conversation Flow Summary section, each scene MUST include at least 3-4 detailed sentences (minimum 50-75 words per scene) with specific information about what was discussed, who spoke, and how the conversation progressed. This level of detail is absolutely required.
         """
 
-        try:
-            return self.generate_text(
-                prompt=user_prompt,
+        return system_prompt, user_prompt
+
+    def _build_retrieval_prompts(self, transcript: str, title: str, date: str, duration: str,
+                                 persona_prompt: str = "",
+                                 context_prompt: str = "",
+                                 transcript_facts: Optional[Dict[str, Any]] = None,
+                                 transcript_index: Optional[TranscriptIndex] = None
+                                 ) -> Dict[Tuple[int, ...], str]:
+        """
+        Build smaller user prompts for section groups that only need some passages
+
+        Args:
+            transcript: Meeting transcript text sent to the model
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            persona_prompt: Custom persona instructions for the AI
+            context_prompt: Additional context about the meeting
+            transcript_facts: Optional speakers/acronyms found locally, added to the queries
+            transcript_index: Optional speaker-turn index of the same text
+
+        Returns:
+            Mapping of section group to user prompt; groups not listed use the full transcript
+        """
+        if transcript_index is None or transcript_index.text is not transcript:
+            transcript_index = TranscriptIndex(transcript)
+        passage_index = PassageIndex(transcript_index)
+
+        # Speaker names and acronyms found locally help locate introductions and definitions
+        extra_terms = ""
+        if transcript_facts:
+            extra_terms = " ".join(
+                [speaker["name"] for speaker in transcript_facts.get("speakers", [])] +
+                [term["term"] for term in transcript_facts.get("acronyms", [])]
+            )
+
+        budget_chars = self.retrieval_token_budget * CHARS_PER_TOKEN
+        group_prompts = {}
+        for sections in SECTION_GROUPS:
+            excerpt = passage_index.select_for_sections(sections, budget_chars, extra_terms)
+            if excerpt is None:
+                continue
+
+            excerpt = "(Excerpts selected for these sections; [...] marks omitted parts of the meeting.)\n" + excerpt
+            _, group_prompts[sections] = self._build_direct_prompts(
+                excerpt, title, date, duration, persona_prompt, context_prompt, transcript_facts
+            )
+            print(f"Sections {sections} use {len(excerpt)} of {len(transcript)} transcript characters")
+
+        return group_prompts
+
+    def _generate_sections_in_parallel(self, system_prompt: str, user_prompt: str,
+                                       title: str, source_chars: int,
+                                       deadline: Optional[Deadline] = None,
+                                       group_prompts: Optional[Dict[Tuple[int, ...], str]] = None) -> str:
+        """
+        Generate independent section groups concurrently and stitch them together
+
+        Every call shares the same system prompt and transcript, and only the final
+        instruction differs, so the upstream prompt cache can reuse the common prefix.
+        Groups with an entry in group_prompts use that (retrieved) user prompt instead.
+
+        Args:
+            system_prompt: Full structured-summary system prompt
+            user_prompt: User prompt containing metadata and transcript
+            title: Meeting title
+            source_chars: Transcript length in characters, used to size max_tokens
+            deadline: Optional request deadline
+            group_prompts: Optional per-group user prompts built from retrieved passages
+
+        Returns:
+            Markdown summary containing sections 1-10 in order
+        """
+        settings = self.stage_settings("section")
+        model = self._model_for_stage("section", deadline, ESTIMATED_SECONDS_SECTION_GROUP)
+        print(f"Generating {len(SECTION_GROUPS)} section groups in parallel with {model}.")
+
+        group_prompts = group_prompts or {}
+
+        def generate_group(sections: Tuple[int, ...]) -> str:
+            return self.generate_markdown_sections(
+                prompt=group_prompts.get(sections, user_prompt) + self._scope_instruction(sections),
                 system_prompt=system_prompt,
-                max_tokens=4000
+                max_tokens=self.estimate_output_tokens(source_chars, sections, cap=settings["max_tokens"]),
+                model=model,
+                deadline=deadline
             )
 
-        except Exception as e:
-            raise Exception(f"Failed to generate summary: {str(e)}")
+        with ThreadPoolExecutor(max_workers=max(1, int(settings["concurrency"]))) as executor:
+            # Each thread runs in a copy of the caller's context so the request priority carries over
+            futures = {
+                sections: executor.submit(contextvars.copy_context().run, generate_group, sections)
+                for sections in SECTION_GROUPS
+            }
+
+            section_blocks = {}
+            for sections, future in futures.items():
+                try:
+                    section_blocks.update(self.split_markdown_sections(future.result()))
+                except DeadlineExceeded:
+                    deadline.record_degradation(
+                        f"Sections {', '.join(SECTION_TITLES[number] for number in sections)} did not finish in time"
+                    )
+                except CircuitOpenError:
+                    for future in futures.values():
+                        future.cancel()
+                    raise
+                except Exception as e:
+                    print(f"Error generating sections {sections}: {str(e)}")
+
+        if not section_blocks:
+            if deadline is not None and deadline.degraded:
+                return self._build_fallback_summary(
+                    title, "The summary could not be completed within the allotted processing time."
+                )
+            raise Exception("Failed to generate summary: no section group succeeded")
+
+        return self._stitch_sections(section_blocks)
+
+    def _scope_instruction(self, sections: Tuple[int, ...]) -> str:
+        """
+        Build the trailing instruction that limits a response to some sections
+
+        Args:
+            sections: Section numbers to produce
+
+        Returns:
+            Prompt text to append after the shared prompt prefix
+        """
+        section_names = ", ".join(f"{number}. {SECTION_TITLES[number]}" for number in sections)
+        return f"""
+        OUTPUT SCOPE FOR THIS RESPONSE:
+        Produce ONLY the following sections, using the exact `## n. Title` headings and formats from your instructions: {section_names}.
+        Do not output any other sections.
+        """
+
+    def generate_section(self, section_number: int, title: str, date: str, duration: str,
+                         transcript: str = "",
+                         chunk_analyses: Optional[List[Dict[str, Any]]] = None,
+                         persona_prompt: str = "",
+                         context_prompt: str = "",
+                         deadline: Optional[Deadline] = None,
+                         transcript_facts: Optional[Dict[str, Any]] = None,
+                         source_chars: int = 0) -> str:
+        """
+        Regenerate a single summary section from stored pipeline state
+
+        Uses the stored chunk analyses when the original run went through the map phase,
+        otherwise the compacted transcript.
+
+        Args:
+            section_number: Section to regenerate (1-10)
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            transcript: Compacted transcript text
+            chunk_analyses: Map-phase chunk records from the original run, if any
+            persona_prompt: Custom persona instructions for the AI
+            context_prompt: Additional context about the meeting
+            deadline: Optional request deadline
+            transcript_facts: Optional speakers/acronyms found locally
+            source_chars: Length of the transcript the section covers, used to size the output
+                (defaults to the length of transcript)
+
+        Returns:
+            Markdown block for the section, heading included
+        """
+        if section_number not in SECTION_TITLES:
+            raise ValueError(f"Unknown summary section: {section_number}")
+
+        if chunk_analyses:
+            system_prompt, user_prompt = self._build_consolidation_prompts(
+                chunk_analyses, title, date, duration, persona_prompt, context_prompt, transcript_facts
+            )
+            stage = "reduce"
+        else:
+            system_prompt, user_prompt = self._build_direct_prompts(
+                transcript, title, date, duration, persona_prompt, context_prompt, transcript_facts
+            )
+            stage = "direct"
+
+        sections = (section_number,)
+        markdown_text = self.generate_markdown_sections(
+            prompt=user_prompt + self._scope_instruction(sections),
+            system_prompt=system_prompt,
+            max_tokens=self.estimate_output_tokens(
+                source_chars or len(transcript), sections, cap=self.stage_settings(stage)["max_tokens"]
+            ),
+            model=self._model_for_stage(stage, deadline, ESTIMATED_SECONDS_SECTION_GROUP),
+            deadline=deadline
+        )
+
+        block = self.split_markdown_sections(markdown_text).get(section_number)
+        if not block:
+            raise Exception(f"The model did not return a {SECTION_TITLES[section_number]} section")
+        return block
+
+    def split_markdown_sections(self, markdown_text: str) -> Dict[int, str]:
+        """
+        Split a markdown summary into its numbered `## n.` sections
+
+        Args:
+            markdown_text: Markdown containing one or more numbered sections
+
+        Returns:
+            Dictionary mapping section number to the full section block (heading included)
+        """
+        blocks = {}
+        for match in re.finditer(r'^##\s+(\d+)\.\s+.*?(?=^##\s+\d+\.|\Z)', markdown_text, re.DOTALL | re.MULTILINE):
+            number = int(match.group(1))
+            if number in SECTION_TITLES:
+                blocks[number] = match.group(0).strip()
+        return blocks
+
+    def _stitch_sections(self, section_blocks: Dict[int, str]) -> str:
+        """
+        Join section blocks in numeric order, adding placeholders for missing ones
+
+        Args:
+            section_blocks: Dictionary mapping section number to section markdown
+
+        Returns:
+            Markdown summary with sections 1-10 in order
+        """
+        ordered = []
+        for number, section_title in SECTION_TITLES.items():
+            block = section_blocks.get(number)
+            if not block:
+                block = f"## {number}. {section_title}\n\nThis section could not be generated."
+            ordered.append(block)
+        return "\n\n".join(ordered) + "\n"
 
     def generate_summary_from_large_transcript(self, transcript: str,
                                                title: str, date: str,
                                                duration: str,
                                                persona_prompt: str = "",
-                                               context_prompt: str = "") -> str:
+                                               context_prompt: str = "",
+                                               deadline: Optional[Deadline] = None,
+                                               pipeline_state: Optional[Dict[str, Any]] = None,
+                                               transcript_facts: Optional[Dict[str, Any]] = None,
+                                               transcript_index: Optional[TranscriptIndex] = None,
+                                               chunk_size: Optional[int] = None) -> str:
         """
         Generate a structured meeting summary from a large transcript
         by breaking it into chunks and returning markdown
@@ -273,6 +1045,11 @@ class OpenAIHelper:
             duration: Meeting duration
             persona_prompt: Custom persona instructions for the AI
             context_prompt: Additional context about the meeting
+            deadline: Optional request deadline used to degrade instead of hanging
+            pipeline_state: Optional dictionary that receives the chunk analyses
+            transcript_facts: Optional speakers/acronyms found locally, given to the model as facts
+            transcript_index: Optional speaker-turn index used to chunk on turn boundaries
+            chunk_size: Chunk size in characters (defaults to the autotuner's choice)
 
         Returns:
             Combined markdown string containing structured summary
@@ -280,103 +1057,230 @@ class OpenAIHelper:
         print(f"Processing large transcript of {len(transcript)} characters.")
 
         # Break transcript into manageable chunks
-        chunks = self.chunk_text(transcript, max_chunk_size=7500)  # Even smaller chunks for better processing
-        print(f"Split into {len(chunks)} chunks for detailed analysis.")
+        if chunk_size is None:
+            chunk_size = self.plan_summary(len(transcript))["chunk_size"]
+        chunks = self._chunk_transcript(transcript, chunk_size, transcript_index)
+        map_settings = self.stage_settings("map")
+        concurrency = max(1, int(map_settings["concurrency"]))
+
+        # Under a deadline, grow the chunks so the map phase fits in the remaining time
+        if deadline is not None:
+            map_budget = deadline.remaining() - RESERVED_SECONDS_FOR_CONSOLIDATION
+            affordable_chunks = max(1, int(map_budget // ESTIMATED_SECONDS_PER_CHUNK) * concurrency)
+            if len(chunks) > affordable_chunks:
+                chunk_size = min(MAX_DEGRADED_CHUNK_SIZE,
+                                 max(chunk_size, len(transcript) // affordable_chunks + 1))
+                chunks = self._chunk_transcript(transcript, chunk_size, transcript_index)
+                deadline.record_degradation(f"Used larger chunks ({chunk_size} characters) to fit the time budget")
+
+        print(f"Split into {len(chunks)} chunks for detailed analysis "
+              f"({concurrency} concurrent calls with {map_settings['model']}).")
+        hedge = HedgeBudget(len(chunks), self.hedge_budget)
+
+        # Process chunks concurrently, keeping the results in transcript order; each thread
+        # runs in a copy of the caller's context so the request priority carries over
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self.analyze_chunk, chunk, i, len(chunks), title, date, duration,
+                    context_prompt, deadline, hedge
+                )
+                for i, chunk in enumerate(chunks)
+            ]
+            try:
+                results = [future.result() for future in futures]
+            except CircuitOpenError:
+                # Drop the chunks that have not started; the running ones fail fast
+                for future in futures:
+                    future.cancel()
+                raise
+
+        if hedge.used:
+            print(f"Hedged {hedge.used} slow chunk calls; the duplicate finished first {hedge.wins} times.")
+
+        chunk_analyses = [analysis for analysis in results if analysis]
+        if deadline is not None and len(chunk_analyses) < len(chunks) and \
+                deadline.remaining() < RESERVED_SECONDS_FOR_CONSOLIDATION:
+            deadline.record_degradation(
+                f"Consolidated from {len(chunk_analyses)} of {len(chunks)} transcript sections; "
+                f"remaining sections were not analyzed in time"
+            )
+
+        if pipeline_state is not None:
+            pipeline_state["chunk_analyses"] = chunk_analyses
+            pipeline_state["model_chars"] = len(transcript)
+
+        if not chunk_analyses:
+            if deadline is not None:
+                deadline.record_degradation("No transcript sections were analyzed before the deadline")
+            return self._build_fallback_summary(
+                title, "The transcript was too large for complete analysis and some information may be missing."
+            )
+
+        summary = self.consolidate_chunk_analyses(
+            chunk_analyses, title, date, duration, persona_prompt, context_prompt,
+            transcript_facts, deadline, source_chars=len(transcript)
+        )
+        print("Large transcript processing complete.")
+        return summary
 
-        # Process each chunk separately
-        chunk_analyses = []
+    def build_chunk_requests(self, transcript: str, title: str, date: str, duration: str,
+                             context_prompt: str = "",
+                             transcript_index: Optional[TranscriptIndex] = None) -> List[Dict[str, Any]]:
+        """
+        Build the map-phase requests generate_summary_from_large_transcript would send
+
+        Used for offline batch submission, where there is no deadline to degrade under and
+        latency does not matter, so the chunk size is the fixed one if set, not a tuned one.
+
+        Args:
+            transcript: Transcript text
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            context_prompt: Additional context about the meeting
+            transcript_index: Optional speaker-turn index used to chunk on turn boundaries
+
+        Returns:
+            One chat request body per chunk, in transcript order
+        """
+        chunks = self._chunk_transcript(transcript, self.autotuner.chunk_size or DEFAULT_CHUNK_SIZE,
+                                        transcript_index)
+        settings = self.stage_settings("map")
+        requests = []
         for i, chunk in enumerate(chunks):
-            print(f"Processing chunk {i + 1} of {len(chunks)}...")
-
-            # Base system prompt for chunk analysis with persona if provided
-            if persona_prompt:
-                system_prompt = f"""
-                {persona_prompt}
-
-                While maintaining this persona, you are analyzing one section of a longer meeting transcript.
-
-                Extract key information from this transcript section including:
-                1. A brief summary of the main points discussed in this section (2-3 sentences)
-                2. Any participants mentioned with their roles or affiliations
-                  - IMPORTANT: Only note organizations or titles that are EXPLICITLY stated in the text
-                  - Clearly mark participants from SSA (the host organization) vs external participants
-                  - Only include participants who speak. Do not include individuals that are simply mentioned.
-                3. Key discussion topics (with minimum 3-4 sentences of detail per topic)
-                4. Any decisions made
-                5. Any actions planned
-                6. Any open questions raised
-                7. Notable quotes from participants (clearly indicate which quotes are from non-SSA/external participants)
-                8. Any technical terms or acronyms used
-
-                Respond in plain text, organized by the categories above. Be specific and extract actual details from the transcript.
-                Your analysis should reflect your persona in tone, vocabulary and style.
-                """
-            else:
-                system_prompt = """
-                You are an expert in analyzing business meeting transcripts. You are currently analyzing one section of a longer transcript.
-
-                Extract key information from this transcript section including:
-                1. A brief summary of the main points discussed in this section (2-3 sentences)
-                2. Any participants mentioned with their roles or affiliations
-                  - IMPORTANT: Only note organizations or titles that are EXPLICITLY stated in the text
-                  - Clearly mark participants from SSA (the host organization) vs external participants
-                  - Only include participants who speak. Do not include individuals that are simply mentioned.
-                3. Key discussion topics (with minimum 3-4 sentences of detail per topic)
-                4. Any decisions made
-                5. Any actions planned
-                6. Any open questions raised
-                7. Notable quotes from participants (clearly indicate which quotes are from non-SSA/external participants)
-                8. Any technical terms or acronyms used
-
-                Respond in plain text, organized by the categories above. Be specific and extract actual details from the transcript.
-                """
-
-            # Construct user prompt
-            user_prompt = f"""
-            This is PART {i + 1} of {len(chunks)} of a meeting transcript titled "{title}" from {date or 'unknown date'} lasting {duration or 'unknown duration'}.
-            """
+            system_prompt, user_prompt = self._build_chunk_prompts(
+                chunk, i, len(chunks), title, date, duration, context_prompt
+            )
+            requests.append(self.chat_request(
+                [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+                settings["max_tokens"], settings["model"], {"type": "json_object"}
+            ))
+        return requests
+
+    def build_consolidation_request(self, chunk_analyses: List[Dict[str, Any]],
+                                    title: str, date: str, duration: str,
+                                    persona_prompt: str = "",
+                                    context_prompt: str = "",
+                                    transcript_facts: Optional[Dict[str, Any]] = None,
+                                    source_chars: int = 0) -> Dict[str, Any]:
+        """
+        Build the reduce-phase request consolidate_chunk_analyses would send
 
-            # Add context prompt if provided
-            if context_prompt and i == 0:  # Only add to the first chunk to avoid repetition
-                user_prompt += f"""
-            MEETING CONTEXT:
-            {context_prompt}
-            """
+        Args:
+            chunk_analyses: Chunk records in transcript order
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            persona_prompt: Custom persona instructions for the AI
+            context_prompt: Additional context about the meeting
+            transcript_facts: Optional speakers/acronyms found locally
+            source_chars: Length of the transcript the records were taken from, used to size the output
 
-            user_prompt += f"""
-            Analyze this transcript section thoroughly and extract all relevant information:
+        Returns:
+            Chat request body
+        """
+        system_prompt, user_prompt = self._build_consolidation_prompts(
+            chunk_analyses, title, date, duration, persona_prompt, context_prompt, transcript_facts
+        )
+        settings = self.stage_settings("reduce")
+        return self.chat_request(
+            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+            self.estimate_output_tokens(source_chars, cap=settings["max_tokens"]),
+            settings["model"]
+        )
+
+    def complete_chat_request(self, request_body: Dict[str, Any],
+                              deadline: Optional[Deadline] = None) -> Tuple[str, str]:
+        """
+        Send a request body built by chat_request() as a live call
 
-            {chunk}
+        Args:
+            request_body: Chat request body
+            deadline: Optional request deadline
 
-            Provide detailed, specific information from THIS section in an organized format.
-            """
+        Returns:
+            Tuple of (generated text, finish reason)
+        """
+        return self._chat_completion(
+            request_body["messages"], request_body["max_completion_tokens"],
+            request_body.get("model"), deadline, request_body.get("response_format")
+        )
+
+    def consolidate_chunk_analyses(self, chunk_analyses: List[Dict[str, Any]],
+                                   title: str, date: str, duration: str,
+                                   persona_prompt: str = "",
+                                   context_prompt: str = "",
+                                   transcript_facts: Optional[Dict[str, Any]] = None,
+                                   deadline: Optional[Deadline] = None,
+                                   source_chars: int = 0) -> str:
+        """
+        Run the reduce phase: turn map-phase chunk records into the markdown summary
 
-            # Add persona reminder if needed
-            if persona_prompt:
-                user_prompt += f"""
+        Args:
+            chunk_analyses: Chunk records in transcript order
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            persona_prompt: Custom persona instructions for the AI
+            context_prompt: Additional context about the meeting
+            transcript_facts: Optional speakers/acronyms found locally
+            deadline: Optional request deadline
+            source_chars: Length of the transcript the records were taken from, used to size the output
 
-            IMPORTANT: Maintain the persona of {persona_prompt} in your analysis. Your tone, vocabulary, and style should reflect this persona.
-            """
+        Returns:
+            Markdown summary, or the fallback summary if consolidation fails
+        """
+        consolidation_system_prompt, consolidation_user_prompt = self._build_consolidation_prompts(
+            chunk_analyses, title, date, duration, persona_prompt, context_prompt, transcript_facts
+        )
 
-            user_prompt += """
-            IMPORTANT NOTES:
-            1. For participant affiliations, ONLY note organizations or titles that are EXPLICITLY stated in the text.
-            2. For any quotes you extract, clearly mark which are from SSA members (the host organization) versus external participants (clients, consultants, vendors, etc.).
-            """
+        model = self._model_for_stage("reduce", deadline, RESERVED_SECONDS_FOR_CONSOLIDATION)
 
-            try:
-                response = self.generate_text(
-                    prompt=user_prompt,
-                    system_prompt=system_prompt,
-                    max_tokens=3000
-                )
-                chunk_analyses.append(response)
-            except Exception as e:
-                print(f"Error processing chunk {i + 1}: {str(e)}")
-                # Continue even if one chunk fails
-                continue
+        max_tokens = self.estimate_output_tokens(
+            source_chars, cap=self.stage_settings("reduce")["max_tokens"]
+        )
+
+        try:
+            return self.generate_markdown_sections(
+                prompt=consolidation_user_prompt,
+                system_prompt=consolidation_system_prompt,
+                max_tokens=max_tokens,
+                model=model,
+                deadline=deadline
+            )
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"Error generating consolidated summary: {str(e)}")
+            if isinstance(e, DeadlineExceeded):
+                deadline.record_degradation("Consolidation did not finish in time")
+            return self._build_fallback_summary(
+                title, "The transcript was too large for complete analysis and some information may be missing."
+            )
 
-        # Now generate a consolidated markdown summary using the chunk analyses
+    def _build_consolidation_prompts(self, chunk_analyses: List[Dict[str, Any]],
+                                     title: str, date: str, duration: str,
+                                     persona_prompt: str = "",
+                                     context_prompt: str = "",
+                                     transcript_facts: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """
+        Build the system and user prompts that consolidate chunk analyses into a summary
+
+        Args:
+            chunk_analyses: Map-phase chunk records in transcript order
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            persona_prompt: Custom persona instructions for the AI
+            context_prompt: Additional context about the meeting
+            transcript_facts: Optional speakers/acronyms found locally
+
+        Returns:
+            Tuple of (system_prompt, user_prompt)
+        """
         if persona_prompt:
             consolidation_system_prompt = f"""
             {persona_prompt}
@@ -468,9 +1372,11 @@ class OpenAIHelper:
             IMPORTANT REMINDER: While following these structural requirements, make sure your entire summary reflects {persona_prompt}. Your tone, vocabulary, explanations, and perspective should clearly demonstrate this persona throughout all sections.
             """
 
-        # Create a consolidated prompt with the chunk analyses
-        separator = "=" * 50
-        chunk_analyses_text = separator.join(chunk_analyses)
+        # Merge the chunk records locally so the consolidation input stays compact
+        records = [analysis if is_chunk_record(analysis) else unstructured_record(str(analysis))
+                   for analysis in chunk_analyses]
+        merged_record = merge_chunk_records(records)
+        chunk_analyses_text = render_merged_record(merged_record)
 
         consolidation_user_prompt = f"""
         Create a comprehensive markdown summary of a meeting titled "{title}" that took place on {date or 'unknown date'} lasting {duration or 'unknown duration'}.
@@ -483,15 +1389,20 @@ class OpenAIHelper:
         {context_prompt}
         """
 
+        # Add locally extracted speakers and acronyms so the model only fills in roles and definitions
+        facts_text = render_transcript_facts(transcript_facts or {})
+        if facts_text:
+            consolidation_user_prompt += f"""
+        {facts_text}
+        """
+
         consolidation_user_prompt += f"""
-        Below are analyses of different chunks of the meeting transcript. Please consolidate these into a single coherent summary following the markdown structure in your instructions.
+        Below are the facts extracted from {len(records)} consecutive parts of the meeting transcript, merged and deduplicated into one JSON object. "part_summaries" and the "part" field of each topic give the order of the discussion; "external" marks participants and quotes from outside SSA (the host organization). Please consolidate these into a single coherent summary following the markdown structure in your instructions.
 
-        CHUNK ANALYSES:
-        {separator}
+        EXTRACTED FACTS:
         {chunk_analyses_text}
-        {separator}
 
-        Create a well-structured markdown summary that captures the key elements from all these analyses, eliminating duplications and organizing the information logically.
+        Create a well-structured markdown summary that captures the key elements from these facts, organizing the information logically.
         """
 
         # Add persona reminder to user prompt if provided
@@ -505,23 +1416,227 @@ class OpenAIHelper:
         IMPORTANT NOTES: 
         1. For the Conversation Flow Summary section, each scene MUST include at least 3-4 detailed sentences (minimum 50-75 words per scene) with specific information about what was discussed, who spoke, and how the conversation progressed. This level of detail is absolutely required.
         """
+        return consolidation_system_prompt, consolidation_user_prompt
 
-        try:
-            consolidated_summary = self.generate_text(
-                prompt=consolidation_user_prompt,
-                system_prompt=consolidation_system_prompt,
-                max_tokens=4000
+    def _build_chunk_prompts(self, chunk: str, index: int, total: Optional[int],
+                             title: str, date: str, duration: str,
+                             context_prompt: str = "") -> Tuple[str, str]:
+        """
+        Build the system and user prompts for extracting a JSON record from one transcript chunk
+
+        Args:
+            chunk: Transcript chunk text
+            index: Zero-based position of the chunk
+            total: Total number of chunks, or None while the meeting is still running
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            context_prompt: Additional context about the meeting
+
+        Returns:
+            Tuple of (system_prompt, user_prompt)
+        """
+        system_prompt = f"""
+        You are an expert in analyzing business meeting transcripts. You are currently extracting facts from one section of a longer transcript.
+
+        Respond with a single JSON object that follows this schema exactly:
+        {CHUNK_RECORD_SCHEMA_PROMPT}
+        Rules:
+        - Be concise: short phrases, no filler. Use empty lists when a category has nothing.
+        - participants: only people who speak in this section. Only note organizations or titles that are EXPLICITLY stated in the text. Set "external" to true for anyone outside SSA (the host organization).
+        - topics: every distinct discussion topic with the key facts, positions and who raised them.
+        - decisions: firm decisions only (words like "agreed", "decided", "confirmed").
+        - actions: commitments ("we will", "please", "I'll", etc.) with owner and any stated timing.
+        - questions: questions that were not answered in this section.
+        - quotes: up to 3 notable verbatim quotes (<=50 words), with "external" set for non-SSA speakers.
+        - terms: technical terms and acronyms used, with a short definition if one is given or well known.
+        """
+
+        # Construct user prompt
+        part = f"PART {index + 1} of {total}" if total else f"PART {index + 1} of an ongoing"
+        user_prompt = f"""
+        This is {part} of a meeting transcript titled "{title}" from {date or 'unknown date'} lasting {duration or 'unknown duration'}.
+        """
+
+        # Add context prompt if provided
+        if context_prompt and index == 0:  # Only add to the first chunk to avoid repetition
+            user_prompt += f"""
+        MEETING CONTEXT:
+        {context_prompt}
+        """
+
+        user_prompt += f"""
+        Extract the facts from this transcript section as JSON:
+
+        {chunk}
+        """
+
+        return system_prompt, user_prompt
+
+    def analyze_chunk(self, chunk: str, index: int, total: Optional[int],
+                       title: str, date: str, duration: str,
+                       context_prompt: str = "",
+                       deadline: Optional[Deadline] = None,
+                       hedge: Optional[HedgeBudget] = None) -> Optional[Dict[str, Any]]:
+        """
+        Run the map-phase extraction for a single chunk
+
+        Args:
+            chunk: Transcript chunk text
+            index: Zero-based position of the chunk
+            total: Total number of chunks, or None while the meeting is still running
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            context_prompt: Additional context about the meeting
+            deadline: Optional request deadline
+            hedge: Optional budget for sending a duplicate call if this one is unusually slow
+
+        Returns:
+            Chunk record, or None if the chunk failed or was skipped
+        """
+        # Skip the chunk so there is still time to consolidate what we have
+        if deadline is not None and deadline.remaining() < RESERVED_SECONDS_FOR_CONSOLIDATION:
+            return None
+
+        print(f"Processing chunk {index + 1} of {total or 'a live transcript'}...")
+
+        system_prompt, user_prompt = self._build_chunk_prompts(
+            chunk, index, total, title, date, duration, context_prompt
+        )
+
+        settings = self.stage_settings("map")
+        model = self._model_for_stage(
+            "map", deadline,
+            ESTIMATED_SECONDS_PER_CHUNK + RESERVED_SECONDS_FOR_CONSOLIDATION
+        )
+
+        prompt_tokens = (len(system_prompt) + len(user_prompt)) // CHARS_PER_TOKEN
+
+        def call() -> str:
+            started = time.monotonic()
+            text = self.generate_text(
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                max_tokens=settings["max_tokens"],
+                model=model,
+                deadline=deadline,
+                response_format={"type": "json_object"}
             )
-            print("Large transcript processing complete.")
-            return consolidated_summary
+            self.latency_stats.record(model, prompt_tokens, time.monotonic() - started)
+            self.autotuner.record_map_output(prompt_tokens, len(text) // CHARS_PER_TOKEN)
+            return text
+
+        # Only hedge once the usual latency of calls this size is known
+        delay = None
+        if hedge is not None and hedge.allowed:
+            p90 = self.latency_stats.percentile(model, prompt_tokens, HEDGE_PERCENTILE)
+            if p90 is not None:
+                delay = max(MIN_HEDGE_DELAY_SECONDS, p90)
 
+        try:
+            response = hedged_call(call, delay, hedge) if delay is not None else call()
+        except DeadlineExceeded:
+            return None
+        except CircuitOpenError:
+            # Upstream is down; stop the map phase instead of failing chunk by chunk
+            raise
         except Exception as e:
-            print(f"Error generating consolidated summary: {str(e)}")
-            # Create a simple fallback summary
-            fallback_summary = f"""
+            print(f"Error processing chunk {index + 1}: {str(e)}")
+            # Continue even if one chunk fails
+            return None
+
+        return self.chunk_record_from_response(response, index)
+
+    def chunk_record_from_response(self, response: str, index: int) -> Dict[str, Any]:
+        """
+        Parse a map-phase response into a chunk record
+
+        Args:
+            response: Model response for one chunk
+            index: Zero-based position of the chunk, for logging
+
+        Returns:
+            Chunk record; a response that is not a valid record is kept as notes
+        """
+        try:
+            return parse_chunk_record(response)
+        except ValueError as e:
+            # Keep the content rather than losing the chunk
+            print(f"Chunk {index + 1} did not return a valid record, keeping it as notes: {str(e)}")
+            return unstructured_record(response)
+
+    def generate_series_report(self, series: str, rollup_text: str,
+                               persona_prompt: str = "",
+                               deadline: Optional[Deadline] = None) -> str:
+        """
+        Write a report for a meeting series from its rollup in one call
+
+        The rollup already holds the deduplicated decisions, actions, open questions and
+        participants of every meeting, so no transcript is re-read.
+
+        Args:
+            series: Series name
+            rollup_text: Rollup rendered by render_rollup()
+            persona_prompt: Custom persona instructions for the AI
+            deadline: Optional request deadline
+
+        Returns:
+            Markdown report
+        """
+        system_prompt = f"{persona_prompt}\n\n" if persona_prompt else ""
+        system_prompt += """
+        You are an expert in summarizing recurring business meetings. You write period reports for a meeting series from facts already extracted from each meeting.
+
+        Respond in markdown with exactly these sections:
+        ## 1. Overview
+        Two paragraphs: what the series covered over the period and the overall trajectory.
+        ## 2. Key Decisions
+        A table | Decision | Details | Owner(s) | Date |, most significant first.
+        ## 3. Actions
+        A table | Action | Responsible | Timeline | Status |. Status is "Carried over" for actions mentioned in several meetings, otherwise "New".
+        ## 4. Open Questions
+        A table | Question | Owner | First Raised |, only questions that still look unresolved.
+        ## 5. Participants
+        A table | Name | Organization / Title | Meetings Attended |.
+        Use only the facts given. Keep each table cell under 25 words.
+        """
+
+        user_prompt = f"""
+        Write the report for the meeting series "{series}".
+
+        Each item below lists the dates it was first and last mentioned and in how many meetings ("mentions").
+
+        SERIES FACTS:
+        {rollup_text}
+        """
+
+        settings = self.stage_settings("reduce")
+        model = self._model_for_stage("reduce", deadline, RESERVED_SECONDS_FOR_CONSOLIDATION)
+        return self.generate_text(
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            max_tokens=settings["max_tokens"],
+            model=model,
+            deadline=deadline
+        )
+
+    def _build_fallback_summary(self, title: str, reason: str) -> str:
+        """
+        Build a placeholder markdown summary used when processing cannot complete
+
+        Args:
+            title: Meeting title
+            reason: Sentence explaining why the summary is incomplete
+
+        Returns:
+            Markdown string following the standard section structure
+        """
+        # Create a simple fallback summary
+        fallback_summary = f"""
 ## 1. Executive Summary
 
-This meeting titled '{title}' faced technical processing challenges. The transcript was too large for complete analysis and some information may be missing.
+This meeting titled '{title}' faced technical processing challenges. {reason}
 
 Despite processing limitations, a partial summary is provided below. It's recommended to review the original transcript for complete understanding of all discussed topics.
 
@@ -564,4 +1679,4 @@ The sentiment analysis could not be completed due to processing limitations with
 |------|------------|
 | N/A | No terminology could be reliably extracted due to processing limitations |
 """
-            return fallback_summary
+        return fallback_summary
@@ -0,0 +1,233 @@
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+try:
+    import fcntl  # Unix only; without it locks only hold within one process
+except ImportError:
+    fcntl = None
+
+from utils.redaction import Redaction
+from utils.transcript_index import TranscriptIndex
+
+STATE_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+# Default lifetime of a state and its streams after their last write
+DEFAULT_MAX_AGE_SECONDS = 3 * 24 * 3600
+# Expired states are looked for at most this often, on save
+CLEANUP_INTERVAL_SECONDS = 600
+
+# Used by lock() where file locks are not available
+_process_lock = threading.Lock()
+
+
+def state_source_transcript(state: Dict[str, Any]) -> str:
+    """
+    Original transcript of a stored state
+
+    Only the redacted text is stored; the original is rebuilt from it and the placeholders.
+
+    Args:
+        state: Pipeline state
+
+    Returns:
+        The original transcript text, or an empty string if the state has none
+    """
+    if "source_transcript" in state:
+        # Stored before only the redacted text was kept
+        return state["source_transcript"]
+    text = state.get("redacted_transcript", "")
+    if not state.get("redactions"):
+        return text
+    return Redaction(text, state["redactions"]).restore(text)
+
+
+def state_model_transcript(state: Dict[str, Any]) -> str:
+    """
+    Transcript text the model works from for a stored state (redacted, and reduced if that was done)
+
+    Args:
+        state: Pipeline state
+
+    Returns:
+        Model-side transcript text
+    """
+    if state.get("transcript"):
+        return state["transcript"]
+    return TranscriptIndex(state.get("redacted_transcript", "")).compact()
+
+
+class PipelineStateStore:
+    """File-backed store for per-summary pipeline state (transcript, chunk analyses, metadata)"""
+
+    def __init__(self, directory: str, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        """
+        Initialize the store
+
+        Args:
+            directory: Folder where state files are written
+            max_age_seconds: States (and their streams) not written for this long are deleted
+                (0 keeps them forever)
+        """
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self._last_cleanup = 0.0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, state_id: str, suffix: str = "json") -> str:
+        # Only accept ids we generated to keep lookups inside the store folder
+        if not STATE_ID_PATTERN.fullmatch(state_id or ""):
+            raise ValueError(f"Invalid pipeline state id: {state_id}")
+        return os.path.join(self.directory, f"{state_id}.{suffix}")
+
+    def save(self, state: Dict[str, Any], state_id: Optional[str] = None) -> str:
+        """
+        Save pipeline state
+
+        Args:
+            state: JSON-serializable pipeline state
+            state_id: Existing id to overwrite; a new id is generated if omitted
+
+        Returns:
+            The id the state was stored under
+        """
+        self._cleanup_if_due()
+        state_id = state_id or uuid.uuid4().hex
+        path = self._path(state_id)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, path)
+        return state_id
+
+    def load(self, state_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load pipeline state
+
+        Args:
+            state_id: Id returned by save()
+
+        Returns:
+            The stored state, or None if it no longer exists
+        """
+        try:
+            with open(self._path(state_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @contextmanager
+    def lock(self, state_id: str) -> Iterator[None]:
+        """
+        Hold an exclusive lock on a state across threads and worker processes
+
+        Hold it around load() and the update so the state is not read stale. The lock is a
+        file next to the state and is deleted with it; an id with no stored state is not
+        locked, so unknown ids leave nothing behind.
+
+        Args:
+            state_id: Id of the state to lock
+        """
+        if not STATE_ID_PATTERN.fullmatch(state_id or "") or not os.path.exists(self._path(state_id)):
+            yield
+            return
+        if fcntl is None:
+            with _process_lock:
+                yield
+            return
+        # Each open() gets its own lock, so threads of one process exclude each other too
+        with open(self._path(state_id, "lock"), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def append_text(self, state_id: str, name: str, text: str) -> int:
+        """
+        Append to a text stream stored next to the state (e.g. a growing live transcript)
+
+        Appending writes only the new text, so the cost does not grow with the stream.
+
+        Args:
+            state_id: Id of the state the stream belongs to
+            name: Stream name (letters only)
+            text: Text to append
+
+        Returns:
+            Size of the stream in bytes after the append
+        """
+        with open(self._stream_path(state_id, name), 'ab') as f:
+            f.write(text.encode('utf-8'))
+            return f.tell()
+
+    def read_text(self, state_id: str, name: str, start: int = 0) -> str:
+        """
+        Read a text stream from a byte offset
+
+        Args:
+            state_id: Id of the state the stream belongs to
+            name: Stream name
+            start: Byte offset to start reading from, as returned by append_text
+
+        Returns:
+            The text from start to the end of the stream, or an empty string if there is none
+        """
+        try:
+            with open(self._stream_path(state_id, name), 'rb') as f:
+                f.seek(start)
+                return f.read().decode('utf-8')
+        except FileNotFoundError:
+            return ""
+
+    def _stream_path(self, state_id: str, name: str) -> str:
+        if not name.isalpha():
+            raise ValueError(f"Invalid stream name: {name}")
+        return self._path(state_id, f"{name}.txt")
+
+    def _cleanup_if_due(self) -> None:
+        now = time.time()
+        if self.max_age_seconds and now - self._last_cleanup >= CLEANUP_INTERVAL_SECONDS:
+            self._last_cleanup = now
+            self.cleanup()
+
+    def cleanup(self) -> int:
+        """
+        Delete states whose files have all gone unwritten for longer than the maximum age
+
+        Returns:
+            Number of states deleted
+        """
+        if not self.max_age_seconds:
+            return 0
+        # Group a state's JSON, streams and leftover temp files by id; the newest write keeps them all
+        files: Dict[str, list] = {}
+        newest: Dict[str, float] = {}
+        for name in os.listdir(self.directory):
+            match = STATE_ID_PATTERN.match(name)
+            if not match:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                modified = os.path.getmtime(path)
+            except FileNotFoundError:
+                continue
+            files.setdefault(match.group(), []).append(path)
+            newest[match.group()] = max(newest.get(match.group(), 0.0), modified)
+
+        cutoff = time.time() - self.max_age_seconds
+        deleted = 0
+        for state_id, paths in files.items():
+            if newest[state_id] >= cutoff:
+                continue
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            deleted += 1
+        if deleted:
+            print(f"Deleted {deleted} expired pipeline states")
+        return deleted
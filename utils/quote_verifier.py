@@ -0,0 +1,58 @@
+from typing import Dict, Any, List, Optional
+from utils.ngram_index import NGramIndex
+
+# Share of a quote's word n-grams that must be found together for it to count as verified
+VERIFIED_SCORE = 0.8
+
+
+def verify_quotes(quotes: List[Any], ngram_index: NGramIndex) -> List[Any]:
+    """
+    Check key quotes against the source transcript
+
+    Each quote dictionary is annotated in place with:
+        verified: True if the quote (allowing for fillers, case and punctuation) is in the transcript
+        match_score: Share of the quote's n-grams found at the best matching location (0-1)
+        exact: True if every word matched in order
+        offset: Character offset of the best match in the transcript, or None
+
+    Args:
+        quotes: key_quotes list from the structured summary
+        ngram_index: Index of the original transcript
+
+    Returns:
+        The same list, for convenience
+    """
+    verified_count = 0
+    for quote in quotes:
+        if not isinstance(quote, dict) or not quote.get("quote"):
+            continue
+
+        match = ngram_index.find(quote["quote"])
+        quote["match_score"] = match["score"] if match else 0.0
+        quote["exact"] = bool(match and match["exact"])
+        quote["offset"] = match["start"] if match else None
+        quote["verified"] = quote["match_score"] >= VERIFIED_SCORE
+        if quote["verified"]:
+            verified_count += 1
+
+    print(f"Verified {verified_count} of {len(quotes)} key quotes against the transcript")
+    return quotes
+
+
+def quote_verification_label(quote: Dict[str, Any]) -> Optional[str]:
+    """
+    Short label describing a quote's verification result
+
+    Args:
+        quote: Quote dictionary annotated by verify_quotes
+
+    Returns:
+        Label text, or None if the quote was never checked
+    """
+    if "verified" not in quote:
+        return None
+    if quote.get("exact"):
+        return "Verified"
+    if quote["verified"]:
+        return f"Close match ({int(quote['match_score'] * 100)}%)"
+    return "Not found in transcript"
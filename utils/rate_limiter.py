@@ -0,0 +1,170 @@
+import os
+import random
+import sqlite3
+import time
+from typing import Dict, Optional, Tuple
+
+from utils.deadline import Deadline, DeadlineExceeded
+
+# Priority classes: the web form, JSON API clients (live meetings, search), and bulk jobs
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_API = "api"
+PRIORITY_BATCH = "batch"
+
+# Share of each bucket batch callers must leave untouched, so backfills never starve interactive users
+DEFAULT_BATCH_RESERVE = 0.25
+
+# Longest single sleep while waiting; waiters re-check often so freed capacity is picked up quickly
+MAX_POLL_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    level REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SharedRateLimiter:
+    """
+    Request and token rate limits shared by every process on the host
+
+    Two token buckets (requests per minute and tokens per minute) live in a small SQLite
+    file, so gunicorn workers and batch jobs draw from the same budget. Updates run in
+    an IMMEDIATE transaction, which makes each acquire atomic across processes.
+    """
+
+    def __init__(self, path: str, requests_per_minute: int = 0, tokens_per_minute: int = 0,
+                 batch_reserve: float = DEFAULT_BATCH_RESERVE, name: str = ""):
+        """
+        Initialize the limiter
+
+        Args:
+            path: SQLite file holding the shared buckets
+            requests_per_minute: Request limit (0 for no limit)
+            tokens_per_minute: Token limit, prompt plus max completion tokens (0 for no limit)
+            batch_reserve: Share of each bucket that batch callers may not use
+            name: Optional name keeping these buckets apart from other limiters in the same file
+                (e.g. one per API key)
+        """
+        self.path = path
+        self.bucket_prefix = f"{name}:" if name else ""
+        self.limits = {
+            "requests": float(requests_per_minute),
+            "tokens": float(tokens_per_minute),
+        }
+        self.batch_reserve = batch_reserve
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+    def __bool__(self) -> bool:
+        return any(self.limits.values())
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode so BEGIN IMMEDIATE is under our control
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def acquire(self, tokens: int, priority: str = PRIORITY_INTERACTIVE,
+                deadline: Optional[Deadline] = None) -> float:
+        """
+        Wait until one request of the given size fits in the shared limits, then take it
+
+        Args:
+            tokens: Tokens the request may use (prompt estimate plus max completion tokens)
+            priority: Priority class of the call; batch callers leave a reserve
+            deadline: Optional request deadline; waiting past it raises DeadlineExceeded
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            DeadlineExceeded: If the capacity does not free up before the deadline
+        """
+        if not self:
+            return 0.0
+
+        needed, reserve = self._needed(tokens, priority)
+        started = time.monotonic()
+        connection = self._connect()
+        try:
+            while True:
+                wait = self._try_take(connection, needed, reserve)
+                if wait <= 0:
+                    waited = time.monotonic() - started
+                    if waited > 1:
+                        print(f"Waited {waited:.1f}s for the shared OpenAI rate limit ({priority})")
+                    return waited
+
+                if deadline is not None and deadline.remaining() < wait:
+                    raise DeadlineExceeded("Shared OpenAI rate limit would not free up before the deadline")
+                # Jitter keeps waiting processes from polling in lockstep
+                time.sleep(min(wait, MAX_POLL_SECONDS) * random.uniform(0.8, 1.2))
+        finally:
+            connection.close()
+
+    def try_acquire(self, tokens: int, priority: str = PRIORITY_INTERACTIVE) -> float:
+        """
+        Take capacity for one request if it is available now, without waiting
+
+        Args:
+            tokens: Tokens the request may use
+            priority: Priority class of the call
+
+        Returns:
+            0 if the capacity was taken, otherwise the seconds until it should be available
+        """
+        if not self:
+            return 0.0
+        connection = self._connect()
+        try:
+            return self._try_take(connection, *self._needed(tokens, priority))
+        finally:
+            connection.close()
+
+    def _needed(self, tokens: int, priority: str) -> Tuple[Dict[str, float], float]:
+        """Capacity one request takes from each bucket, and the reserve it must leave"""
+        reserve = self.batch_reserve if priority == PRIORITY_BATCH else 0.0
+        # A request larger than the whole bucket could never fit; let it through when the bucket is full
+        needed = {
+            "requests": 1.0,
+            "tokens": min(float(tokens), self.limits["tokens"] * (1 - reserve)),
+        }
+        return needed, reserve
+
+    def _try_take(self, connection: sqlite3.Connection, needed: Dict[str, float], reserve: float) -> float:
+        """Take capacity if available; otherwise return the seconds until it should be"""
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            levels = {}
+            wait = 0.0
+            for name, limit in self.limits.items():
+                if not limit:
+                    continue
+                row = connection.execute("SELECT level, updated_at FROM buckets WHERE name = ?",
+                                         (self.bucket_prefix + name,)).fetchone()
+                level = limit if row is None else min(limit, row[0] + (now - row[1]) * limit / 60.0)
+                levels[name] = level
+
+                shortfall = needed[name] + limit * reserve - level
+                if shortfall > 0:
+                    wait = max(wait, shortfall * 60.0 / limit)
+
+            if wait <= 0:
+                for name, level in levels.items():
+                    connection.execute(
+                        "INSERT OR REPLACE INTO buckets (name, level, updated_at) VALUES (?, ?, ?)",
+                        (self.bucket_prefix + name, level - needed[name], now)
+                    )
+            connection.execute("COMMIT")
+            return wait
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
@@ -0,0 +1,273 @@
+import re
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+try:
+    import ahocorasick  # pyahocorasick; optional, a compiled regex is used without it
+except ImportError:
+    ahocorasick = None
+
+# Built-in patterns. Each match must contain an "@" or a run of MIN_DIGIT_RUN digits, so they are only
+# run near those triggers (see _candidate_windows); other patterns are run over the whole text.
+DEFAULT_PATTERNS = {
+    "EMAIL": r"[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}",
+    "SSN": r"(?<!\d)\d{3}[- ]\d{2}[- ]\d{4}(?!\d)",
+    "PHONE": r"(?<![\d-])(?:\+?1[-. ]?)?(?:\(\d{3}\)|\d{3})[-. ]?\d{3}[-. ]\d{4}(?!\d)",
+}
+
+# Label used for dictionary terms (claimant names, case numbers, ...)
+DICTIONARY_LABEL = "NAME"
+
+# Built-in pattern matches are only looked for around these triggers, which keeps the scan near memory speed
+MIN_DIGIT_RUN = 3
+TRIGGER_WINDOW = 100
+DIGIT_FOLD = str.maketrans("123456789", "000000000")
+DIGIT_RUN_PATTERN = re.compile("0" * MIN_DIGIT_RUN)
+AT_SIGN_PATTERN = re.compile("@")
+
+PLACEHOLDER_PATTERN = re.compile(r"\[?\b([A-Z][A-Z_]*)_(\d+)\b\]?")
+
+
+class Redaction:
+    """Redacted transcript text and the placeholders needed to restore it"""
+
+    def __init__(self, text: str, placeholders: Dict[str, str]):
+        """
+        Args:
+            text: Redacted text
+            placeholders: Mapping of placeholder (e.g. "[PHONE_1]") to the original value
+        """
+        self.text = text
+        self.placeholders = placeholders
+        self._by_value = {value.lower(): placeholder for placeholder, value in placeholders.items()}
+
+    def __len__(self) -> int:
+        return len(self.placeholders)
+
+    def restore(self, text: str) -> str:
+        """
+        Put the original values back into model output
+
+        Placeholders are matched with or without their brackets, since models sometimes drop them.
+
+        Args:
+            text: Text containing placeholders
+
+        Returns:
+            Text with every known placeholder replaced by its original value
+        """
+        if not self.placeholders:
+            return text
+
+        def replace(match):
+            return self.placeholders.get(f"[{match.group(1)}_{match.group(2)}]", match.group())
+
+        return PLACEHOLDER_PATTERN.sub(replace, text)
+
+    def apply(self, text: str) -> str:
+        """
+        Replace values already redacted from the transcript wherever they appear in a short text
+
+        Used for derived text such as locally extracted speaker names.
+
+        Args:
+            text: Text that may contain redacted values
+
+        Returns:
+            Text with those values replaced by their placeholders
+        """
+        lowered = text.lower()
+        for value in sorted(self._by_value, key=len, reverse=True):
+            start = lowered.find(value)
+            while start != -1:
+                placeholder = self._by_value[value]
+                text = text[:start] + placeholder + text[start + len(value):]
+                lowered = lowered[:start] + placeholder.lower() + lowered[start + len(value):]
+                start = lowered.find(value, start + len(placeholder))
+        return text
+
+
+class Redactor:
+    """Finds PII with a dictionary automaton plus one combined regex and swaps it for placeholders"""
+
+    def __init__(self, terms: Iterable[str] = (), patterns: Optional[Dict[str, str]] = None):
+        """
+        Compile the matchers once
+
+        Args:
+            terms: Dictionary of values to redact wherever they appear as whole words (case-insensitive)
+            patterns: Mapping of label to regex; defaults to DEFAULT_PATTERNS
+        """
+        self.terms = sorted({term.strip().lower() for term in terms if term.strip()}, key=len, reverse=True)
+        self.patterns = dict(DEFAULT_PATTERNS if patterns is None else patterns)
+
+        # One pass finds every pattern of a kind: each label is a named group of one regex. Unchanged
+        # built-in patterns are only run near their triggers; configured ones must see all of the text.
+        triggered = {label: pattern for label, pattern in self.patterns.items()
+                     if DEFAULT_PATTERNS.get(label) == pattern}
+        untriggered = {label: pattern for label, pattern in self.patterns.items() if label not in triggered}
+        self._pattern_regex = self._combine(triggered)
+        self._full_text_regex = self._combine(untriggered)
+
+        self._automaton = None
+        self._terms_regex = None
+        if self.terms and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                self._automaton.add_word(term, len(term))
+            self._automaton.make_automaton()
+        elif self.terms:
+            self._terms_regex = re.compile(
+                r"\b(?:" + "|".join(re.escape(term) for term in self.terms) + r")\b", re.IGNORECASE
+            )
+
+    @staticmethod
+    def _combine(patterns: Dict[str, str]) -> Optional["re.Pattern"]:
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?P<{label}>{pattern})" for label, pattern in patterns.items()))
+
+    def __bool__(self) -> bool:
+        return bool(self.terms or self.patterns)
+
+    def redact(self, text: str, placeholders: Optional[Dict[str, str]] = None) -> Redaction:
+        """
+        Redact a transcript
+
+        Args:
+            text: Original transcript text
+            placeholders: Placeholders already handed out for earlier parts of the same
+                transcript (e.g. previous live deltas); known values reuse them and new
+                values continue their numbering
+
+        Returns:
+            Redaction with the redacted text and the placeholder mapping; a value that
+            appears several times always gets the same placeholder
+        """
+        placeholders = dict(placeholders or {})
+        matches = self._dictionary_matches(text) + self._pattern_matches(text)
+        if not matches:
+            return Redaction(text, placeholders)
+
+        # Earliest match first; on overlap keep the longer one
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+
+        pieces = []
+        append = pieces.append
+        by_value: Dict[Tuple[str, str], str] = {}
+        counters: Dict[str, int] = {}
+        for placeholder, value in placeholders.items():
+            match = PLACEHOLDER_PATTERN.fullmatch(placeholder)
+            if match:
+                label, number = match.group(1), int(match.group(2))
+                by_value[(label, value.lower())] = placeholder
+                counters[label] = max(counters.get(label, 0), number)
+        added: Dict[str, int] = {}
+        position = 0
+        for start, end, label in matches:
+            if start < position:
+                continue
+            value = text[start:end]
+            key = (label, value.lower())
+            placeholder = by_value.get(key)
+            if placeholder is None:
+                counters[label] = counters.get(label, 0) + 1
+                added[label] = added.get(label, 0) + 1
+                placeholder = f"[{label}_{counters[label]}]"
+                by_value[key] = placeholder
+                placeholders[placeholder] = value
+            append(text[position:start])
+            append(placeholder)
+            position = end
+        append(text[position:])
+
+        redacted = "".join(pieces)
+        summary = ", ".join(f"{count} {label}" for label, count in sorted(added.items()))
+        print(f"Redacted {sum(added.values())} distinct values ({summary})")
+        return Redaction(redacted, placeholders)
+
+    def _dictionary_matches(self, text: str) -> List[Tuple[int, int, str]]:
+        if self._automaton is not None:
+            lowered = text.lower()
+            # Lower-casing can change the length of some non-ASCII text; offsets must line up
+            if len(lowered) == len(text):
+                matches = []
+                length_of_text = len(lowered)
+                # Every match, kept only when it is a whole word; redact() keeps the longest on overlap
+                for last, length in self._automaton.iter(lowered):
+                    start, end = last - length + 1, last + 1
+                    if (start == 0 or not lowered[start - 1].isalnum()) and \
+                            (end == length_of_text or not lowered[end].isalnum()):
+                        matches.append((start, end, DICTIONARY_LABEL))
+                return matches
+            if self._terms_regex is None:
+                self._terms_regex = re.compile(
+                    r"\b(?:" + "|".join(re.escape(term) for term in self.terms) + r")\b", re.IGNORECASE
+                )
+
+        if self._terms_regex is not None:
+            return [(match.start(), match.end(), DICTIONARY_LABEL) for match in self._terms_regex.finditer(text)]
+        return []
+
+    def _pattern_matches(self, text: str) -> List[Tuple[int, int, str]]:
+        matches = []
+        if self._pattern_regex is not None:
+            for window_start, window_end in self._candidate_windows(text):
+                for match in self._pattern_regex.finditer(text, window_start, window_end):
+                    matches.append((match.start(), match.end(), match.lastgroup))
+        if self._full_text_regex is not None:
+            for match in self._full_text_regex.finditer(text):
+                matches.append((match.start(), match.end(), match.lastgroup))
+        return matches
+
+    def _candidate_windows(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Find the stretches of text worth running the patterns on
+
+        Digits are folded to "0" so runs of digits and "@" can be found with literal
+        searches, which are far faster than letting the regex engine try every position.
+        """
+        folded = text.translate(DIGIT_FOLD)
+        triggers = sorted(
+            [match.start() for match in DIGIT_RUN_PATTERN.finditer(folded)] +
+            [match.start() for match in AT_SIGN_PATTERN.finditer(text)]
+        )
+
+        windows: List[List[int]] = []
+        for trigger in triggers:
+            start = max(0, trigger - TRIGGER_WINDOW)
+            end = min(len(text), trigger + TRIGGER_WINDOW)
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], end)
+            else:
+                windows.append([start, end])
+
+        # Do not cut a value in half at the window edges
+        for window in windows:
+            while window[0] > 0 and not text[window[0] - 1].isspace():
+                window[0] -= 1
+            while window[1] < len(text) and not text[window[1]].isspace():
+                window[1] += 1
+        return [(start, end) for start, end in windows]
+
+
+def load_redactor(terms_text: str = "", terms_file: Optional[str] = None,
+                  patterns: Optional[Dict[str, Any]] = None) -> Redactor:
+    """
+    Build a Redactor from configuration
+
+    Args:
+        terms_text: Comma-separated dictionary terms
+        terms_file: Optional path to a file with one dictionary term per line
+        patterns: Optional extra or replacement patterns by label, merged over DEFAULT_PATTERNS
+
+    Returns:
+        Configured Redactor
+    """
+    terms = [term for term in terms_text.split(",") if term.strip()]
+    if terms_file:
+        with open(terms_file, 'r', encoding='utf-8') as f:
+            terms.extend(line for line in f.read().splitlines() if line.strip() and not line.startswith('#'))
+
+    merged_patterns = dict(DEFAULT_PATTERNS)
+    merged_patterns.update(patterns or {})
+    return Redactor(terms, merged_patterns)
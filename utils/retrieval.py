@@ -0,0 +1,188 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from utils.transcript_index import TranscriptIndex
+
+TERM_PATTERN = re.compile(r"[a-z][a-z0-9']*")
+
+# Target passage size; turns are grouped up to this length and longer turns are split
+PASSAGE_CHARS = 800
+
+# Standard BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# What each section looks for in the transcript. Sections without an entry (executive
+# summary, conversation flow, sentiment, gaps) need the whole meeting and are not retrieved for.
+SECTION_QUERIES = {
+    2: "my name is i'm i am with from team lead manager director head role introduce joining represent",
+    4: "agreed agree decided decision confirmed confirm approved approve final settled consensus go ahead "
+       "resolved conclude",
+    5: "will i'll we'll please action follow up send owner assign task deadline by next week friday "
+       "responsible take care schedule",
+    6: "question unclear unsure not sure open pending tbd figure out clarify unknown wonder whether "
+       "how why what",
+    7: "important believe strongly must need critical concern worried honestly frankly clearly",
+    10: "stands for means meaning acronym called term definition define",
+}
+
+
+def _terms(text: str) -> List[str]:
+    return TERM_PATTERN.findall(text.lower().replace("’", "'"))
+
+
+class PassageIndex:
+    """In-process BM25 index over transcript passages built from speaker turns"""
+
+    def __init__(self, transcript_index: TranscriptIndex, passage_chars: int = PASSAGE_CHARS):
+        """
+        Split the transcript into passages and index them
+
+        Args:
+            transcript_index: Speaker-turn index of the transcript to search
+            passage_chars: Target passage length in characters
+        """
+        self.transcript_index = transcript_index
+        # (turn, start, end) character spans; a passage may cover several turns
+        self.passages: List[Tuple[int, int, int]] = self._build_passages(passage_chars)
+        self._vocabulary: Dict[str, int] = {}
+        self._weights = self._bm25_weights()
+
+    def _build_passages(self, passage_chars: int) -> List[Tuple[int, int, int]]:
+        index = self.transcript_index
+        text = index.text
+        passages = []
+        current = None
+
+        for turn in range(len(index)):
+            start, end = index.turn_start[turn], index.turn_end[turn]
+
+            if current is not None and end - current[1] > passage_chars:
+                passages.append(tuple(current))
+                current = None
+
+            # Split long turns (or unlabeled paragraphs) at sentence or word boundaries
+            while end - start > passage_chars * 2:
+                sentence = text.rfind('. ', start, start + passage_chars)
+                cut = sentence if sentence > start else text.rfind(' ', start, start + passage_chars)
+                cut = cut + 1 if cut > start else start + passage_chars
+                passages.append((turn, start, cut))
+                start = cut
+
+            if current is None:
+                current = [turn, start, end]
+            else:
+                current[2] = end
+
+        if current is not None:
+            passages.append(tuple(current))
+        return passages
+
+    def _bm25_weights(self) -> sparse.csc_matrix:
+        """Passage-by-term BM25 weight matrix; a query's score is a sum of its columns"""
+        rows, cols = [], []
+        lengths = np.zeros(len(self.passages))
+        for row, (_, start, end) in enumerate(self.passages):
+            terms = _terms(self.transcript_index.text[start:end])
+            lengths[row] = len(terms)
+            for term in terms:
+                rows.append(row)
+                cols.append(self._vocabulary.setdefault(term, len(self._vocabulary)))
+
+        shape = (len(self.passages), max(1, len(self._vocabulary)))
+        counts = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+        counts.sum_duplicates()
+
+        passage_count = max(1, len(self.passages))
+        document_frequency = np.bincount(counts.indices, minlength=shape[1])
+        idf = np.log(1 + (passage_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        average_length = lengths.mean() if len(lengths) else 1.0
+        row_of_entry = np.repeat(np.arange(shape[0]), np.diff(counts.indptr))
+        tf = counts.data
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[row_of_entry] / max(average_length, 1e-9))
+        counts.data = idf[counts.indices] * tf * (BM25_K1 + 1) / (tf + norm)
+        return counts.tocsc()
+
+    def search(self, query: str) -> np.ndarray:
+        """
+        Score every passage against a query
+
+        Args:
+            query: Free-text query
+
+        Returns:
+            Array of BM25 scores, one per passage
+        """
+        columns = [self._vocabulary[term] for term in set(_terms(query)) if term in self._vocabulary]
+        if not columns:
+            return np.zeros(len(self.passages))
+        return np.asarray(self._weights[:, columns].sum(axis=1)).ravel()
+
+    def select(self, query: str, budget_chars: int) -> Optional[str]:
+        """
+        Pick the best-matching passages that fit in a character budget
+
+        Args:
+            query: Free-text query
+            budget_chars: Maximum total length of the selected passages
+
+        Returns:
+            Selected passages in transcript order with "[...]" marking gaps, or None
+            if the whole transcript already fits the budget
+        """
+        text = self.transcript_index.text
+        if len(text) <= budget_chars:
+            return None
+
+        scores = self.search(query)
+        chosen = []
+        used = 0
+        for position in np.argsort(-scores, kind='stable'):
+            if scores[position] <= 0:
+                break
+            _, start, end = self.passages[position]
+            if used + end - start > budget_chars:
+                continue
+            chosen.append(int(position))
+            used += end - start
+
+        pieces = []
+        previous = -1
+        for position in sorted(chosen):
+            turn, start, end = self.passages[position]
+            if position != previous + 1:
+                pieces.append("[...]")
+            passage = text[start:end].strip()
+            # A passage cut from the middle of a long turn still says who is speaking
+            speaker = self.transcript_index.speaker_name(turn)
+            if speaker and start > self.transcript_index.content_start[turn]:
+                passage = f"{speaker} (continued): {passage}"
+            pieces.append(passage)
+            previous = position
+        if previous != len(self.passages) - 1:
+            pieces.append("[...]")
+
+        return "\n".join(pieces)
+
+    def select_for_sections(self, sections: Tuple[int, ...], budget_chars: int,
+                            extra_terms: str = "") -> Optional[str]:
+        """
+        Select passages for a group of summary sections
+
+        Args:
+            sections: Section numbers generated together
+            budget_chars: Maximum total length of the selected passages
+            extra_terms: Additional query text, e.g. speaker names or acronyms found locally
+
+        Returns:
+            Selected passages, or None if any section needs the whole transcript or
+            the transcript already fits the budget
+        """
+        if any(number not in SECTION_QUERIES for number in sections):
+            return None
+        query = " ".join(SECTION_QUERIES[number] for number in sections) + " " + extra_terms
+        return self.select(query, budget_chars)
@@ -0,0 +1,152 @@
+import math
+from typing import Any, List
+
+import numpy as np
+
+from utils.ngram_index import NGramIndex, normalize_words
+from utils.transcript_index import TranscriptIndex
+
+# Words that say nothing about where in the transcript a scene is
+STOPWORDS = {
+    "the", "and", "for", "that", "this", "with", "was", "were", "are", "has", "have", "had", "been", "from",
+    "they", "their", "them", "there", "then", "than", "which", "who", "whom", "what", "when", "where", "how",
+    "also", "about", "into", "over", "after", "before", "while", "during", "other", "some", "such", "its",
+    "not", "but", "all", "any", "can", "could", "would", "should", "will", "may", "might", "one", "two",
+    "his", "her", "she", "him", "our", "you", "your", "these", "those", "more", "most", "very", "just",
+    "discussed", "discussion", "noted", "mentioned", "explained", "described", "conversation", "meeting",
+    "participants", "speaker", "speakers", "raised", "shared", "highlighted", "emphasized", "expressed",
+}
+
+# Transcript words per alignment unit
+WINDOW_WORDS = 50
+
+# Phrases (two consecutive content words) are stronger evidence than single words
+BIGRAM_WEIGHT = 1.5
+
+
+def _scene_terms(text: str) -> List[tuple]:
+    """Content words and adjacent content-word pairs of a scene"""
+    words = [word for word, _ in normalize_words(text)]
+    content = [word not in STOPWORDS and len(word) > 2 for word in words]
+
+    terms = {(word,) for word, keep in zip(words, content) if keep}
+    terms.update(
+        (words[i], words[i + 1]) for i in range(len(words) - 1) if content[i] and content[i + 1]
+    )
+    return list(terms)
+
+
+def align_scenes(scenes: List[Any], ngram_index: NGramIndex,
+                 transcript_index: TranscriptIndex) -> List[Any]:
+    """
+    Map Conversation Flow scenes to the transcript spans they summarize
+
+    The transcript is cut into fixed windows of words. Each scene scores every window
+    by the IDF-weighted words and word pairs they share, looked up in the n-gram index.
+    A monotonic segmentation (scenes keep their order and tile the transcript) is then
+    found with an O(scenes x windows) dynamic program.
+
+    Each scene dictionary is annotated in place with an "anchor":
+        start/end: Character offsets of the span in the original transcript
+        turn, speaker, timestamp, timestamp_label: The speaker turn where the span starts
+        confidence: Share of the scene's evidence that falls inside its span (0-1)
+
+    Args:
+        scenes: detailed_summary list from the structured summary
+        ngram_index: Index of the original transcript
+        transcript_index: Speaker-turn index of the same transcript
+
+    Returns:
+        The same list, for convenience
+    """
+    scene_items = [scene for scene in scenes if isinstance(scene, dict)]
+    word_count = len(ngram_index)
+    if not scene_items or word_count < len(scene_items):
+        return scenes
+
+    window = max(1, min(WINDOW_WORDS, word_count // len(scene_items)))
+    unit_count = math.ceil(word_count / window)
+
+    # scores[s, u]: how strongly window u matches scene s, normalized per scene
+    scores = np.zeros((len(scene_items), unit_count))
+    document_frequency = {}
+    for row, scene in enumerate(scene_items):
+        text = f"{scene.get('title', '')} {scene.get('content', '')}"
+        for term in _scene_terms(text):
+            if term not in document_frequency:
+                if len(term) == 1:
+                    positions = np.frombuffer(ngram_index.word_positions(term[0]), dtype=np.int32)
+                else:
+                    positions = np.asarray(ngram_index.ngram_positions(term), dtype=np.int64)
+                counts = np.bincount(positions // window, minlength=unit_count) if positions.size else None
+                document_frequency[term] = counts
+            counts = document_frequency[term]
+            if counts is None:
+                continue
+
+            idf = math.log(unit_count / np.count_nonzero(counts))
+            if idf <= 0:
+                continue
+            weight = idf * (BIGRAM_WEIGHT if len(term) > 1 else 1.0)
+            scores[row] += weight * np.log1p(counts)
+
+        total = scores[row].sum()
+        if total > 0:
+            scores[row] /= total
+
+    boundaries = _segment(scores)
+
+    for row, scene in enumerate(scene_items):
+        first_unit, last_unit = boundaries[row], boundaries[row + 1]
+        first_word = first_unit * window
+        last_word = min(last_unit * window, word_count) - 1
+        start = ngram_index.word_start[first_word]
+
+        anchor = transcript_index.turn_info(transcript_index.turn_at(start)) if len(transcript_index) else {}
+        anchor.update({
+            "start": start,
+            "end": ngram_index.word_end[last_word],
+            "confidence": round(float(scores[row, first_unit:last_unit].sum()), 2),
+        })
+        scene["anchor"] = anchor
+
+    print(f"Anchored {len(scene_items)} scenes to the transcript over {unit_count} windows")
+    return scenes
+
+
+def _segment(scores: np.ndarray) -> List[int]:
+    """
+    Split windows into consecutive non-empty segments, one per scene, maximizing the total score
+
+    Args:
+        scores: Scene-by-window score matrix
+
+    Returns:
+        Segment boundaries: scene s covers windows [b[s], b[s + 1])
+    """
+    scene_count, unit_count = scores.shape
+
+    # cumulative[s, t] = score of windows [0, t) for scene s
+    cumulative = np.zeros((scene_count, unit_count + 1))
+    np.cumsum(scores, axis=1, out=cumulative[:, 1:])
+
+    # best[s, t]: best total for scenes 0..s covering windows [0, t); choice[s, t]: where scene s starts
+    best = np.full((scene_count, unit_count + 1), -np.inf)
+    choice = np.zeros((scene_count, unit_count + 1), dtype=np.int64)
+    best[0, 1:] = cumulative[0, 1:]
+
+    positions = np.arange(unit_count + 1)
+    for scene in range(1, scene_count):
+        # Scene starts at b: best[scene - 1, b] - cumulative[scene, b], maximized over b < t
+        candidates = best[scene - 1] - cumulative[scene]
+        running_max = np.maximum.accumulate(candidates)
+        running_arg = np.maximum.accumulate(np.where(candidates == running_max, positions, 0))
+
+        best[scene, 1:] = running_max[:-1] + cumulative[scene, 1:]
+        choice[scene, 1:] = running_arg[:-1]
+
+    boundaries = [unit_count]
+    for scene in range(scene_count - 1, 0, -1):
+        boundaries.append(int(choice[scene, boundaries[-1]]))
+    boundaries.append(0)
+    return boundaries[::-1]
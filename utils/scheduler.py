@@ -0,0 +1,172 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.rate_limiter import PRIORITY_INTERACTIVE, PRIORITY_API, PRIORITY_BATCH
+
+# Share of the call slots each class gets while every class has work waiting
+DEFAULT_CLASS_WEIGHTS = {PRIORITY_INTERACTIVE: 6, PRIORITY_API: 3, PRIORITY_BATCH: 1}
+
+# Recent waits kept per class for the latency percentiles
+WAIT_SAMPLES = 500
+
+# Priority of the work running in the current context (a web request, or threads it starts);
+# None falls back to the priority of the helper making the call
+request_priority: contextvars.ContextVar = contextvars.ContextVar("request_priority", default=None)
+
+
+def _percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class _Waiter:
+    __slots__ = ("priority", "finish_tag", "granted")
+
+    def __init__(self, priority: str, finish_tag: float):
+        self.priority = priority
+        self.finish_tag = finish_tag
+        self.granted = False
+
+
+class PriorityScheduler:
+    """
+    Weighted fair queuing of upstream calls between priority classes
+
+    A fixed number of call slots is shared by the classes in proportion to their weights
+    (self-clocked fair queuing: each call is tagged with its class's virtual finish time,
+    cost divided by weight, and the smallest tag goes next). Reserved slots are kept free
+    for a class even while it is idle, so a burst of bulk work cannot take every slot.
+    Calls of one class run in arrival order.
+
+    The slots are counted within one process: web workers and batch jobs each have their own
+    scheduler and do not queue behind each other. Across processes only the shared rate limits
+    (with their batch reserve) keep bulk work from crowding out interactive calls.
+    """
+
+    def __init__(self, slots: int, weights: Optional[Dict[str, float]] = None,
+                 reserved: Optional[Dict[str, int]] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            slots: Calls in flight at once across all classes
+            weights: Relative share per class (defaults to DEFAULT_CLASS_WEIGHTS)
+            reserved: Slots only the given class may use, e.g. {"interactive": 2}
+
+        Raises:
+            ValueError: If the reserved slots leave none for the other classes
+        """
+        self.slots = max(1, slots)
+        self.weights = dict(DEFAULT_CLASS_WEIGHTS)
+        self.weights.update(weights or {})
+        self.reserved = {name: count for name, count in (reserved or {}).items() if count > 0}
+        if sum(self.reserved.values()) >= self.slots:
+            raise ValueError(f"Reserved call slots ({sum(self.reserved.values())}) must be fewer than "
+                             f"the total ({self.slots})")
+
+        self._condition = threading.Condition()
+        self._queues: Dict[str, deque] = {name: deque() for name in self.weights}
+        self._running: Dict[str, int] = {name: 0 for name in self.weights}
+        self._last_finish: Dict[str, float] = {name: 0.0 for name in self.weights}
+        self._virtual_time = 0.0
+        self._served: Dict[str, int] = {name: 0 for name in self.weights}
+        self._timeouts: Dict[str, int] = {name: 0 for name in self.weights}
+        self._waits: Dict[str, deque] = {name: deque(maxlen=WAIT_SAMPLES) for name in self.weights}
+
+    def _can_start(self, priority: str) -> bool:
+        """True if a slot is free once the other classes' unused reservations are set aside"""
+        held_back = sum(max(0, count - self._running[name])
+                        for name, count in self.reserved.items() if name != priority)
+        return sum(self._running.values()) + held_back < self.slots
+
+    def _dispatch(self) -> None:
+        """Grant free slots to the waiting calls with the smallest finish tags"""
+        while True:
+            candidates = [queue[0] for name, queue in self._queues.items() if queue and self._can_start(name)]
+            if not candidates:
+                return
+            waiter = min(candidates, key=lambda candidate: candidate.finish_tag)
+            self._queues[waiter.priority].popleft()
+            self._running[waiter.priority] += 1
+            self._virtual_time = waiter.finish_tag
+            waiter.granted = True
+
+    @contextmanager
+    def slot(self, priority: str, cost: float = 1.0, deadline: Optional[Deadline] = None) -> Iterator[float]:
+        """
+        Hold a call slot for the duration of the block
+
+        Args:
+            priority: Priority class of the call (unknown classes are treated as batch)
+            cost: Relative size of the call, e.g. its estimated tokens in thousands
+            deadline: Optional request deadline; waiting past it raises DeadlineExceeded
+
+        Yields:
+            Seconds spent waiting for the slot
+
+        Raises:
+            DeadlineExceeded: If no slot frees up before the deadline
+        """
+        if priority not in self.weights:
+            priority = PRIORITY_BATCH
+        started = time.monotonic()
+        with self._condition:
+            start_tag = max(self._virtual_time, self._last_finish[priority])
+            waiter = _Waiter(priority, start_tag + max(cost, 0.001) / self.weights[priority])
+            self._last_finish[priority] = waiter.finish_tag
+            self._queues[priority].append(waiter)
+            self._dispatch()
+
+            while not waiter.granted:
+                timeout = None if deadline is None else deadline.remaining()
+                if timeout is not None and timeout <= 0:
+                    self._queues[priority].remove(waiter)
+                    self._timeouts[priority] += 1
+                    # Our place in line may have held up calls behind us
+                    self._dispatch()
+                    self._condition.notify_all()
+                    raise DeadlineExceeded(f"No OpenAI call slot freed up before the deadline ({priority})")
+                self._condition.wait(timeout)
+
+            waited = time.monotonic() - started
+            self._served[priority] += 1
+            self._waits[priority].append(waited)
+
+        try:
+            yield waited
+        finally:
+            with self._condition:
+                self._running[priority] -= 1
+                self._dispatch()
+                self._condition.notify_all()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Queue and wait statistics per priority class
+
+        Returns:
+            Dictionary per class with weight, reserved slots, queued and running calls,
+            calls served and timed out, and wait time p50/p95/max in seconds over recent calls
+        """
+        with self._condition:
+            return {
+                name: {
+                    "weight": self.weights[name],
+                    "reserved": self.reserved.get(name, 0),
+                    "queued": len(self._queues[name]),
+                    "running": self._running[name],
+                    "served": self._served[name],
+                    "timed_out": self._timeouts[name],
+                    "wait_p50": round(_percentile(list(self._waits[name]), 0.5), 3),
+                    "wait_p95": round(_percentile(list(self._waits[name]), 0.95), 3),
+                    "wait_max": round(max(self._waits[name], default=0.0), 3),
+                }
+                for name in self.weights
+            }
@@ -0,0 +1,99 @@
+import html
+import re
+from typing import Dict, Any, List, Tuple
+
+# Summary sections indexed for search, one document per section
+SEARCH_SECTIONS = (
+    "executive_summary",
+    "participants",
+    "detailed_summary",
+    "decisions_made",
+    "actions_planned",
+    "open_questions",
+    "key_quotes",
+    "sentiment_analysis",
+    "content_gaps",
+    "terminology",
+)
+
+# Section name of the optional compacted-transcript document
+TRANSCRIPT_SECTION = "transcript"
+
+# Match markers in snippets; control characters cannot clash with (or inject into) the text
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+
+QUERY_TERM_PATTERN = re.compile(r'"[^"]+"|[\w\'-]+\*?', re.UNICODE)
+
+
+def _section_text(value: Any) -> str:
+    """Flatten a structured summary section into plain text, skipping non-text annotations"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " | ".join(item for item in value.values() if isinstance(item, str) and item)
+    if isinstance(value, list):
+        return "\n".join(text for text in (_section_text(item) for item in value) if text)
+    return ""
+
+
+def summary_documents(summary: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Split a structured summary into searchable documents
+
+    Args:
+        summary: Structured summary returned by SummaryGenerator.generate()
+
+    Returns:
+        List of (section, text) pairs for the non-empty sections
+    """
+    documents = []
+    for section in SEARCH_SECTIONS:
+        text = _section_text(summary.get(section)).strip()
+        if text:
+            documents.append((section, text))
+    return documents
+
+
+def build_match_query(text: str) -> str:
+    """
+    Turn free text typed by a user into a safe FTS5 MATCH expression
+
+    Every word must match (implicit AND). "Quoted phrases" are kept as phrases and a
+    trailing * on a word is kept as a prefix search; all other FTS5 syntax is escaped.
+
+    Args:
+        text: Search box text
+
+    Returns:
+        MATCH expression, or an empty string if the text has no searchable words
+    """
+    terms = []
+    for token in QUERY_TERM_PATTERN.findall(text):
+        prefix = token.endswith("*") and not token.startswith('"')
+        words = token.strip('"*').replace('"', ' ').strip()
+        if not words:
+            continue
+        terms.append(f'"{words}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def snippet_html(snippet: str) -> str:
+    """
+    Render a search snippet as HTML with the matches highlighted
+
+    Args:
+        snippet: Snippet returned by SummaryStore.search()
+
+    Returns:
+        Escaped HTML with each match wrapped in <mark>
+    """
+    pieces = []
+    for part in re.split(f"({SNIPPET_START}|{SNIPPET_END})", snippet):
+        if part == SNIPPET_START:
+            pieces.append("<mark>")
+        elif part == SNIPPET_END:
+            pieces.append("</mark>")
+        else:
+            pieces.append(html.escape(part, quote=False))
+    return "".join(pieces)
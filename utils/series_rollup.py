@@ -0,0 +1,120 @@
+import json
+import re
+from typing import Dict, Any, List
+
+# Structured summary lists carried into a series rollup, and the item key used to deduplicate each
+ROLLUP_FIELDS = {
+    "participants": "name",
+    "decisions_made": "decision",
+    "actions_planned": "action",
+    "open_questions": "question",
+}
+
+
+def _normalize_key(text: str) -> str:
+    """Lower-case and strip punctuation so near-identical entries compare equal"""
+    return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
+
+
+def empty_rollup() -> Dict[str, Any]:
+    """
+    Create an empty series rollup
+
+    Items are kept in dictionaries keyed by their normalized dedupe key, so adding a
+    meeting only touches that meeting's entries.
+
+    Returns:
+        Rollup dictionary with no meetings
+    """
+    rollup = {"meetings": []}
+    for field in ROLLUP_FIELDS:
+        rollup[field] = {}
+    return rollup
+
+
+def add_meeting_to_rollup(rollup: Dict[str, Any], meeting_id: int, title: str, date: str,
+                          summary: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge one meeting's parsed summary into a series rollup in place
+
+    Each item records the meetings it appeared in; repeated items keep their first
+    wording and take newer non-empty values (owner, timeline, ...) from later meetings.
+
+    Args:
+        rollup: Rollup returned by empty_rollup() or a previous call
+        meeting_id: Id of the stored meeting
+        title: Meeting title
+        date: Meeting date (ISO format sorts correctly)
+        summary: Structured summary returned by SummaryGenerator.generate()
+
+    Returns:
+        The same rollup, for convenience
+    """
+    if any(meeting["id"] == meeting_id for meeting in rollup["meetings"]):
+        return rollup
+    rollup["meetings"].append({"id": meeting_id, "title": title, "date": date})
+
+    for field, dedupe_key in ROLLUP_FIELDS.items():
+        entries = rollup[field]
+        for item in summary.get(field) or []:
+            if not isinstance(item, dict):
+                continue
+            key = _normalize_key(item.get(dedupe_key, ""))
+            # Skip empty rows and table separator rows
+            if not key:
+                continue
+
+            existing = entries.get(key)
+            if existing is None:
+                entries[key] = dict(item, meetings=[meeting_id], first_date=date, last_date=date)
+                continue
+
+            existing["meetings"].append(meeting_id)
+            if date and date >= (existing.get("last_date") or ""):
+                existing["last_date"] = date
+                for item_key, value in item.items():
+                    if value:
+                        existing[item_key] = value
+            else:
+                for item_key, value in item.items():
+                    if value and not existing.get(item_key):
+                        existing[item_key] = value
+    return rollup
+
+
+def rollup_items(rollup: Dict[str, Any], field: str) -> List[Dict[str, Any]]:
+    """
+    Items of one rollup field, most recently mentioned first
+
+    Args:
+        rollup: Series rollup
+        field: One of ROLLUP_FIELDS
+
+    Returns:
+        List of item dictionaries
+    """
+    items = list(rollup.get(field, {}).values())
+    items.sort(key=lambda item: item.get("last_date") or "", reverse=True)
+    return items
+
+
+def render_rollup(rollup: Dict[str, Any]) -> str:
+    """
+    Render a rollup compactly for the series report prompt
+
+    Args:
+        rollup: Series rollup
+
+    Returns:
+        Compact JSON text with empty values omitted
+    """
+    compact = {"meetings": [{"date": meeting["date"], "title": meeting["title"]} for meeting in rollup["meetings"]]}
+    for field in ROLLUP_FIELDS:
+        items = []
+        for item in rollup_items(rollup, field):
+            rendered = {key: value for key, value in item.items() if value and key != "meetings"}
+            rendered["mentions"] = len(item["meetings"])
+            items.append(rendered)
+        if items:
+            compact[field] = items
+    return json.dumps(compact, ensure_ascii=False, separators=(',', ':'))
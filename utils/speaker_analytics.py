@@ -0,0 +1,106 @@
+import re
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from utils.transcript_index import TranscriptIndex, NO_SPEAKER, NO_TIMESTAMP
+
+WORD_PATTERN = re.compile(r"[\w'’-]+")
+
+# A turn that trails off like this and is followed by another speaker counts as interrupted
+INTERRUPTED_ENDINGS = ("--", "—", "–", "...", "…")
+
+
+def compute_speaker_analytics(transcript_index: TranscriptIndex) -> Optional[Dict[str, Any]]:
+    """
+    Compute talk-time and interaction statistics for each speaker
+
+    Word counts come from one regex pass over the text, bucketed into turns with
+    searchsorted/bincount; matrices are accumulated with np.add.at.
+
+    Args:
+        transcript_index: Speaker-turn index of the transcript
+
+    Returns:
+        JSON-serializable analytics, or None when the transcript has no speaker labels
+    """
+    if not transcript_index.has_speakers:
+        return None
+
+    text = transcript_index.text
+    speaker_count = len(transcript_index.speakers)
+
+    turn_speaker = np.frombuffer(transcript_index.turn_speaker, dtype=np.int32).astype(np.int64)
+    turn_start = np.frombuffer(transcript_index.turn_start, dtype=np.int64)
+    content_start = np.frombuffer(transcript_index.content_start, dtype=np.int64)
+    turn_time = np.frombuffer(transcript_index.turn_time, dtype=np.int32).astype(np.int64)
+
+    # Assign every word to its turn, ignoring words inside speaker labels
+    word_offsets = np.fromiter((match.start() for match in WORD_PATTERN.finditer(text)), dtype=np.int64)
+    word_turn = np.searchsorted(turn_start, word_offsets, side='right') - 1
+    in_content = (word_turn >= 0) & (word_offsets >= content_start[np.clip(word_turn, 0, None)])
+    words_per_turn = np.bincount(word_turn[in_content], minlength=len(turn_start))
+
+    labeled = turn_speaker != NO_SPEAKER
+    speaker_ids = turn_speaker[labeled]
+    speaker_words = np.bincount(speaker_ids, weights=words_per_turn[labeled], minlength=speaker_count)
+    speaker_turns = np.bincount(speaker_ids, minlength=speaker_count)
+
+    # Talk time from timestamps when every labeled turn has one and they increase, else from words
+    labeled_times = turn_time[labeled]
+    if labeled_times.size > 1 and np.all(labeled_times != NO_TIMESTAMP) and np.all(np.diff(labeled_times) >= 0):
+        durations = np.diff(labeled_times).astype(np.float64)
+        # The last turn has no successor; estimate it from the median seconds per word
+        seconds_per_word = np.median(durations / np.maximum(words_per_turn[labeled][:-1], 1))
+        durations = np.append(durations, words_per_turn[labeled][-1] * seconds_per_word)
+        speaker_time = np.bincount(speaker_ids, weights=durations, minlength=speaker_count)
+        basis = "timestamps"
+    else:
+        speaker_time = speaker_words.astype(np.float64)
+        basis = "words"
+
+    total_time = speaker_time.sum()
+    talk_share = speaker_time / total_time if total_time > 0 else np.zeros(speaker_count)
+
+    # Consecutive labeled turns by different speakers: who responds to whom
+    previous_speaker = speaker_ids[:-1]
+    next_speaker = speaker_ids[1:]
+    handover = previous_speaker != next_speaker
+    adjacency = np.zeros((speaker_count, speaker_count), dtype=np.int64)
+    np.add.at(adjacency, (previous_speaker[handover], next_speaker[handover]), 1)
+
+    # Interruptions: a handover right after a turn that trails off mid-sentence
+    labeled_turns = np.flatnonzero(labeled)
+    cut_off = np.array(
+        [transcript_index.turn_text(turn).endswith(INTERRUPTED_ENDINGS) for turn in labeled_turns[:-1]],
+        dtype=bool
+    )
+    interrupted_mask = handover & cut_off
+    interruptions_made = np.bincount(next_speaker[interrupted_mask], minlength=speaker_count)
+    times_interrupted = np.bincount(previous_speaker[interrupted_mask], minlength=speaker_count)
+
+    speakers = []
+    for speaker_id, name in enumerate(transcript_index.speakers):
+        turns = int(speaker_turns[speaker_id])
+        words = int(speaker_words[speaker_id])
+        speakers.append({
+            "name": name,
+            "turns": turns,
+            "words": words,
+            "talk_share": round(float(talk_share[speaker_id]) * 100, 1),
+            "avg_words_per_turn": round(words / turns, 1) if turns else 0,
+            "interruptions_made": int(interruptions_made[speaker_id]),
+            "times_interrupted": int(times_interrupted[speaker_id]),
+        })
+    speakers.sort(key=lambda speaker: speaker["talk_share"], reverse=True)
+
+    return {
+        "basis": basis,
+        "total_words": int(speaker_words.sum()),
+        "total_turns": int(labeled.sum()),
+        "speakers": speakers,
+        "adjacency": {
+            "speakers": list(transcript_index.speakers),
+            "matrix": adjacency.tolist(),
+        },
+    }
@@ -1,23 +1,56 @@
-from typing import Dict, Any, List, Optional
-from utils.openai_helper import OpenAIHelper
+from typing import Dict, Any, List, Optional, Tuple
+from utils.openai_helper import OpenAIHelper, SECTION_TITLES
+from utils.deadline import Deadline
+from utils.transcript_analyzer import analyze_transcript
+from utils.transcript_index import TranscriptIndex
+from utils.speaker_analytics import compute_speaker_analytics
+from utils.ngram_index import NGramIndex
+from utils.quote_verifier import verify_quotes
+from utils.scene_aligner import align_scenes
+from utils.extractive import extractive_reduce
+from utils.redaction import Redaction
+from utils.live_session import LiveMeetingSession
+from utils.pipeline_state import state_source_transcript, state_model_transcript
 import re
 
+# Keys of the structured summary filled by each numbered markdown section
+SECTION_KEYS = {
+    1: "executive_summary",
+    2: "participants",
+    3: "detailed_summary",
+    4: "decisions_made",
+    5: "actions_planned",
+    6: "open_questions",
+    7: "key_quotes",
+    8: "sentiment_analysis",
+    9: "content_gaps",
+    10: "terminology",
+}
+
 
 class SummaryGenerator:
     """Generate structured meeting summaries from transcripts"""
 
-    def __init__(self, openai_helper: OpenAIHelper):
+    def __init__(self, openai_helper: OpenAIHelper, extractive_target_tokens: Optional[int] = None):
         """
         Initialize the summary generator
 
         Args:
             openai_helper: Instance of OpenAIHelper for API interactions
+            extractive_target_tokens: When set, transcripts longer than this many tokens are cut down
+                locally to their most central sentences (plus every decision/action sentence)
+                before they are sent to the model
         """
         self.openai_helper = openai_helper
+        self.extractive_target_tokens = extractive_target_tokens
 
     def generate(self, transcript: str, title: str = "",
                  date: str = "", duration: str = "",
-                 persona_prompt: str = "", context_prompt: str = "") -> Dict[str, Any]:
+                 persona_prompt: str = "", context_prompt: str = "",
+                 deadline: Optional[Deadline] = None,
+                 pipeline_state: Optional[Dict[str, Any]] = None,
+                 transcript_index: Optional[TranscriptIndex] = None,
+                 redaction: Optional[Redaction] = None) -> Dict[str, Any]:
         """
         Generate a structured meeting summary from a transcript
 
@@ -28,31 +61,341 @@ class SummaryGenerator:
             duration: Meeting duration
             persona_prompt: Custom persona instructions for the AI
             context_prompt: Additional context about the meeting
+            deadline: Optional request deadline; when it runs short the summary is flagged as partial
+            pipeline_state: Optional dictionary that receives the state needed to regenerate sections later
+            transcript_index: Speaker-turn index of the transcript, built here if not supplied
+            redaction: Optional PII redaction of the transcript; only the redacted text is sent to
+                the model and the placeholders are restored in the returned summary
 
         Returns:
             Dictionary containing all summary sections
         """
+        # Parse the transcript once; later stages reuse the same turn index
+        if transcript_index is None:
+            transcript_index = TranscriptIndex(transcript)
+
+        # Meeting dynamics are computed locally and never sent to the model
+        speaker_analytics = compute_speaker_analytics(transcript_index)
+
+        model_transcript, model_index, model_facts = self._prepare_model_input(
+            transcript, transcript_index, redaction, pipeline_state,
+            title, date, duration, persona_prompt, context_prompt
+        )
+
         # Use OpenAI to generate markdown summary
         markdown_summary = self.openai_helper.generate_structured_summary(
-            transcript=transcript,
+            transcript=model_transcript,
             title=title,
             date=date,
             duration=duration,
             persona_prompt=persona_prompt,
-            context_prompt=context_prompt
+            context_prompt=context_prompt,
+            deadline=deadline,
+            pipeline_state=pipeline_state,
+            transcript_facts=model_facts,
+            transcript_index=model_index
+        )
+
+        return self._finish_summary(markdown_summary, transcript, transcript_index,
+                                    speaker_analytics, redaction, deadline)
+
+    def _prepare_model_input(self, transcript: str, transcript_index: TranscriptIndex,
+                             redaction: Optional[Redaction],
+                             pipeline_state: Optional[Dict[str, Any]],
+                             title: str, date: str, duration: str,
+                             persona_prompt: str, context_prompt: str) -> Tuple[str, TranscriptIndex, Dict[str, Any]]:
+        """
+        Build what is sent to the model: the (redacted, optionally reduced) transcript and its facts
+
+        Args:
+            transcript: Original transcript text
+            transcript_index: Speaker-turn index of the original transcript
+            redaction: Optional PII redaction of the transcript
+            pipeline_state: Optional dictionary that receives the state needed to regenerate sections later
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            persona_prompt: Custom persona instructions for the AI
+            context_prompt: Additional context about the meeting
+
+        Returns:
+            Tuple of (model transcript, its turn index, transcript facts for the model)
+        """
+        # Find speakers and acronyms locally; the model only adds roles and definitions
+        transcript_facts = analyze_transcript(transcript, transcript_index)
+        print(f"Local analysis found {len(transcript_facts['speakers'])} speakers "
+              f"and {len(transcript_facts['acronyms'])} repeated acronyms")
+
+        # Everything sent upstream comes from the redacted text; local stages use the original
+        model_transcript = transcript
+        model_index = transcript_index
+        model_facts = transcript_facts
+        if redaction is not None and redaction.placeholders:
+            model_transcript = redaction.text
+            model_index = TranscriptIndex(redaction.text)
+            model_facts = self._redact_facts(transcript_facts, redaction)
+
+        # Optionally shrink very long transcripts so they fit a single model call; the local
+        # stages still see the full text
+        reduction = None
+        if self.extractive_target_tokens:
+            reduction = extractive_reduce(model_index, self.extractive_target_tokens)
+            if reduction:
+                model_transcript = reduction["transcript"]
+
+        if pipeline_state is not None:
+            # Only the redacted text is kept; the original is rebuilt from it and the placeholders
+            pipeline_state.update({
+                "transcript_facts": model_facts,
+                "redacted_transcript": model_index.text,
+                "redactions": redaction.placeholders if redaction is not None else {},
+                "title": title,
+                "date": date,
+                "duration": duration,
+                "persona_prompt": persona_prompt,
+                "context_prompt": context_prompt,
+            })
+            if reduction:
+                pipeline_state["transcript"] = model_transcript
+
+        return model_transcript, model_index, model_facts
+
+    def build_batch_requests(self, transcript: str, pipeline_state: Dict[str, Any],
+                             title: str = "", date: str = "", duration: str = "",
+                             persona_prompt: str = "", context_prompt: str = "",
+                             redaction: Optional[Redaction] = None) -> List[Dict[str, Any]]:
+        """
+        Prepare a transcript for offline batch summarization
+
+        Runs the same local stages as generate() and returns the map-phase requests instead
+        of sending them. Batch summaries always use the chunked map-reduce path.
+
+        Args:
+            transcript: The meeting transcript text
+            pipeline_state: Dictionary that receives the state the later batch stages need
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            persona_prompt: Custom persona instructions for the AI
+            context_prompt: Additional context about the meeting
+            redaction: Optional PII redaction of the transcript
+
+        Returns:
+            Chat request bodies, one per transcript chunk
+        """
+        model_transcript, model_index, _ = self._prepare_model_input(
+            transcript, TranscriptIndex(transcript), redaction, pipeline_state,
+            title, date, duration, persona_prompt, context_prompt
+        )
+        pipeline_state["model_chars"] = len(model_transcript)
+        return self.openai_helper.build_chunk_requests(
+            model_transcript, title, date, duration, context_prompt, model_index
+        )
+
+    def build_batch_consolidation_request(self, pipeline_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the reduce-phase request for a transcript whose chunk records are in pipeline_state
+
+        Args:
+            pipeline_state: State filled by build_batch_requests() plus the "chunk_analyses"
+
+        Returns:
+            Chat request body
+        """
+        return self.openai_helper.build_consolidation_request(
+            pipeline_state["chunk_analyses"],
+            title=pipeline_state["title"],
+            date=pipeline_state["date"],
+            duration=pipeline_state["duration"],
+            persona_prompt=pipeline_state["persona_prompt"],
+            context_prompt=pipeline_state["context_prompt"],
+            transcript_facts=pipeline_state["transcript_facts"],
+            source_chars=pipeline_state.get("model_chars", 0)
+        )
+
+    def finish_batch_summary(self, markdown_summary: str, pipeline_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn a batch consolidation result into the structured summary
+
+        Args:
+            markdown_summary: Markdown returned by the reduce-phase request
+            pipeline_state: State of the same transcript
+
+        Returns:
+            Dictionary containing all summary sections
+        """
+        transcript = state_source_transcript(pipeline_state)
+        transcript_index = TranscriptIndex(transcript)
+        redaction = Redaction("", pipeline_state["redactions"]) if pipeline_state.get("redactions") else None
+        return self._finish_summary(markdown_summary, transcript, transcript_index,
+                                    compute_speaker_analytics(transcript_index), redaction, None)
+
+    def summarize_live(self, live_session: LiveMeetingSession,
+                       deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Consolidate the chunk records of a running meeting into a summary
+
+        Only the reduce phase calls the model; the chunks were analyzed as they arrived.
+        The local stages (speaker facts, analytics, quote and scene checks) run on the
+        transcript received so far.
+
+        Args:
+            live_session: Live session holding the chunk records and transcript so far
+            deadline: Optional request deadline
+
+        Returns:
+            Dictionary containing all summary sections, also stored on the session
+        """
+        state = live_session.state
+        transcript = live_session.source_transcript()
+        transcript_index = TranscriptIndex(transcript)
+        transcript_facts = analyze_transcript(transcript, transcript_index)
+        redaction = Redaction("", state["redactions"]) if state.get("redactions") else None
+        model_facts = self._redact_facts(transcript_facts, redaction) if redaction else transcript_facts
+
+        markdown_summary = self.openai_helper.consolidate_chunk_analyses(
+            live_session.consolidation_records(),
+            title=state["title"],
+            date=state["date"],
+            duration=state["duration"],
+            persona_prompt=state["persona_prompt"],
+            context_prompt=state["context_prompt"],
+            transcript_facts=model_facts,
+            deadline=deadline,
+            source_chars=len(transcript)
         )
 
+        processed_summary = self._finish_summary(markdown_summary, transcript, transcript_index,
+                                                 compute_speaker_analytics(transcript_index),
+                                                 redaction, deadline)
+        state["transcript_facts"] = model_facts
+        live_session.mark_refreshed(processed_summary)
+        print(f"Refreshed live summary from {len(state['chunk_analyses'])} analyzed chunks")
+        return processed_summary
+
+    def _finish_summary(self, markdown_summary: str, transcript: str,
+                        transcript_index: TranscriptIndex,
+                        speaker_analytics: Optional[Dict[str, Any]],
+                        redaction: Optional[Redaction],
+                        deadline: Optional[Deadline]) -> Dict[str, Any]:
+        """
+        Turn model markdown into the structured summary and run the local checks
+
+        Args:
+            markdown_summary: Markdown returned by the model
+            transcript: Original transcript text
+            transcript_index: Speaker-turn index of the original transcript
+            speaker_analytics: Locally computed meeting dynamics
+            redaction: Redaction whose placeholders are restored, if any
+            deadline: Request deadline, used to flag partial summaries
+
+        Returns:
+            Dictionary containing all summary sections
+        """
         # Clean up any markdown formatting markers
         markdown_summary = self._clean_markdown_formatting(markdown_summary)
 
+        # Put redacted values back before the sections are parsed
+        if redaction is not None:
+            markdown_summary = redaction.restore(markdown_summary)
+
         # Extract and structure the markdown sections into a dictionary for compatibility
         processed_summary = self._extract_sections_from_markdown(markdown_summary)
 
         # Store the original markdown for export
         processed_summary['markdown'] = markdown_summary
+        processed_summary['speaker_analytics'] = speaker_analytics
+
+        # Check quotes and anchor scenes against one word index of the transcript
+        ngram_index = NGramIndex(transcript)
+        verify_quotes(processed_summary['key_quotes'], ngram_index)
+        align_scenes(processed_summary['detailed_summary'], ngram_index, transcript_index)
+
+        # Flag summaries that were degraded to stay within the time budget
+        processed_summary['partial'] = bool(deadline and deadline.degraded)
+        processed_summary['degradation_notes'] = list(deadline.degradations) if deadline else []
 
         return processed_summary
 
+    def regenerate_section(self, summary: Dict[str, Any], section_number: int,
+                           pipeline_state: Dict[str, Any],
+                           deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Regenerate one section and splice it into an existing summary
+
+        Args:
+            summary: Summary dictionary returned by generate()
+            section_number: Section to regenerate (1-10)
+            pipeline_state: State stored by generate() for this summary
+            deadline: Optional request deadline
+
+        Returns:
+            Updated summary dictionary; all other sections are left untouched
+        """
+        if section_number not in SECTION_KEYS:
+            raise ValueError(f"Unknown summary section: {section_number}")
+
+        transcript = state_model_transcript(pipeline_state)
+        section_markdown = self.openai_helper.generate_section(
+            section_number=section_number,
+            title=pipeline_state.get("title", ""),
+            date=pipeline_state.get("date", ""),
+            duration=pipeline_state.get("duration", ""),
+            transcript=transcript,
+            chunk_analyses=pipeline_state.get("chunk_analyses"),
+            persona_prompt=pipeline_state.get("persona_prompt", ""),
+            context_prompt=pipeline_state.get("context_prompt", ""),
+            deadline=deadline,
+            transcript_facts=pipeline_state.get("transcript_facts"),
+            # Records are much shorter than the transcript they came from; size by the transcript
+            source_chars=pipeline_state.get("model_chars") or len(transcript)
+        )
+        section_markdown = self._clean_markdown_formatting(section_markdown)
+        if pipeline_state.get("redactions"):
+            section_markdown = Redaction("", pipeline_state["redactions"]).restore(section_markdown)
+
+        # Replace the old block in place, or insert it in numeric order if it was missing
+        markdown_summary = summary.get("markdown", "")
+        blocks = self.openai_helper.split_markdown_sections(markdown_summary)
+        if section_number in blocks:
+            markdown_summary = markdown_summary.replace(blocks[section_number], section_markdown, 1)
+        else:
+            blocks[section_number] = section_markdown
+            markdown_summary = "\n\n".join(blocks[number] for number in sorted(blocks))
+
+        # Re-parse only the new section and copy its structured data over
+        key = SECTION_KEYS[section_number]
+        updated_summary = dict(summary)
+        updated_summary[key] = self._extract_sections_from_markdown(section_markdown)[key]
+        updated_summary["markdown"] = markdown_summary
+
+        transcript = state_source_transcript(pipeline_state)
+        if key == "key_quotes" and transcript:
+            verify_quotes(updated_summary[key], NGramIndex(transcript))
+        elif key == "detailed_summary" and transcript:
+            align_scenes(updated_summary[key], NGramIndex(transcript), TranscriptIndex(transcript))
+
+        print(f"Regenerated section {section_number} ({SECTION_TITLES[section_number]})")
+        return updated_summary
+
+    def _redact_facts(self, transcript_facts: Dict[str, Any], redaction: Redaction) -> Dict[str, Any]:
+        """
+        Replace redacted values in locally extracted facts before they are sent to the model
+
+        Args:
+            transcript_facts: Output of analyze_transcript on the original transcript
+            redaction: Redaction of the same transcript
+
+        Returns:
+            Copy of the facts with speaker names and terms redacted
+        """
+        return {
+            "speakers": [dict(speaker, name=redaction.apply(speaker["name"]))
+                         for speaker in transcript_facts.get("speakers", [])],
+            "acronyms": [dict(term, term=redaction.apply(term["term"]))
+                         for term in transcript_facts.get("acronyms", [])],
+        }
+
     def _clean_markdown_formatting(self, text: str) -> str:
         """
         Clean up markdown formatting markers like triple backticks with language identifiers
@@ -0,0 +1,544 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+from utils.series_rollup import empty_rollup, add_meeting_to_rollup
+from utils.action_items import ITEM_STATUSES, extract_items, normalize_owner
+from utils.search_documents import (
+    SNIPPET_END, SNIPPET_START, TRANSCRIPT_SECTION, build_match_query, summary_documents
+)
+
+# Relative weight of a match in the meeting title versus the section text when ranking
+SEARCH_TITLE_WEIGHT = 2.0
+SEARCH_CONTENT_WEIGHT = 1.0
+
+
+def _index_items(connection: sqlite3.Connection, meeting_id: int, meeting_date: str,
+                 summary: Dict[str, Any]) -> int:
+    """Insert a meeting's actions and decisions into the item index; returns the number of items"""
+    items = extract_items(summary, meeting_date)
+    for position, item in enumerate(items):
+        cursor = connection.execute(
+            "INSERT INTO items (meeting_id, position, kind, text, details, owner, due_date, meeting_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (meeting_id, position, item["kind"], item["text"], item["details"], item["owner"],
+             item["due_date"], meeting_date)
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO item_owners (owner, item_id) VALUES (?, ?)",
+            [(key, cursor.lastrowid) for key in item["owner_keys"]]
+        )
+    return len(items)
+
+
+def _index_existing_items(connection: sqlite3.Connection) -> None:
+    """Backfill the item index for meetings stored before it existed"""
+    rows = connection.execute("SELECT id, date, summary FROM meetings").fetchall()
+    for row in rows:
+        _index_items(connection, row["id"], row["date"], json.loads(row["summary"]))
+    if rows:
+        print(f"Indexed actions and decisions of {len(rows)} stored meetings")
+
+
+def _index_documents(connection: sqlite3.Connection, meeting_id: int, title: str, meeting_date: str,
+                     summary: Dict[str, Any], transcript: Optional[str] = None) -> int:
+    """Add a meeting's sections (and optionally its transcript) to the search index; returns the count"""
+    documents = summary_documents(summary)
+    if transcript:
+        documents.append((TRANSCRIPT_SECTION, transcript))
+    # The triggers on documents keep the FTS index in step
+    connection.executemany(
+        "INSERT INTO documents (meeting_id, section, meeting_date, title, content) VALUES (?, ?, ?, ?, ?)",
+        [(meeting_id, section, meeting_date, title, content) for section, content in documents]
+    )
+    return len(documents)
+
+
+def _index_existing_documents(connection: sqlite3.Connection) -> None:
+    """Backfill the search index for meetings stored before it existed"""
+    rows = connection.execute("SELECT id, title, date, summary FROM meetings").fetchall()
+    for row in rows:
+        _index_documents(connection, row["id"], row["title"], row["date"], json.loads(row["summary"]))
+    if rows:
+        print(f"Indexed {len(rows)} stored meetings for search")
+
+
+def _statements(script: str) -> Iterator[str]:
+    """Split a schema script into single statements (trigger bodies stay whole)"""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+
+
+# Schema changes in order; the database's user_version records how many have been applied
+MIGRATIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS meetings (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        date TEXT NOT NULL DEFAULT '',
+        duration TEXT NOT NULL DEFAULT '',
+        series TEXT,
+        created_at REAL NOT NULL,
+        summary TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS meetings_series ON meetings (series, date);
+
+    CREATE TABLE IF NOT EXISTS series (
+        name TEXT PRIMARY KEY,
+        rollup TEXT NOT NULL,
+        report TEXT,
+        report_meetings INTEGER NOT NULL DEFAULT 0,
+        updated_at REAL NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS items (
+        id INTEGER PRIMARY KEY,
+        meeting_id INTEGER NOT NULL REFERENCES meetings (id),
+        position INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        text TEXT NOT NULL,
+        details TEXT NOT NULL DEFAULT '',
+        owner TEXT NOT NULL DEFAULT '',
+        due_date TEXT,
+        meeting_date TEXT NOT NULL DEFAULT '',
+        status TEXT NOT NULL DEFAULT 'open'
+    );
+    CREATE INDEX IF NOT EXISTS items_meeting ON items (meeting_id, position);
+    CREATE INDEX IF NOT EXISTS items_due ON items (kind, status, due_date);
+
+    -- One row per owner name and per word of it, so "Jane" finds "Jane Doe"
+    CREATE TABLE IF NOT EXISTS item_owners (
+        owner TEXT NOT NULL,
+        item_id INTEGER NOT NULL REFERENCES items (id),
+        PRIMARY KEY (owner, item_id)
+    ) WITHOUT ROWID;
+    """,
+    _index_existing_items,
+    """
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        meeting_id INTEGER NOT NULL REFERENCES meetings (id),
+        section TEXT NOT NULL,
+        meeting_date TEXT NOT NULL DEFAULT '',
+        title TEXT NOT NULL,
+        content TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS documents_meeting ON documents (meeting_id);
+    CREATE INDEX IF NOT EXISTS documents_section ON documents (section, meeting_date);
+
+    -- External-content FTS5 index: the text is stored once, in documents
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        title, content, content='documents', content_rowid='id', tokenize='porter unicode61'
+    );
+    CREATE TRIGGER IF NOT EXISTS documents_insert AFTER INSERT ON documents BEGIN
+        INSERT INTO search_index (rowid, title, content) VALUES (new.id, new.title, new.content);
+    END;
+    CREATE TRIGGER IF NOT EXISTS documents_delete AFTER DELETE ON documents BEGIN
+        INSERT INTO search_index (search_index, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END;
+    """,
+    _index_existing_documents,
+]
+
+
+class SummaryStore:
+    """SQLite store of generated summaries, grouped into meeting series with incremental rollups"""
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the store
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            # WAL lets readers continue while a summary is being written
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._migrate(connection)
+
+    def _migrate(self, connection: sqlite3.Connection) -> None:
+        """
+        Apply any schema changes the database does not have yet
+
+        Workers starting together each try; the write lock and the version re-read inside it
+        make sure every change (and every backfill) is applied exactly once.
+        """
+        if connection.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS):
+            return
+        # Autocommit mode so BEGIN IMMEDIATE is under our control; executescript() would commit early
+        connection.isolation_level = None
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            for number in range(version, len(MIGRATIONS)):
+                migration = MIGRATIONS[number]
+                if callable(migration):
+                    migration(connection)
+                else:
+                    for statement in _statements(migration):
+                        connection.execute(statement)
+                connection.execute(f"PRAGMA user_version = {number + 1}")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection committed on success; one per call keeps the store thread-safe"""
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def add_meeting(self, summary: Dict[str, Any], title: str, date: str = "", duration: str = "",
+                    series: Optional[str] = None, transcript: Optional[str] = None) -> int:
+        """
+        Store a generated summary and index it for search
+
+        Args:
+            summary: Structured summary returned by SummaryGenerator.generate()
+            title: Meeting title
+            date: Meeting date
+            duration: Meeting duration
+            series: Optional series to add the meeting to
+            transcript: Optional compacted transcript to make searchable as well
+
+        Returns:
+            Id of the stored meeting
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO meetings (title, date, duration, created_at, summary) VALUES (?, ?, ?, ?, ?)",
+                (title, date or "", duration or "", time.time(), json.dumps(summary, ensure_ascii=False))
+            )
+            meeting_id = cursor.lastrowid
+            _index_items(connection, meeting_id, date or "", summary)
+            _index_documents(connection, meeting_id, title, date or "", summary, transcript)
+            if series:
+                self._add_to_series(connection, meeting_id, series)
+        return meeting_id
+
+    def update_meeting(self, meeting_id: int, summary: Dict[str, Any]) -> bool:
+        """
+        Replace a stored meeting's summary (e.g. after a section was regenerated) and reindex it
+
+        The meeting's actions and decisions and its section documents are rebuilt (an item
+        that is still there keeps its status; the indexed transcript is kept), and the
+        rollup of its series is rebuilt from the series' meetings in the order they were added.
+
+        Args:
+            meeting_id: Id returned by add_meeting()
+            summary: New structured summary
+
+        Returns:
+            True if the meeting exists
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT title, date, series FROM meetings WHERE id = ?", (meeting_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            connection.execute(
+                "UPDATE meetings SET summary = ? WHERE id = ?",
+                (json.dumps(summary, ensure_ascii=False), meeting_id)
+            )
+
+            statuses = connection.execute(
+                "SELECT kind, text, status FROM items WHERE meeting_id = ? AND status != 'open'", (meeting_id,)
+            ).fetchall()
+            connection.execute(
+                "DELETE FROM item_owners WHERE item_id IN (SELECT id FROM items WHERE meeting_id = ?)",
+                (meeting_id,)
+            )
+            connection.execute("DELETE FROM items WHERE meeting_id = ?", (meeting_id,))
+            _index_items(connection, meeting_id, row["date"], summary)
+            connection.executemany(
+                "UPDATE items SET status = ? WHERE meeting_id = ? AND kind = ? AND text = ?",
+                [(status["status"], meeting_id, status["kind"], status["text"]) for status in statuses]
+            )
+
+            # The delete trigger removes the old sections from the FTS index
+            connection.execute(
+                "DELETE FROM documents WHERE meeting_id = ? AND section != ?", (meeting_id, TRANSCRIPT_SECTION)
+            )
+            _index_documents(connection, meeting_id, row["title"], row["date"], summary)
+
+            if row["series"]:
+                self._rebuild_rollup(connection, row["series"])
+        print(f"Updated stored meeting {meeting_id}")
+        return True
+
+    def _rebuild_rollup(self, connection: sqlite3.Connection, series: str) -> None:
+        series_row = connection.execute("SELECT rollup FROM series WHERE name = ?", (series,)).fetchone()
+        if series_row is None:
+            return
+        rollup = empty_rollup()
+        for meeting in json.loads(series_row["rollup"])["meetings"]:
+            row = connection.execute(
+                "SELECT title, date, summary FROM meetings WHERE id = ?", (meeting["id"],)
+            ).fetchone()
+            if row is not None:
+                add_meeting_to_rollup(rollup, meeting["id"], row["title"], row["date"], json.loads(row["summary"]))
+        connection.execute(
+            "UPDATE series SET rollup = ?, updated_at = ? WHERE name = ?",
+            (json.dumps(rollup, ensure_ascii=False), time.time(), series)
+        )
+
+    def get_meeting(self, meeting_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Load a stored meeting
+
+        Args:
+            meeting_id: Id returned by add_meeting()
+
+        Returns:
+            Dictionary with id, title, date, duration, series and the parsed summary, or None
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+        if row is None:
+            return None
+        meeting = dict(row)
+        meeting["summary"] = json.loads(meeting["summary"])
+        return meeting
+
+    def add_to_series(self, meeting_id: int, series: str) -> Dict[str, Any]:
+        """
+        Add a stored meeting to a series and fold it into the series rollup
+
+        Only the new meeting's parsed summary is read; earlier meetings are already in the rollup.
+
+        Args:
+            meeting_id: Id of a stored meeting
+            series: Series name; the series is created if needed
+
+        Returns:
+            The updated rollup
+
+        Raises:
+            ValueError: If the meeting does not exist or already belongs to another series
+        """
+        with self._connect() as connection:
+            return self._add_to_series(connection, meeting_id, series)
+
+    def _add_to_series(self, connection: sqlite3.Connection, meeting_id: int, series: str) -> Dict[str, Any]:
+        row = connection.execute(
+            "SELECT title, date, series, summary FROM meetings WHERE id = ?", (meeting_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown meeting: {meeting_id}")
+        if row["series"] and row["series"] != series:
+            raise ValueError(f"Meeting {meeting_id} already belongs to the series '{row['series']}'")
+
+        series_row = connection.execute("SELECT rollup FROM series WHERE name = ?", (series,)).fetchone()
+        rollup = json.loads(series_row["rollup"]) if series_row else empty_rollup()
+        add_meeting_to_rollup(rollup, meeting_id, row["title"], row["date"], json.loads(row["summary"]))
+
+        connection.execute("UPDATE meetings SET series = ? WHERE id = ?", (series, meeting_id))
+        connection.execute(
+            "INSERT INTO series (name, rollup, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET rollup = excluded.rollup, updated_at = excluded.updated_at",
+            (series, json.dumps(rollup, ensure_ascii=False), time.time())
+        )
+        print(f"Added meeting {meeting_id} to series '{series}' ({len(rollup['meetings'])} meetings)")
+        return rollup
+
+    def get_series(self, series: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a series with its rollup and latest report
+
+        Args:
+            series: Series name
+
+        Returns:
+            Dictionary with name, rollup, report, report_meetings and updated_at, or None
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM series WHERE name = ?", (series,)).fetchone()
+        if row is None:
+            return None
+        result = dict(row)
+        result["rollup"] = json.loads(result["rollup"])
+        return result
+
+    def list_series(self) -> List[Dict[str, Any]]:
+        """
+        List every series
+
+        Returns:
+            List of dictionaries with name, meeting_count and updated_at, most recently updated first
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT s.name, s.updated_at, COUNT(m.id) AS meeting_count FROM series s "
+                "LEFT JOIN meetings m ON m.series = s.name GROUP BY s.name ORDER BY s.updated_at DESC"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def save_series_report(self, series: str, report: str, meeting_count: int) -> None:
+        """
+        Store the latest generated report for a series
+
+        Args:
+            series: Series name
+            report: Report markdown
+            meeting_count: Number of meetings the report covers
+        """
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE series SET report = ?, report_meetings = ? WHERE name = ?",
+                (report, meeting_count, series)
+            )
+
+    def query_items(self, kind: Optional[str] = "action", owner: str = "", status: Optional[str] = "open",
+                    due_before: str = "", due_after: str = "", meeting_id: Optional[int] = None,
+                    series: str = "", limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Query actions and decisions across every stored meeting
+
+        Every filter is served by an index (owner, due date, or meeting), so queries stay
+        fast however many meetings are stored.
+
+        Args:
+            kind: "action", "decision", or None for both
+            owner: Owner name or a single word of it (case-insensitive)
+            status: "open", "done", "cancelled", or None for any
+            due_before: Only items due on or before this ISO date
+            due_after: Only items due on or after this ISO date
+            meeting_id: Only items from this meeting
+            series: Only items from meetings in this series
+            limit: Maximum number of items returned
+
+        Returns:
+            Item dictionaries with their meeting's title and date, soonest due first
+        """
+        source = "items i"
+        conditions = []
+        parameters: List[Any] = []
+
+        if owner:
+            # CROSS JOIN pins the owner index as the outer loop; the planner would otherwise
+            # walk every open action and probe the owners of each
+            source = "item_owners o CROSS JOIN items i ON i.id = o.item_id"
+            conditions.append("o.owner = ?")
+            parameters.append(normalize_owner(owner))
+        if kind:
+            conditions.append("i.kind = ?")
+            parameters.append(kind)
+        if status:
+            conditions.append("i.status = ?")
+            parameters.append(status)
+        if due_before:
+            conditions.append("i.due_date <= ?")
+            parameters.append(due_before)
+        if due_after:
+            conditions.append("i.due_date >= ?")
+            parameters.append(due_after)
+        if meeting_id is not None:
+            conditions.append("i.meeting_id = ?")
+            parameters.append(meeting_id)
+        if series:
+            conditions.append("m.series = ?")
+            parameters.append(series)
+
+        sql = (
+            "SELECT i.id, i.meeting_id, i.kind, i.text, i.details, i.owner, i.due_date, i.status, "
+            "i.meeting_date, m.title AS meeting_title, m.series "
+            "FROM " + source + " JOIN meetings m ON m.id = i.meeting_id" +
+            (" WHERE " + " AND ".join(conditions) if conditions else "") +
+            " ORDER BY i.due_date IS NULL, i.due_date, i.meeting_date DESC, i.id LIMIT ?"
+        )
+        parameters.append(int(limit))
+
+        with self._connect() as connection:
+            rows = connection.execute(sql, parameters).fetchall()
+        return [dict(row) for row in rows]
+
+    def set_item_status(self, item_id: int, status: str) -> bool:
+        """
+        Mark an action or decision as open, done or cancelled
+
+        Args:
+            item_id: Id of the item
+            status: New status
+
+        Returns:
+            True if the item exists
+
+        Raises:
+            ValueError: If the status is not one of ITEM_STATUSES
+        """
+        if status not in ITEM_STATUSES:
+            raise ValueError(f"Unknown status: {status}")
+        with self._connect() as connection:
+            cursor = connection.execute("UPDATE items SET status = ? WHERE id = ?", (status, item_id))
+        return cursor.rowcount > 0
+
+    def search(self, query: str, section: str = "", date_from: str = "", date_to: str = "",
+               series: str = "", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Full-text search over stored summaries (and transcripts, where indexed)
+
+        Results are ranked with BM25, title matches weighing more than section text.
+
+        Args:
+            query: Search text; words are ANDed, "quoted phrases" and trailing * prefixes are supported
+            section: Only documents of this section (e.g. "decisions_made" or "transcript")
+            date_from: Only meetings on or after this ISO date
+            date_to: Only meetings on or before this ISO date
+            series: Only meetings in this series
+            limit: Maximum number of results
+
+        Returns:
+            Result dictionaries with meeting id, title, date, section, snippet (matches
+            wrapped in SNIPPET_START/SNIPPET_END) and score (lower is better), best first
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        conditions = ["search_index MATCH ?"]
+        parameters: List[Any] = [match]
+        if section:
+            conditions.append("d.section = ?")
+            parameters.append(section)
+        if date_from:
+            conditions.append("d.meeting_date >= ?")
+            parameters.append(date_from)
+        if date_to:
+            conditions.append("d.meeting_date <= ?")
+            parameters.append(date_to)
+        if series:
+            conditions.append("d.meeting_id IN (SELECT id FROM meetings WHERE series = ?)")
+            parameters.append(series)
+
+        sql = (
+            "SELECT d.meeting_id, d.title, d.meeting_date, d.section, "
+            f"snippet(search_index, 1, '{SNIPPET_START}', '{SNIPPET_END}', '…', 16) AS snippet, "
+            f"bm25(search_index, {SEARCH_TITLE_WEIGHT}, {SEARCH_CONTENT_WEIGHT}) AS score "
+            "FROM search_index JOIN documents d ON d.id = search_index.rowid "
+            "WHERE " + " AND ".join(conditions) + " ORDER BY score LIMIT ?"
+        )
+        parameters.append(int(limit))
+
+        with self._connect() as connection:
+            rows = connection.execute(sql, parameters).fetchall()
+        return [dict(row) for row in rows]
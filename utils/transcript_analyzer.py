@@ -0,0 +1,76 @@
+import re
+from collections import Counter
+from typing import Dict, Any, List, Optional
+from utils.transcript_index import TranscriptIndex
+
+# All-caps acronyms (SSA, API, FY25) and internal-capital terms (eCBU, SharePoint)
+ACRONYM_PATTERN = re.compile(r'\b(?:[A-Z][A-Z0-9&]+s?|[a-z]+[A-Z][A-Za-z0-9]*|[A-Z][a-z]+[A-Z][A-Za-z0-9]*)\b')
+
+# Capitalized tokens that are not terminology
+ACRONYM_STOPWORDS = {"I", "OK", "AM", "PM", "TV", "US", "OR", "IT", "ID"}
+
+
+def extract_acronyms(transcript: str, min_count: int = 2) -> List[Dict[str, Any]]:
+    """
+    Count acronyms and capitalized technical tokens
+
+    Args:
+        transcript: Transcript text
+        min_count: Minimum number of occurrences for a term to be kept
+
+    Returns:
+        List of {"term", "count"} dictionaries, most frequent first
+    """
+    counts = Counter(ACRONYM_PATTERN.findall(transcript))
+    return [
+        {"term": term, "count": count}
+        for term, count in counts.most_common()
+        if count >= min_count and len(term) >= 2 and term not in ACRONYM_STOPWORDS
+    ]
+
+
+def analyze_transcript(transcript: str, transcript_index: Optional[TranscriptIndex] = None) -> Dict[str, Any]:
+    """
+    Run the local, deterministic transcript analysis
+
+    Args:
+        transcript: Transcript text
+        transcript_index: Speaker-turn index, built here if not supplied
+
+    Returns:
+        Dictionary with "speakers" and "acronyms" lists
+    """
+    if transcript_index is None:
+        transcript_index = TranscriptIndex(transcript)
+    return {
+        "speakers": transcript_index.speaker_turn_counts(),
+        "acronyms": extract_acronyms(transcript),
+    }
+
+
+def render_transcript_facts(facts: Dict[str, Any]) -> str:
+    """
+    Render locally extracted facts as a prompt block
+
+    Args:
+        facts: Output of analyze_transcript
+
+    Returns:
+        Prompt text, or an empty string when nothing was found
+    """
+    lines = []
+
+    if facts.get("speakers"):
+        speakers = ", ".join(f"{speaker['name']} ({speaker['turns']} turns)" for speaker in facts["speakers"])
+        lines.append(f"Speakers (from speaker labels): {speakers}")
+        lines.append("Use exactly these speakers for the Participants table; only add their organization/title and meeting role.")
+
+    if facts.get("acronyms"):
+        acronyms = ", ".join(f"{term['term']} ({term['count']}x)" for term in facts["acronyms"])
+        lines.append(f"Acronyms and terms used at least twice: {acronyms}")
+        lines.append("Use this list for the Technical Terminology & Acronyms table; only write the definitions.")
+
+    if not lines:
+        return ""
+
+    return "LOCALLY EXTRACTED FACTS (exact, computed from the transcript):\n        " + "\n        ".join(lines)
@@ -0,0 +1,276 @@
+import re
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+# One alternation so all speaker turns are found in a single pass over the text:
+#   "Jane Doe: ...", "[00:01:02] Jane Doe: ...", "Jane Doe (00:01:02): ..."
+#   and Teams/Zoom headers such as "Jane Doe   0:03" on their own line.
+# A name word may also be a redaction placeholder such as "[NAME_1]".
+NAME_WORD = r"(?:\[[A-Z][A-Z_]*_\d+\]|[A-Z][\w.'-]*)"
+TURN_PATTERN = re.compile(
+    r"^[ \t]*(?:\[?(?P<pre_time>\d{1,2}:\d{2}(?::\d{2})?)\]?[ \t]+)?"
+    rf"(?P<name>{NAME_WORD}(?:[ \t]+{NAME_WORD}){{0,3}})"
+    r"[ \t]*(?:\((?P<post_time>\d{1,2}:\d{2}(?::\d{2})?)\))?[ \t]*:[ \t]*"
+    rf"|^[ \t]*(?P<header_name>{NAME_WORD}(?:[ \t]+{NAME_WORD}){{0,3}})"
+    r"[ \t]+(?P<header_time>\d{1,2}:\d{2}(?::\d{2})?)[ \t]*\n",
+    re.MULTILINE
+)
+
+PARAGRAPH_BREAK_PATTERN = re.compile(r'\n[ \t]*\n')
+
+# Labels that look like speakers but are not people
+SPEAKER_STOPWORDS = {"Note", "Notes", "Action", "Actions", "Decision", "Question", "Agenda", "Transcript",
+                     "Meeting", "Date", "Time", "Duration", "Title", "Summary", "Attendees", "Re", "Subject"}
+
+NO_SPEAKER = -1
+NO_TIMESTAMP = -1
+
+
+def parse_timestamp(value: Optional[str]) -> int:
+    """
+    Convert "m:ss" or "h:mm:ss" to seconds
+
+    Args:
+        value: Timestamp text, or None
+
+    Returns:
+        Seconds from the start of the meeting, or NO_TIMESTAMP
+    """
+    if not value:
+        return NO_TIMESTAMP
+    seconds = 0
+    for part in value.split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def format_timestamp(seconds: int) -> str:
+    """Format seconds as h:mm:ss (or m:ss under an hour)"""
+    if seconds < 0:
+        return ""
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+class TranscriptIndex:
+    """Speaker-turn index built once over the original transcript text"""
+
+    def __init__(self, text: str):
+        """
+        Parse the transcript into turns
+
+        Turns are stored as parallel arrays of offsets into the original text, with
+        speaker names interned in a table. Transcripts without speaker labels are
+        indexed by paragraph with no speaker.
+
+        Args:
+            text: Original transcript text
+        """
+        self.text = text
+        self.speakers: List[str] = []
+        self._speaker_ids: Dict[str, int] = {}
+
+        self.turn_speaker = array('i')
+        self.turn_start = array('q')  # start of the turn, label included
+        self.content_start = array('q')  # start of the spoken text
+        self.turn_end = array('q')
+        self.turn_time = array('i')
+
+        self._parse()
+
+    def _parse(self) -> None:
+        matches = []
+        for match in TURN_PATTERN.finditer(self.text):
+            name = re.sub(r'\s+', ' ', match.group('name') or match.group('header_name')).strip()
+            if name not in SPEAKER_STOPWORDS:
+                matches.append((match, name))
+
+        # A label seen once is more likely a heading than a speaker
+        name_counts = Counter(name for _, name in matches)
+        matches = [(match, name) for match, name in matches if name_counts[name] >= 2]
+
+        if not matches:
+            self._parse_paragraphs()
+            return
+
+        # Text before the first label (title, attendee list) becomes an unlabeled turn
+        first_start = matches[0][0].start()
+        if self.text[:first_start].strip():
+            self._add_turn(NO_SPEAKER, 0, 0, first_start, NO_TIMESTAMP)
+
+        for position, (match, name) in enumerate(matches):
+            end = matches[position + 1][0].start() if position + 1 < len(matches) else len(self.text)
+            timestamp = parse_timestamp(
+                match.group('pre_time') or match.group('post_time') or match.group('header_time')
+            )
+            self._add_turn(self._intern(name), match.start(), match.end(), end, timestamp)
+
+    def _parse_paragraphs(self) -> None:
+        start = 0
+        for match in PARAGRAPH_BREAK_PATTERN.finditer(self.text):
+            if self.text[start:match.start()].strip():
+                self._add_turn(NO_SPEAKER, start, start, match.start(), NO_TIMESTAMP)
+            start = match.end()
+        if self.text[start:].strip():
+            self._add_turn(NO_SPEAKER, start, start, len(self.text), NO_TIMESTAMP)
+
+    def _intern(self, name: str) -> int:
+        speaker_id = self._speaker_ids.get(name)
+        if speaker_id is None:
+            speaker_id = len(self.speakers)
+            self._speaker_ids[name] = speaker_id
+            self.speakers.append(name)
+        return speaker_id
+
+    def _add_turn(self, speaker_id: int, start: int, content_start: int, end: int, timestamp: int) -> None:
+        self.turn_speaker.append(speaker_id)
+        self.turn_start.append(start)
+        self.content_start.append(content_start)
+        self.turn_end.append(end)
+        self.turn_time.append(timestamp)
+
+    def __len__(self) -> int:
+        return len(self.turn_start)
+
+    @property
+    def has_speakers(self) -> bool:
+        """True if the transcript has speaker labels"""
+        return bool(self.speakers)
+
+    @property
+    def has_timestamps(self) -> bool:
+        """True if any turn carries a timestamp"""
+        return any(timestamp != NO_TIMESTAMP for timestamp in self.turn_time)
+
+    def speaker_name(self, turn: int) -> str:
+        """Speaker name for a turn, or an empty string for unlabeled text"""
+        speaker_id = self.turn_speaker[turn]
+        return self.speakers[speaker_id] if speaker_id != NO_SPEAKER else ""
+
+    def turn_text(self, turn: int) -> str:
+        """Spoken text of a turn, without its speaker label"""
+        return self.text[self.content_start[turn]:self.turn_end[turn]].strip()
+
+    def turn_at(self, offset: int) -> int:
+        """
+        Find the turn containing a character offset
+
+        Args:
+            offset: Offset into the original text
+
+        Returns:
+            Turn number (0 if the offset precedes the first turn)
+        """
+        return max(0, bisect_right(self.turn_start, offset) - 1)
+
+    def turn_info(self, turn: int) -> Dict[str, Any]:
+        """
+        Describe a turn for display or export
+
+        Args:
+            turn: Turn number
+
+        Returns:
+            Dictionary with speaker, offsets and timestamp
+        """
+        timestamp = self.turn_time[turn]
+        return {
+            "turn": turn,
+            "speaker": self.speaker_name(turn),
+            "start": self.turn_start[turn],
+            "end": self.turn_end[turn],
+            "timestamp": timestamp if timestamp != NO_TIMESTAMP else None,
+            "timestamp_label": format_timestamp(timestamp),
+        }
+
+    def speaker_turn_counts(self) -> List[Dict[str, Any]]:
+        """
+        Count turns per speaker
+
+        Returns:
+            List of {"name", "turns"} dictionaries in order of first appearance
+        """
+        counts = Counter(speaker_id for speaker_id in self.turn_speaker if speaker_id != NO_SPEAKER)
+        return [{"name": name, "turns": counts[speaker_id]} for speaker_id, name in enumerate(self.speakers)]
+
+    def chunk(self, max_chunk_size: int) -> List[str]:
+        """
+        Split the transcript into chunks on turn boundaries
+
+        Turns longer than max_chunk_size are split at paragraph breaks, then hard-cut.
+
+        Args:
+            max_chunk_size: Maximum size of each chunk in characters
+
+        Returns:
+            List of text chunks
+        """
+        if len(self.text) <= max_chunk_size:
+            return [self.text]
+
+        chunks = []
+        chunk_start = None
+        chunk_end = None
+
+        for turn in range(len(self)):
+            start, end = self.turn_start[turn], self.turn_end[turn]
+
+            if chunk_start is not None and end - chunk_start > max_chunk_size:
+                chunks.append(self.text[chunk_start:chunk_end].strip())
+                chunk_start = None
+
+            if end - start > max_chunk_size:
+                chunks.extend(self._split_long_span(start, end, max_chunk_size))
+                continue
+
+            if chunk_start is None:
+                chunk_start = start
+            chunk_end = end
+
+        if chunk_start is not None:
+            chunks.append(self.text[chunk_start:chunk_end].strip())
+
+        return [chunk for chunk in chunks if chunk]
+
+    def _split_long_span(self, start: int, end: int, max_chunk_size: int) -> List[str]:
+        pieces = []
+        while end - start > max_chunk_size:
+            cut = self.text.rfind('\n\n', start, start + max_chunk_size)
+            if cut <= start:
+                cut = self.text.rfind(' ', start, start + max_chunk_size)
+            if cut <= start:
+                cut = start + max_chunk_size
+            pieces.append(self.text[start:cut].strip())
+            start = cut
+        pieces.append(self.text[start:end].strip())
+        return pieces
+
+    def compact(self) -> str:
+        """
+        Render the transcript as one "Speaker: text" line per turn with whitespace collapsed
+
+        Returns:
+            Compacted transcript text
+        """
+        lines = []
+        for turn in range(len(self)):
+            content = re.sub(r'\s+', ' ', self.turn_text(turn)).strip()
+            if not content:
+                continue
+            speaker = self.speaker_name(turn)
+            timestamp = format_timestamp(self.turn_time[turn])
+            prefix = f"[{timestamp}] " if timestamp else ""
+            lines.append(f"{prefix}{speaker}: {content}" if speaker else f"{prefix}{content}")
+        return "\n".join(lines)
+
+    def describe(self) -> str:
+        """One-line description for logging"""
+        if not self.has_speakers:
+            return f"{len(self)} paragraphs, no speaker labels"
+        return f"{len(self)} turns from {len(self.speakers)} speakers" + \
+            (" with timestamps" if self.has_timestamps else "")
@@ -0,0 +1,55 @@
+import codecs
+import os
+
+# Extensions read as plain text; an empty extension is treated as text too
+TEXT_EXTENSIONS = ('.txt', '.md', '.csv', '')
+TRANSCRIPT_EXTENSIONS = TEXT_EXTENSIONS + ('.docx',)
+
+# Encodings tried in order for text files
+ENCODINGS_TO_TRY = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'ascii']
+
+
+def load_transcript(path: str) -> str:
+    """
+    Read a transcript from a Word document or a text file
+
+    Args:
+        path: Path of the transcript file
+
+    Returns:
+        Transcript text
+
+    Raises:
+        Exception: If the file type is unsupported or the text cannot be extracted
+    """
+    file_extension = os.path.splitext(path)[1].lower()
+
+    if file_extension == '.docx':
+        # Handle Word documents
+        try:
+            import docx
+            doc = docx.Document(path)
+            transcript_text = '\n\n'.join([para.text for para in doc.paragraphs if para.text.strip()])
+            print(f"Successfully extracted text from DOCX file, {len(transcript_text)} characters")
+            return transcript_text
+        except Exception as e:
+            print(f"Error reading DOCX file: {str(e)}")
+            raise Exception(f"Could not extract text from Word document: {str(e)}")
+
+    if file_extension not in TEXT_EXTENSIONS:
+        # Unsupported file type
+        raise Exception(f"Unsupported file type: {file_extension}. Please upload a .txt or .docx file.")
+
+    # Handle text files with multiple encodings
+    for encoding in ENCODINGS_TO_TRY:
+        try:
+            with codecs.open(path, 'r', encoding=encoding) as f:
+                transcript_text = f.read()
+            print(f"Successfully read file with {encoding} encoding, {len(transcript_text)} characters")
+            return transcript_text
+        except UnicodeDecodeError:
+            print(f"Failed to read with {encoding} encoding, trying next...")
+            continue
+
+    # If all methods failed, raise an error
+    raise Exception("Could not extract text from the uploaded file. Please try pasting the text directly.")